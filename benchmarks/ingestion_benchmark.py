@@ -0,0 +1,275 @@
+"""
+Benchmarks the document chunking of the RAG ingestion locally.
+
+Runs the handler of the document_text_chunker UDTF, as set up by setup_document_text_chunker,
+over the documents in data/sample_contracts and over synthetic PDFs of 100 and 1,000 pages.
+Every chunk is embedded with a hash-based stand-in for EMBED_TEXT, so the benchmark runs
+offline and measures only the work done in the UDTF and around it. The results include the
+chunker version, so runs can be compared across chunker changes.
+
+For every document set it reports pages/sec, chunks/sec, the peak memory of the Python
+allocations and the distribution of the chunk sizes. Throughput is measured in a first pass
+and peak memory in a second one, as tracing allocations slows the chunker down several
+times over; --skip-memory leaves the second pass out.
+
+Usage:
+    python benchmarks/ingestion_benchmark.py [--strategy token] [--chunk-size 1000]
+        [--chunk-overlap 100] [--pages 100 1000] [--skip-memory] [--json results.json]
+
+Requires PyPDF2, as listed in requirements.txt.
+"""
+import argparse
+import ast
+import hashlib
+import io
+import json
+import math
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SAMPLE_DIR = ROOT / "data" / "sample_contracts"
+EMBEDDING_DIMENSIONS = 768
+
+WORDS = (
+    "agreement party parties confidential information disclosure recipient shall not "
+    "including without limitation obligations term termination written notice governing law "
+    "jurisdiction receiving disclosing purpose evaluation business relationship affiliates "
+    "employees advisors return destroy copies remedies injunctive relief breach waiver "
+    "severability entire amendment counterparts effective date hereby whereas therefore"
+).split()
+
+
+def load_chunker():
+    """
+    Loads the handler source of the document_text_chunker UDTF from src/utils.py.
+
+    The constants are read from the syntax tree, so neither Streamlit nor a Snowflake
+    session is needed. The handler only opens stage files through SnowflakeFile, which the
+    benchmark does not use, so snowflake.snowpark.files is stubbed when it is not installed.
+
+    Returns:
+        tuple: (chunker version, namespace holding the executed handler source)
+    """
+    if "snowflake.snowpark.files" not in sys.modules:
+        try:
+            import snowflake.snowpark.files  # noqa: F401
+        except ImportError:
+            files = types.ModuleType("snowflake.snowpark.files")
+            files.SnowflakeFile = None
+            sys.modules["snowflake.snowpark.files"] = files
+    tree = ast.parse((ROOT / "src" / "utils.py").read_text())
+    constants = {
+        node.targets[0].id: node.value.value
+        for node in tree.body
+        if isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name) and isinstance(node.value, ast.Constant)
+    }
+    namespace = {}
+    exec(constants["DOCUMENT_TEXT_CHUNKER_SOURCE"], namespace)
+    return constants["DOCUMENT_TEXT_CHUNKER_VERSION"], namespace
+
+
+def make_pdf(pages, words_per_page=450, seed=0):
+    """
+    Builds a PDF with the given number of pages of contract-like text.
+
+    Args:
+        pages (int): Number of pages
+        words_per_page (int, optional): Words of text per page. Defaults to 450.
+        seed (int, optional): Seed of the word sequence. Defaults to 0.
+
+    Returns:
+        bytes: The PDF document
+    """
+    rng = random.Random(seed)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # The page tree, once the page objects are numbered
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for _ in range(pages):
+        words = [rng.choice(WORDS) for _ in range(words_per_page)]
+        lines = [" ".join(words[start:start + 12]) for start in range(0, len(words), 12)]
+        sentences = "".join(f"({line}.) '\n" for line in lines)
+        content = f"BT /F1 10 Tf 12 TL 50 780 Td\n{sentences}ET".encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages)
+
+    document = io.BytesIO()
+    document.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(document.tell())
+        document.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = document.tell()
+    document.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        document.write(b"%010d 00000 n \n" % offset)
+    document.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return document.getvalue()
+
+
+def embed_stand_in(chunk):
+    """
+    Embeds a chunk offline, as a stand-in for SNOWFLAKE.CORTEX.EMBED_TEXT.
+
+    Every token is hashed into one signed dimension of the vector, which is normalized.
+    Identical text gives identical vectors, like a real embedding model.
+
+    Args:
+        chunk (str): Chunk text
+
+    Returns:
+        list: Vector of EMBEDDING_DIMENSIONS floats
+    """
+    vector = [0.0] * EMBEDDING_DIMENSIONS
+    for token in chunk.lower().split():
+        digest = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "big")
+        vector[digest % EMBEDDING_DIMENSIONS] += 1.0 if digest >> 63 else -1.0
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+def ingest(chunker, documents, chunking, sizes=None):
+    """
+    Chunks and embeds documents the way one ingestion run does.
+
+    Args:
+        chunker (dict): Namespace of the handler source
+        documents (list): (name, bytes) of every document
+        chunking (dict): Chunking strategy with its chunk_size and chunk_overlap
+        sizes (list, optional): Receives the length of every chunk in characters
+
+    Returns:
+        dict: Number of pages, skipped pages and chunks
+    """
+    totals = {"pages": 0, "skipped_pages": 0, "chunks": 0}
+    for name, data in documents:
+        stats = {"pages": 0, "skipped_pages": 0}
+        extension = name.rsplit(".", 1)[-1].lower()
+        for chunk, page_start, page_end in chunker["chunk_document"](
+            io.BytesIO(data), extension, chunking["strategy"], chunking["chunk_size"], chunking["chunk_overlap"], stats
+        ):
+            embed_stand_in(chunk)
+            totals["chunks"] += 1
+            if sizes is not None:
+                sizes.append(len(chunk))
+        totals["pages"] += stats["pages"]
+        totals["skipped_pages"] += stats["skipped_pages"]
+    return totals
+
+
+def run_benchmark(chunker, name, documents, chunking, measure_memory=True):
+    """
+    Measures throughput, peak memory and chunk sizes of one document set.
+
+    Args:
+        chunker (dict): Namespace of the handler source
+        name (str): Name of the document set
+        documents (list): (name, bytes) of every document
+        chunking (dict): Chunking strategy with its chunk_size and chunk_overlap
+        measure_memory (bool, optional): Whether to measure peak memory. Defaults to True.
+
+    Returns:
+        dict: Results of the document set
+    """
+    sizes = []
+    started = time.perf_counter()
+    totals = ingest(chunker, documents, chunking, sizes)
+    seconds = time.perf_counter() - started
+
+    peak_bytes = None
+    if measure_memory:
+        tracemalloc.start()
+        ingest(chunker, documents, chunking)
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    deciles = statistics.quantiles(sizes, n=10, method="inclusive") if len(sizes) > 1 else sizes * 9
+    return {
+        "name": name,
+        "files": len(documents),
+        "bytes": sum(len(data) for _, data in documents),
+        **totals,
+        "seconds": round(seconds, 3),
+        "pages_per_second": round(totals["pages"] / seconds, 1) if seconds else None,
+        "chunks_per_second": round(totals["chunks"] / seconds, 1) if seconds else None,
+        "peak_memory_mb": round(peak_bytes / 2**20, 2) if peak_bytes is not None else None,
+        "chunk_chars": {
+            "min": min(sizes, default=0),
+            "p10": round(deciles[0]) if deciles else 0,
+            "p50": round(deciles[4]) if deciles else 0,
+            "p90": round(deciles[8]) if deciles else 0,
+            "max": max(sizes, default=0),
+            "mean": round(statistics.mean(sizes)) if sizes else 0,
+        },
+    }
+
+
+def print_results(version, chunking, results):
+    """
+    Prints the results of all document sets as a table.
+
+    Args:
+        version (str): Chunker version
+        chunking (dict): Chunking strategy with its chunk_size and chunk_overlap
+        results (list): Results of every document set
+    """
+    print(f"{version}, {chunking['strategy']} chunks of {chunking['chunk_size']} with overlap {chunking['chunk_overlap']}")
+    header = f"{'Documents':<18}{'Files':>6}{'Pages':>7}{'Chunks':>8}{'Sec':>8}{'Pages/s':>9}{'Chunks/s':>10}{'Peak MB':>9}  Chunk chars min/p10/p50/p90/max"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        sizes = result["chunk_chars"]
+        print(
+            f"{result['name']:<18}{result['files']:>6}{result['pages']:>7}{result['chunks']:>8}{result['seconds']:>8}"
+            f"{result['pages_per_second']:>9}{result['chunks_per_second']:>10}{str(result['peak_memory_mb']):>9}  "
+            f"{sizes['min']}/{sizes['p10']}/{sizes['p50']}/{sizes['p90']}/{sizes['max']}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the document chunking of the RAG ingestion locally.")
+    parser.add_argument("--strategy", default="character", choices=["character", "token", "sentence"])
+    parser.add_argument("--chunk-size", type=int, default=4000)
+    parser.add_argument("--chunk-overlap", type=int, default=400)
+    parser.add_argument("--pages", type=int, nargs="*", default=[100, 1000], help="Page counts of the synthetic PDFs")
+    parser.add_argument("--skip-memory", action="store_true", help="Skip the slower peak memory pass")
+    parser.add_argument("--json", type=Path, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    version, chunker = load_chunker()
+    chunking = {"strategy": args.strategy, "chunk_size": args.chunk_size, "chunk_overlap": args.chunk_overlap}
+    document_sets = [(
+        "sample_contracts",
+        [
+            (path.name, path.read_bytes())
+            for path in sorted(SAMPLE_DIR.iterdir())
+            if path.suffix.lower().lstrip(".") in chunker["READERS"]
+        ],
+    )]
+    document_sets += [(f"synthetic_{pages}p", [(f"synthetic_{pages}.pdf", make_pdf(pages))]) for pages in args.pages]
+
+    results = [
+        run_benchmark(chunker, name, documents, chunking, measure_memory=not args.skip_memory)
+        for name, documents in document_sets
+    ]
+    print_results(version, chunking, results)
+    if args.json:
+        args.json.write_text(json.dumps({"version": version, "chunking": chunking, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,14 @@
 import streamlit as st
-import asyncio
-import threading
 from src.cortex_functions import *
 from snowflake.snowpark.exceptions import SnowparkSQLException
 from src.notification import *
 from src.utils import *
 from src import rag, fine_tune, search  # Import RAG and Fine Tune modules
+from src.jobs import get_job_executor, get_job_owner, get_job_user, record_query_id, cancellation_check
 from pathlib import Path
 import json
+import pandas as pd
+from datetime import timedelta
 from src.query_result_builder import fetch_fine_tuned_models
 
 # Load the config file
@@ -15,11 +16,16 @@ config_path = Path("src/settings_config.json")
 with open(config_path, "r") as f:
     config = json.load(f)
 
-async def async_execute_functionality(session, functionality, input_data, settings, notification_id):
+def execute_functionality_job(job, session, functionality, input_data, settings, notification_id):
     """
-    Executes the selected functionality asynchronously and updates the notification status.
+    Executes the selected functionality as a background job and updates the notification status.
+
+    Single-query operations are submitted as asynchronous Snowflake queries and the job is
+    detached, so no thread waits for them; their notification is settled by reconcile_jobs.
+    Partitioned operations keep a worker while they feed batches to the warehouse.
 
     Args:
+        job (Job): The job running this function.
         session (snowflake.snowpark.Session): Active Snowflake session.
         functionality (str): The functionality to execute (e.g., 'Complete', 'Translate', etc.).
         input_data (dict): Input data containing database, schema, table, column, and output details.
@@ -30,65 +36,232 @@ async def async_execute_functionality(session, functionality, input_data, settin
         Exception: If an error occurs during execution.
     """
     try:
+        if settings.get('partitions', 1) > 1 or settings.get('isolate_errors') or settings.get('retry_failed_rows'):
+            result = execute_partitioned_functionality(job, session, functionality, input_data, settings, notification_id)
+            if result['cancelled']:
+                return
+            if result['failures']:
+                raise RuntimeError(f"{len(result['failures'])} of {result['partitions']} partitions failed")
+            # Update the notification to 'Success'
+            update_notification_entry(session, notification_id, 'Success')
+            return
+
         if functionality == "Complete":
-            await asyncio.sleep(1)
-            get_complete_result_from_column(
+            async_job = get_complete_result_from_column(
                 session, settings['model'], input_data['database'], input_data['schema'], input_data['table'],
                 input_data['column'], settings['temperature'], settings['max_tokens'], settings['guardrails'],
                 input_data['output_table'], input_data['output_column'], system_prompt=settings['system_prompt'],
-                user_prompt=settings.get('user_prompt')
+                user_prompt=settings.get('user_prompt'), block=False
             )
         elif functionality == "Translate":
-            await asyncio.sleep(1)
-            get_translation_from_column(
+            async_job = get_translation_from_column(
                 session, input_data['database'], input_data['schema'], input_data['table'], input_data['column'],
-                settings['source_lang'], settings['target_lang'], input_data['output_table'], input_data['output_column']
+                settings['source_lang'], settings['target_lang'], input_data['output_table'], input_data['output_column'],
+                block=False
             )
         elif functionality == "Summarize":
-            await asyncio.sleep(1)
-            get_summary_from_column(
+            async_job = get_summary_from_column(
                 session, input_data['database'], input_data['schema'], input_data['table'], input_data['column'],
-                input_data['output_table'], input_data['output_column']
+                input_data['output_table'], input_data['output_column'], block=False
             )
         elif functionality == "Extract":
-            await asyncio.sleep(1)
-            get_extraction_from_column(
+            async_job = get_extraction_from_column(
                 session, input_data['database'], input_data['schema'], input_data['table'], input_data['column'],
-                input_data['query'], input_data['output_table'], input_data['output_column']
+                input_data['query'], input_data['output_table'], input_data['output_column'], block=False
             )
         elif functionality == "Sentiment":
-            await asyncio.sleep(1)
-            get_sentiment_from_column(
+            async_job = get_sentiment_from_column(
                 session, input_data['database'], input_data['schema'], input_data['table'], input_data['column'],
-                input_data['output_table'], input_data['output_column']
+                input_data['output_table'], input_data['output_column'], block=False
             )
 
-        # Update the notification to 'Success'
-        update_notification_entry(session, notification_id, 'Success')
-        st.success("Operation completed successfully. Check the notification screen.")
+        # The notification is settled from the query status by reconcile_jobs
+        record_query_id(session, job, async_job.query_id)
+        job.detach()
     except Exception as e:
         # Log the error and update notification to 'Failed'
         update_notification_entry(session, notification_id, 'Failed')
         add_log_entry(session, functionality, str(e))
-        st.error("Operation failed. Check logs in the notification screen.")
         raise e
 
+def execute_partitioned_functionality(job, session, functionality, input_data, settings, notification_id):
+    """
+    Executes the selected functionality as concurrent hash-partition queries.
+
+    Progress and failures of all partitions are merged into the single notification entry
+    and every failed partition is logged. With
+    'isolate_errors' enabled, failing rows are moved to the <output_table>_ERRORS dead-letter
+    table instead, and with 'retry_failed_rows' only the rows of that table are processed.
+
+    Args:
+        job (Job): The job running this function, which records the batch query IDs.
+        session (snowflake.snowpark.Session): Active Snowflake session.
+        functionality (str): The functionality to execute.
+        input_data (dict): Input data for the operation.
+        settings (dict): Configuration settings, including 'partitions' and 'max_concurrency'.
+        notification_id (str): ID of the notification entry to update.
+
+    Returns:
+        dict: Result of the partition runner, including the failed partitions.
+    """
+    base_details = f"Running {functionality} on {input_data['table']} table"
+    dead_letter_table = get_dead_letter_table(input_data) if settings.get('isolate_errors') else None
+
+    def report_progress(progress):
+        details = f"{base_details}: {progress['completed']}/{progress['batches']} partitions completed"
+        if progress['failures']:
+            details += f", {len(progress['failures'])} failed"
+        update_notification_progress(
+            session, notification_id, progress['rows_processed'], progress['rows_total'], details,
+            pending_batches=progress['pending']
+        )
+
+    def track_query(query_id):
+        record_query_id(session, job, query_id)
+
+    expression, _ = get_functionality_expression(functionality, input_data, settings)
+    if settings.get('retry_failed_rows'):
+        result = retry_dead_letter_rows(
+            session, input_data['database'], input_data['schema'], input_data['column'], expression,
+            input_data['output_table'], input_data['output_column'], get_dead_letter_table(input_data),
+            settings['max_concurrency'], on_progress=report_progress, on_query=track_query,
+            should_cancel=cancellation_check(session, job)
+        )
+    else:
+        result = get_partitioned_result_from_column(
+            session, input_data['database'], input_data['schema'], input_data['table'], input_data['column'],
+            expression, input_data['output_table'], input_data['output_column'],
+            settings['partitions'], settings['max_concurrency'], on_progress=report_progress,
+            dead_letter_table=dead_letter_table, on_query=track_query, should_cancel=cancellation_check(session, job)
+        )
+
+    for partition, error in result['failures']:
+        add_log_entry(session, functionality, f"Partition {partition}/{result['partitions']} failed: {error}")
+    if result['dead_lettered']:
+        update_notification_details(
+            session, notification_id,
+            f"{base_details}: {result['dead_lettered']} failing rows moved to {get_dead_letter_table(input_data)}"
+        )
+    return result
+
+def get_dead_letter_table(input_data):
+    """
+    Returns the name of the dead-letter table collecting the failing rows of a Build job.
+
+    Args:
+        input_data (dict): Input data for the operation.
+
+    Returns:
+        str: Name of the dead-letter table.
+    """
+    return f"{input_data['output_table']}_ERRORS"
+
 def trigger_async_operation(session, functionality, input_data, settings):
     """
-    Triggers an asynchronous operation for a specified functionality.
+    Submits a specified functionality to the shared background job executor.
 
     Args:
         session (snowflake.snowpark.Session): Active Snowflake session.
         functionality (str): The functionality to execute.
         input_data (dict): Input data for the operation.
         settings (dict): Configuration settings for the functionality.
+
+    Raises:
+        RuntimeError: If the job queue is full.
     """
     details = f"Running {functionality} on {input_data['table']} table"
+    if settings.get('retry_failed_rows'):
+        details = f"Retrying failed {functionality} rows of {get_dead_letter_table(input_data)}"
     notification_id = add_notification_entry(session, functionality, 'In-Progress', details)
 
-    # Use threading to run the async function without blocking the UI
-    thread = threading.Thread(target=asyncio.run, args=(async_execute_functionality(session, functionality, input_data, settings, notification_id),))
-    thread.start()
+    try:
+        get_job_executor().submit(
+            functionality, execute_functionality_job, session, functionality, input_data, settings, notification_id,
+            owner=get_job_owner(), notification_id=notification_id, user=get_job_user(session), session=session
+        )
+    except RuntimeError as e:
+        update_notification_entry(session, notification_id, 'Failed')
+        add_log_entry(session, functionality, str(e))
+        raise e
+
+def get_functionality_expression(functionality, input_data, settings):
+    """
+    Builds the per-row SQL expression and the COUNT_TOKENS counter for a functionality.
+
+    Args:
+        functionality (str): The functionality to estimate (e.g., 'Complete', 'Translate').
+        input_data (dict): Input data containing table, column and output details.
+        settings (dict): Configuration settings for the functionality.
+
+    Returns:
+        tuple: (SQL expression, model or function name understood by COUNT_TOKENS).
+    """
+    column = input_data['column']
+    if functionality == "Complete":
+        expression = get_complete_expression(
+            settings['model'], input_data['table'], column, settings['temperature'], settings['max_tokens'],
+            settings['guardrails'], system_prompt=settings['system_prompt'], user_prompt=settings.get('user_prompt')
+        )
+        return expression, settings['model']
+    elif functionality == "Translate":
+        return get_translation_expression(column, settings['source_lang'], settings['target_lang']), "translate"
+    elif functionality == "Summarize":
+        return get_summary_expression(column), "summarize"
+    elif functionality == "Extract":
+        return get_extraction_expression(column, input_data['query']), "extract_answer"
+    elif functionality == "Sentiment":
+        return get_sentiment_expression(column), "sentiment"
+    raise ValueError(f"Unsupported functionality: {functionality}")
+
+def estimate_functionality_cost(session, functionality, input_data, settings):
+    """
+    Runs the functionality on a random sample and extrapolates runtime and credits for the full table.
+
+    Complete is billed for its system and user prompt as well as the column text, and
+    Sentiment for its input only, so the token counts follow suit.
+
+    Args:
+        session (snowflake.snowpark.Session): Active Snowflake session.
+        functionality (str): The functionality to estimate.
+        input_data (dict): Input data for the operation.
+        settings (dict): Configuration settings for the functionality.
+
+    Returns:
+        dict: Estimate as returned by estimate_column_operation.
+    """
+    defaults = config["default_settings"]
+    expression, token_counter = get_functionality_expression(functionality, input_data, settings)
+    prompt_expression = None
+    if functionality == "Complete":
+        prompt_expression = get_complete_prompt_expression(
+            input_data['table'], input_data['column'], settings['system_prompt'], settings.get('user_prompt')
+        )
+    rates = defaults["credits_per_million_tokens"]
+    return estimate_column_operation(
+        session, input_data['database'], input_data['schema'], input_data['table'], input_data['column'],
+        expression, token_counter, rates.get(token_counter, rates["default"]),
+        sample_size=defaults["estimate_sample_size"], prompt_expression=prompt_expression,
+        count_output_tokens=functionality != "Sentiment"
+    )
+
+def display_estimate(estimate):
+    """
+    Displays a cost and runtime estimate produced by estimate_functionality_cost.
+
+    Args:
+        estimate (dict): Estimate to display.
+    """
+    st.subheader("Estimate")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Rows", f"{estimate['total_rows']:,}")
+    col2.metric("Est. Runtime", str(timedelta(seconds=int(estimate['estimated_seconds']))))
+    col3.metric("Est. Tokens", f"{estimate['estimated_tokens']:,}")
+    col4.metric("Est. Credits", f"{estimate['estimated_credits']:.2f}")
+    st.caption(
+        f"Based on {estimate['sample_rows']} sampled rows in {estimate['sample_seconds']:.1f}s "
+        f"({estimate['seconds_per_row']:.2f}s and {estimate['tokens_per_row']:.0f} tokens per row). "
+        "Runtime is extrapolated linearly and is an upper bound for multi-node warehouses."
+    )
 
 def get_functionality_settings(functionality, config, session=None):
     """
@@ -183,6 +356,90 @@ def get_non_playground_input(session, functionality):
 
     return input_data
 
+def deploy_cdc_pipeline(session, functionality, input_data, settings, pipeline_name, schedule, process_existing_rows):
+    """
+    Deploys the selected functionality as a continuous STREAM + TASK pipeline.
+
+    Args:
+        session (snowflake.snowpark.Session): Active Snowflake session.
+        functionality (str): The functionality to deploy.
+        input_data (dict): Input data for the operation.
+        settings (dict): Configuration settings for the functionality.
+        pipeline_name (str): Name of the pipeline.
+        schedule (str): Task schedule.
+        process_existing_rows (bool): Whether the first run processes the existing rows too.
+    """
+    details = f"Deploying {functionality} pipeline {pipeline_name} on {input_data['table']} table"
+    notification_id = add_notification_entry(session, "Deploy Pipeline", 'In-Progress', details)
+    try:
+        expression, _ = get_functionality_expression(functionality, input_data, settings)
+        create_cdc_pipeline(
+            session, input_data['database'], input_data['schema'], input_data['table'], input_data['column'],
+            expression, input_data['output_table'], input_data['output_column'], pipeline_name,
+            config["warehouse"], schedule, process_existing_rows=process_existing_rows
+        )
+        update_notification_entry(session, notification_id, 'Success')
+    except Exception as e:
+        update_notification_entry(session, notification_id, 'Failed')
+        add_log_entry(session, "Deploy Pipeline", str(e))
+        raise e
+
+def display_cdc_pipelines(session):
+    """
+    Displays the controls to monitor, suspend, resume and drop deployed CDC pipelines.
+
+    Args:
+        session (snowflake.snowpark.Session): Active Snowflake session.
+    """
+    st.subheader("Continuous Pipelines")
+    col1, col2 = st.columns(2)
+    database = col1.selectbox("Database", list_databases(session), key="pipeline_db")
+    schema = col2.selectbox("Schema", list_schemas(session, database) if database else [], key="pipeline_schema")
+    if not schema:
+        return
+
+    try:
+        pipelines = list_cdc_pipelines(session, database, schema)
+    except Exception as e:
+        add_log_entry(session, "List Pipelines", str(e))
+        st.error(f"Failed to list pipelines: {e}")
+        return
+
+    if not pipelines:
+        st.info("No pipelines deployed in this schema.")
+        return
+
+    st.dataframe(pd.DataFrame(pipelines).drop(columns=["Definition"]))
+    selected = st.selectbox("Pipeline", [pipeline["Pipeline"] for pipeline in pipelines])
+
+    col1, col2, col3 = st.columns(3)
+    action = None
+    if col1.button("Suspend"):
+        action = "SUSPEND"
+    if col2.button("Resume"):
+        action = "RESUME"
+    if col3.button("Drop"):
+        action = "DROP"
+    if action:
+        try:
+            set_cdc_pipeline_state(session, database, schema, selected, action)
+            st.success(f"Pipeline {selected}: {action.lower()} succeeded.")
+        except Exception as e:
+            add_log_entry(session, "Manage Pipeline", str(e))
+            st.error(f"Failed to {action.lower()} pipeline {selected}: {e}")
+        return
+
+    st.write("Recent Runs")
+    try:
+        history = fetch_cdc_pipeline_history(session, database, schema, selected)
+        if history.empty:
+            st.write("No runs yet.")
+        else:
+            st.dataframe(history)
+    except Exception as e:
+        add_log_entry(session, "Pipeline History", str(e))
+        st.error(f"Failed to fetch pipeline history: {e}")
+
 def display_build(session):
     """
     Displays the build mode interface in the Streamlit app.
@@ -197,7 +454,7 @@ def display_build(session):
 
     # Extend the functionality options to include RAG and Fine Tune
     functionality = st.selectbox(
-        "Choose functionality:", ["Complete", "Translate", "Summarize", "Extract", "Sentiment", "RAG", "Fine Tune"]
+        "Choose functionality:", ["Complete", "Translate", "Summarize", "Extract", "Sentiment", "RAG", "Fine Tune", "Pipelines"]
     )
 
     if functionality != "Select Functionality":
@@ -206,14 +463,89 @@ def display_build(session):
             rag.display_rag(session)
         elif functionality == "Fine Tune":
             fine_tune.display_fine_tune(session)
+        elif functionality == "Pipelines":
+            display_cdc_pipelines(session)
         else:
             # For other functionalities, continue with the existing flow
             settings = get_functionality_settings(functionality, config,session)
             input_data = get_non_playground_input(session, functionality)
 
-            if st.button(f"Run"):
+            deployment = st.radio("Deployment", ["Run Once", "Continuous (Stream + Task)"], horizontal=True)
+            if deployment == "Continuous (Stream + Task)":
+                col1, col2 = st.columns(2)
+                pipeline_name = col1.text_input("Pipeline Name", placeholder="Use only _ for word spacing")
+                schedule = col2.text_input("Schedule", value="5 MINUTE", help="Task schedule, e.g. '5 MINUTE' or 'USING CRON 0 * * * * UTC'")
+                process_existing_rows = st.checkbox("Process existing rows on the first run", value=True)
+                if st.button("Deploy", disabled=not pipeline_name):
+                    try:
+                        deploy_cdc_pipeline(session, functionality, input_data, settings, pipeline_name, schedule, process_existing_rows)
+                        st.success(f"Pipeline {pipeline_name} deployed. Manage it under Build > Pipelines.")
+                    except Exception as e:
+                        st.error(f"Failed to deploy pipeline: {e}")
+                return
+
+            with st.expander("Execution"):
+                col1, col2 = st.columns(2)
+                settings['partitions'] = col1.number_input(
+                    "Partitions", min_value=1, max_value=256, value=config["default_settings"]["build_partitions"],
+                    help="Split the source into hash partitions that run as concurrent queries (1 runs a single query). "
+                         "Progress is reported each time a partition completes."
+                )
+                settings['max_concurrency'] = col2.number_input(
+                    "Max Concurrent Queries", min_value=1, max_value=64, value=config["default_settings"]["build_max_concurrency"],
+                    help="Upper bound of partition queries running at the same time on the warehouse"
+                )
+                settings['isolate_errors'] = st.checkbox(
+                    "Isolate failing rows", value=config["default_settings"]["build_isolate_errors"],
+                    help="Retry failed batches in halves and move rows that fail on their own to <output table>_ERRORS. "
+                         "Runs the partition queries even with 1 partition."
+                )
+                if st.button("Retry Failed Rows", disabled=not input_data['output_table'],
+                             help="Process only the rows of <output table>_ERRORS and append the results"):
+                    try:
+                        trigger_async_operation(session, functionality, input_data, dict(settings, retry_failed_rows=True))
+                        st.success("Retry triggered. Check the notifications screen for updates.")
+                    except (SnowparkSQLException, RuntimeError) as e:
+                        st.error(f"Error: {e}")
+
+            # Estimates are only valid for the model and prompt settings they were computed with;
+            # the execution options do not change tokens or credits
+            estimate_settings = {
+                key: value for key, value in settings.items()
+                if key not in ("partitions", "max_concurrency", "isolate_errors")
+            }
+            estimate_key = json.dumps([functionality, input_data, estimate_settings], sort_keys=True, default=str)
+            if st.session_state.get("build_estimate_key") != estimate_key:
+                st.session_state.build_estimate = None
+
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("Estimate Cost", help="Run on a random sample to estimate runtime and credits"):
+                    try:
+                        with st.spinner("Running on a sample..."):
+                            st.session_state.build_estimate = estimate_functionality_cost(session, functionality, input_data, settings)
+                            st.session_state.build_estimate_key = estimate_key
+                    except Exception as e:
+                        add_log_entry(session, "Estimate Cost", str(e))
+                        st.error(f"Failed to estimate cost: {e}")
+
+            # Run is only offered once the estimate of the current configuration has been confirmed
+            estimate = st.session_state.get("build_estimate")
+            confirmed = False
+            if estimate:
+                display_estimate(estimate)
+                confirmed = st.checkbox(
+                    f"Run on {estimate['total_rows']:,} rows for about {estimate['estimated_credits']:.2f} credits",
+                    key=f"build_estimate_confirmed_{hash(estimate_key)}"
+                )
+
+            with col2:
+                run_clicked = st.button(
+                    f"Run", disabled=not confirmed, help="Estimate the cost and confirm it first"
+                )
+            if run_clicked:
                 try:
                     trigger_async_operation(session, functionality, input_data, settings)
                     st.success(f"Operation {functionality} triggered. Check the notifications screen for updates.")
-                except SnowparkSQLException as e:
+                except (SnowparkSQLException, RuntimeError) as e:
                     st.error(f"Error: {e}")
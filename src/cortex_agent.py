@@ -3,6 +3,7 @@ from src.utils import *  # Utility functions for database operations
 from src.cortex_functions import *  # Cortex-specific helper functions
 from src.query_result_builder import *  # Query result formatting utilities
 from src.notification import *  # Notification/toast message utilities
+from src.jobs import get_job_executor  # Holds back background jobs during chat calls
 import json
 from pathlib import Path
 from datetime import datetime, timezone
@@ -755,7 +756,7 @@ def display_cortex_agent(session):
 
             if st.button("Send", key="send"):
                 if question.strip():
-                    with st.spinner("Processing your request..."):
+                    with st.spinner("Processing your request..."), get_job_executor().interactive_call():
                         text, sql = agent.chat(session, question)
                         if text:
                             text = text.replace("【†", "[")
@@ -1,5 +1,7 @@
 from snowflake.snowpark.exceptions import SnowparkSQLException
 import json
+import time
+import uuid
 import streamlit as st
 
 
@@ -15,7 +17,7 @@ def escape_sql_string(s):
     return s.replace("'", "''")
 
 
-def check_and_create_table(session, db, schema, table, columns):
+def check_and_create_table(session, db, schema, table, columns, replace=True):
     """
     Check if the table exists and if it does, truncate it.
     If the table does not exist, create it with the specified columns.
@@ -26,9 +28,15 @@ def check_and_create_table(session, db, schema, table, columns):
         schema: Schema name.
         table: Table name.
         columns: List of column definitions (e.g., ["col1 STRING", "col2 NUMBER"]).
+        replace (bool, optional): Whether to drop an existing table. If False, an existing
+            table is kept with its rows. Defaults to True.
     """
     full_table_name = f"{db}.{schema}.{table}"
 
+    if not replace:
+        session.sql(f"CREATE TABLE IF NOT EXISTS {full_table_name} ({', '.join(columns)})").collect()
+        return
+
     # Check if the table exists
     table_exists_query = f"SHOW TABLES IN SCHEMA {db}.{schema}"
     tables = session.sql(table_exists_query).collect()
@@ -331,7 +339,424 @@ def get_entity_sentiment(session, text, entities):
     except SnowparkSQLException as e:
         raise e
 
-def get_complete_result_from_column(session, model, db, schema, table, input_column, temperature, max_tokens, guardrails, output_table, output_column, system_prompt=None, user_prompt=None):
+def get_complete_expression(model, table, input_column, temperature, max_tokens, guardrails, system_prompt=None, user_prompt=None):
+    """Builds the per-row COMPLETE expression used by the column based Build operations.
+    
+    Args:
+        model (str): The model to use for completion.
+        table (str): Input table name, used to tag the column content in the prompt.
+        input_column (str): Column containing input text.
+        temperature (float): Temperature parameter for generation.
+        max_tokens (int): Maximum tokens to generate.
+        guardrails (bool): Whether to enable guardrails.
+        system_prompt (str, optional): System prompt to prepend.
+        user_prompt (str, optional): User prompt template.
+        
+    Returns:
+        str: SQL expression returning the completion message for the current row.
+    """
+    # Escape system prompt
+    system_prompt_escaped = escape_sql_string(system_prompt) if system_prompt else ""
+    user_prompt_sql = get_complete_user_prompt(table, input_column, user_prompt)
+
+    return f"""GET_PATH(
+            SNOWFLAKE.CORTEX.COMPLETE(
+                '{model}',
+                ARRAY_CONSTRUCT(
+                    OBJECT_CONSTRUCT('role', 'system', 'content', '{system_prompt_escaped}'),
+                    OBJECT_CONSTRUCT('role', 'user', 'content', {user_prompt_sql})
+                ),
+                OBJECT_CONSTRUCT(
+                    'temperature', {temperature},
+                    'max_tokens', {max_tokens},
+                    'guardrails', {str(guardrails).lower()}
+                )
+            ),
+            'choices[0].messages'
+        )"""
+
+
+def get_complete_user_prompt(table, input_column, user_prompt=None):
+    """Builds the per-row user message sent to COMPLETE by the column based Build operations.
+    
+    Args:
+        table (str): Input table name, used to tag the column content in the prompt.
+        input_column (str): Column containing input text.
+        user_prompt (str, optional): User prompt template.
+        
+    Returns:
+        str: SQL expression returning the user message for the current row.
+    """
+    user_prompt_escaped = escape_sql_string(user_prompt) if user_prompt else ""
+    return f"'{user_prompt_escaped} <{table}>' || {input_column} || '</{table}>'"
+
+
+def get_complete_prompt_expression(table, input_column, system_prompt=None, user_prompt=None):
+    """Builds the per-row text of all messages sent to COMPLETE, for counting its input tokens.
+    
+    Args:
+        table (str): Input table name, used to tag the column content in the prompt.
+        input_column (str): Column containing input text.
+        system_prompt (str, optional): System prompt to prepend.
+        user_prompt (str, optional): User prompt template.
+        
+    Returns:
+        str: SQL expression returning the system and user messages of the current row.
+    """
+    system_prompt_escaped = escape_sql_string(system_prompt) if system_prompt else ""
+    return f"'{system_prompt_escaped}\\n' || {get_complete_user_prompt(table, input_column, user_prompt)}"
+
+
+def get_translation_expression(input_column, source_lang, target_lang):
+    """Builds the per-row TRANSLATE expression used by the column based Build operations.
+    
+    Args:
+        input_column (str): Column containing text to translate.
+        source_lang (str): Source language code.
+        target_lang (str): Target language code.
+        
+    Returns:
+        str: SQL expression returning the translated text for the current row.
+    """
+    return f"CAST(SNOWFLAKE.CORTEX.TRANSLATE({input_column}, '{source_lang}', '{target_lang}') AS STRING)"
+
+
+def get_summary_expression(input_column):
+    """Builds the per-row SUMMARIZE expression used by the column based Build operations.
+    
+    Args:
+        input_column (str): Column containing text to summarize.
+        
+    Returns:
+        str: SQL expression returning the summary for the current row.
+    """
+    return f"CAST(SNOWFLAKE.CORTEX.SUMMARIZE({input_column}) AS STRING)"
+
+
+def get_extraction_expression(input_column, query_text):
+    """Builds the per-row EXTRACT_ANSWER expression used by the column based Build operations.
+    
+    Args:
+        input_column (str): Column containing source text.
+        query_text (str): Query text to guide extraction.
+        
+    Returns:
+        str: SQL expression returning the extracted answer for the current row.
+    """
+    query_text_escaped = escape_sql_string(query_text)
+    return f"CAST(SNOWFLAKE.CORTEX.EXTRACT_ANSWER({input_column}, '{query_text_escaped}') AS STRING)"
+
+
+def get_sentiment_expression(input_column):
+    """Builds the per-row SENTIMENT expression used by the column based Build operations.
+    
+    Args:
+        input_column (str): Column containing text to analyze.
+        
+    Returns:
+        str: SQL expression returning the sentiment score for the current row.
+    """
+    return f"CAST(SNOWFLAKE.CORTEX.SENTIMENT({input_column}) AS STRING)"
+
+
+def estimate_column_operation(session, db, schema, table, input_column, expression, token_counter, credits_per_million_tokens, sample_size=20, prompt_expression=None, count_output_tokens=True):
+    """Estimates runtime, token usage and credits of a column based Build operation.
+    
+    Runs the operation's expression over a random sample of the source table, measures
+    the per-row latency and token usage, and extrapolates them to the full table using
+    COUNT(*). The runtime estimate assumes the sample latency scales linearly with the
+    row count, so it is an upper bound for warehouses that parallelize the full run.
+    
+    Input tokens are counted over prompt_expression, the full text sent per row, which
+    defaults to the input column. Output tokens are only counted for operations billed
+    for them; SENTIMENT, for example, is billed on its input alone.
+    
+    Args:
+        session: Snowflake session.
+        db (str): Database name.
+        schema (str): Schema name.
+        table (str): Input table name.
+        input_column (str): Column containing input text.
+        expression (str): Per-row SQL expression of the operation (see get_*_expression).
+        token_counter (str): Model or function name passed to COUNT_TOKENS.
+        credits_per_million_tokens (float): Credit rate of the operation.
+        sample_size (int, optional): Number of rows to sample. Defaults to 20.
+        prompt_expression (str, optional): Per-row SQL expression of the text sent to the
+            function (see get_complete_prompt_expression). Defaults to the input column.
+        count_output_tokens (bool, optional): Whether the output is billed. Defaults to True.
+        
+    Returns:
+        dict: Sample measurements and the extrapolated totals for the full table.
+        
+    Raises:
+        SnowparkSQLException: If the query fails.
+    """
+    source_table_full = f"{db}.{schema}.{table}"
+
+    count_query = f"SELECT COUNT(*) FROM {source_table_full}"
+    sample_query = f"""
+    WITH sampled AS (
+        SELECT {input_column} FROM {source_table_full} SAMPLE ({int(sample_size)} ROWS)
+    ),
+    results AS (
+        SELECT {prompt_expression or input_column} AS prompt, TO_VARCHAR({expression}) AS output FROM sampled
+    )
+    SELECT COUNT(*) AS sample_rows,
+        COALESCE(SUM(SNOWFLAKE.CORTEX.COUNT_TOKENS('{token_counter}', prompt)), 0) AS input_tokens,
+        {f"COALESCE(SUM(SNOWFLAKE.CORTEX.COUNT_TOKENS('{token_counter}', output)), 0)" if count_output_tokens else "0"} AS output_tokens
+    FROM results;
+    """
+    try:
+        total_rows = session.sql(count_query).collect()[0][0]
+        started = time.time()
+        sample = session.sql(sample_query).collect()[0]
+        sample_seconds = time.time() - started
+    except SnowparkSQLException as e:
+        raise e
+
+    sample_rows = sample["SAMPLE_ROWS"]
+    if not sample_rows:
+        return {
+            "total_rows": total_rows, "sample_rows": 0, "sample_seconds": sample_seconds,
+            "seconds_per_row": 0.0, "tokens_per_row": 0.0,
+            "estimated_seconds": 0.0, "estimated_tokens": 0, "estimated_credits": 0.0
+        }
+
+    seconds_per_row = sample_seconds / sample_rows
+    tokens_per_row = (int(sample["INPUT_TOKENS"]) + int(sample["OUTPUT_TOKENS"])) / sample_rows
+    estimated_tokens = int(tokens_per_row * total_rows)
+    return {
+        "total_rows": total_rows,
+        "sample_rows": sample_rows,
+        "sample_seconds": sample_seconds,
+        "seconds_per_row": seconds_per_row,
+        "tokens_per_row": tokens_per_row,
+        "estimated_seconds": seconds_per_row * total_rows,
+        "estimated_tokens": estimated_tokens,
+        "estimated_credits": estimated_tokens / 1_000_000 * credits_per_million_tokens
+    }
+
+
+def get_partitioned_result_from_column(session, db, schema, table, input_column, expression, output_table, output_column, partitions, max_concurrency, on_progress=None, poll_interval=2, dead_letter_table=None, replace_output=True, max_bisection_queries=200, on_query=None, should_cancel=None):
+    """Writes the result of a per-row expression to an output table using concurrent partition queries.
+    
+    The source table is split into hash partitions of the input column. Every partition is
+    submitted as its own asynchronous INSERT ... SELECT, with at most max_concurrency queries
+    running at a time, so a multi-cluster warehouse can spread them across clusters. A failed
+    partition does not stop the others.
+    
+    When a dead_letter_table is given, a failed partition is bisected into two halves of its
+    hash range and retried until a failing slice holds a single distinct input. Those rows
+    are written with their error to the dead-letter table while the rest of the output
+    commits. Once max_bisection_queries retry queries have been spent, a failing slice is
+    dead-lettered as a whole, which bounds the number of queries when many rows fail.
+    Recreating the output also recreates the dead-letter table, so it only holds the
+    failures of the current output. Without a dead-letter table, failed partitions are
+    collected and returned.
+    
+    Args:
+        session: Snowflake session.
+        db (str): Database name.
+        schema (str): Schema name.
+        table (str): Input table name.
+        input_column (str): Column containing input text.
+        expression (str): Per-row SQL expression of the operation (see get_*_expression).
+        output_table (str): Table to write results to.
+        output_column (str): Column to write results to.
+        partitions (int): Number of hash partitions to split the source into.
+        max_concurrency (int): Maximum number of partition queries running at once.
+        on_progress (callable, optional): Called with a progress dict (completed, known and
+            not yet submitted batches, failures, rows processed and total rows) whenever a
+            batch finishes.
+        poll_interval (int, optional): Seconds between status checks. Defaults to 2.
+        dead_letter_table (str, optional): Table receiving rows that fail on their own.
+        replace_output (bool, optional): Whether to recreate the output and dead-letter tables.
+            Defaults to True.
+        max_bisection_queries (int, optional): Maximum number of queries spent retrying the
+            halves of failed slices. Defaults to 200.
+        on_query (callable, optional): Called with the query ID of every submitted batch.
+        should_cancel (callable, optional): Checked whenever batches finish; when it returns
+            True, the running batches are cancelled and no further batches are submitted.
+        
+    Returns:
+        dict: Number of batches, completed batches, a list of (batch, error) failures, the
+        number of dead-lettered rows and whether the run was cancelled.
+    """
+    columns = [
+        f"{input_column} VARCHAR(16777216)",
+        f"{output_column} VARCHAR(16777216)"
+    ]
+    # Ensure output table exists
+    if replace_output:
+        check_and_create_table(session, db, schema, output_table, columns)
+
+    source_table_full = f"{db}.{schema}.{table}"
+    output_table_full = f"{db}.{schema}.{output_table}"
+    if dead_letter_table:
+        dead_letter_table_full = f"{db}.{schema}.{dead_letter_table}"
+        session.sql(f"""
+            {"CREATE OR REPLACE TABLE" if replace_output else "CREATE TABLE IF NOT EXISTS"} {dead_letter_table_full} (
+                {input_column} VARCHAR(16777216),
+                error_message VARCHAR(16777216),
+                failed_at TIMESTAMP
+            )
+        """).collect()
+
+    rows_total = session.sql(f"SELECT COUNT(*) FROM {source_table_full}").collect()[0][0]
+
+    # A batch is the slice of the source whose input hash equals remainder modulo modulus
+    pending = [(partitions, partition) for partition in range(partitions)]
+    running = {}
+    batches = partitions
+    completed = 0
+    rows_processed = 0
+    dead_lettered = 0
+    bisection_queries = 0
+    failures = []
+    cancelled = False
+    while pending or running:
+        # Keep up to max_concurrency batch queries in flight
+        while pending and len(running) < max_concurrency:
+            batch = pending.pop(0)
+            query = f"""
+            INSERT INTO {output_table_full} ({input_column}, {output_column})
+            SELECT {input_column}, {expression}
+            FROM {source_table_full}
+            WHERE MOD(ABS(HASH({input_column})), {batch[0]}) = {batch[1]};
+            """
+            running[batch] = session.sql(query).collect_nowait()
+            if on_query:
+                on_query(running[batch].query_id)
+
+        time.sleep(poll_interval)
+        finished = [(batch, job) for batch, job in running.items() if job.is_done()]
+        # Check before handling failures, which may be caused by the cancellation itself
+        if finished and should_cancel and should_cancel():
+            for job in running.values():
+                job.cancel()
+            cancelled = True
+            break
+
+        for batch, job in finished:
+            del running[batch]
+            try:
+                # INSERT returns a single row holding the number of inserted rows
+                rows_processed += job.result()[0][0]
+                completed += 1
+            except Exception as e:
+                if not dead_letter_table:
+                    failures.append((batch, str(e)))
+                else:
+                    modulus, remainder = batch
+                    predicate = f"MOD(ABS(HASH({input_column})), {modulus}) = {remainder}"
+                    counts = session.sql(f"""
+                        SELECT COUNT(*) AS row_count, COUNT(DISTINCT ABS(HASH({input_column}))) AS distinct_inputs
+                        FROM {source_table_full}
+                        WHERE {predicate}
+                    """).collect()[0]
+                    if counts["DISTINCT_INPUTS"] > 1 and bisection_queries + 2 <= max_bisection_queries:
+                        # Split the hash range in two and retry both halves
+                        pending.extend([(modulus * 2, remainder), (modulus * 2, remainder + modulus)])
+                        bisection_queries += 2
+                        batches += 1
+                    else:
+                        session.sql(f"""
+                            INSERT INTO {dead_letter_table_full} ({input_column}, error_message, failed_at)
+                            SELECT {input_column}, '{escape_sql_string(str(e))}', CURRENT_TIMESTAMP
+                            FROM {source_table_full}
+                            WHERE {predicate}
+                        """).collect()
+                        dead_lettered += counts["ROW_COUNT"]
+                        rows_processed += counts["ROW_COUNT"]
+                        completed += 1
+            if on_progress:
+                on_progress({
+                    "completed": completed, "batches": batches, "pending": len(pending), "failures": failures,
+                    "rows_processed": rows_processed, "rows_total": rows_total
+                })
+
+    return {
+        "partitions": batches, "completed": completed, "failures": failures, "cancelled": cancelled,
+        "dead_lettered": dead_lettered, "rows_processed": rows_processed, "rows_total": rows_total
+    }
+
+
+def retry_dead_letter_rows(session, db, schema, input_column, expression, output_table, output_column, dead_letter_table, max_concurrency, on_progress=None, on_query=None, should_cancel=None):
+    """Retries the rows of a dead-letter table and appends the successful results to the output table.
+    
+    The dead-letter table is renamed to a retry table before processing, so rows that fail
+    again are written to a fresh dead-letter table with their new error. If the retry is
+    cancelled or fails, the rows it did not get to are moved back to the dead-letter table,
+    and a retry table left behind by an interrupted run is restored the same way first.
+    
+    Args:
+        session: Snowflake session.
+        db (str): Database name.
+        schema (str): Schema name.
+        input_column (str): Column containing input text.
+        expression (str): Per-row SQL expression of the operation (see get_*_expression).
+        output_table (str): Table the successful results are appended to.
+        output_column (str): Column to write results to.
+        dead_letter_table (str): Dead-letter table holding the failed rows.
+        max_concurrency (int): Maximum number of batch queries running at once.
+        on_progress (callable, optional): Progress callback, see get_partitioned_result_from_column.
+        on_query (callable, optional): Query ID callback, see get_partitioned_result_from_column.
+        should_cancel (callable, optional): Cancellation check, see get_partitioned_result_from_column.
+        
+    Returns:
+        dict: Result of the retry run, see get_partitioned_result_from_column.
+    """
+    retry_table = f"{dead_letter_table}_RETRY"
+    dead_letter_table_full = f"{db}.{schema}.{dead_letter_table}"
+    retry_table_full = f"{db}.{schema}.{retry_table}"
+    output_table_full = f"{db}.{schema}.{output_table}"
+    tables = {row["name"] for row in session.sql(f"SHOW TABLES IN SCHEMA {db}.{schema}").collect()}
+
+    def create_dead_letter_table():
+        session.sql(f"""
+            CREATE TABLE IF NOT EXISTS {dead_letter_table_full} (
+                {input_column} VARCHAR(16777216),
+                error_message VARCHAR(16777216),
+                failed_at TIMESTAMP
+            )
+        """).collect()
+
+    def restore_unprocessed_rows():
+        # Rows of the retry table that neither reached the output nor failed again
+        create_dead_letter_table()
+        session.sql(f"""
+            INSERT INTO {dead_letter_table_full} ({input_column}, error_message, failed_at)
+            SELECT r.{input_column}, r.error_message, r.failed_at
+            FROM {retry_table_full} AS r
+            WHERE NOT EXISTS (
+                SELECT 1 FROM {output_table_full} AS o WHERE EQUAL_NULL(o.{input_column}, r.{input_column})
+            ) AND NOT EXISTS (
+                SELECT 1 FROM {dead_letter_table_full} AS d WHERE EQUAL_NULL(d.{input_column}, r.{input_column})
+            )
+        """).collect()
+        session.sql(f"DROP TABLE IF EXISTS {retry_table_full}").collect()
+
+    create_dead_letter_table()
+    if retry_table.upper() in tables:
+        restore_unprocessed_rows()
+    session.sql(f"ALTER TABLE {dead_letter_table_full} RENAME TO {retry_table_full}").collect()
+    try:
+        result = get_partitioned_result_from_column(
+            session, db, schema, retry_table, input_column, expression, output_table, output_column,
+            1, max_concurrency, on_progress=on_progress, dead_letter_table=dead_letter_table, replace_output=False,
+            on_query=on_query, should_cancel=should_cancel
+        )
+    except Exception:
+        restore_unprocessed_rows()
+        raise
+    if result["cancelled"] or result["failures"]:
+        restore_unprocessed_rows()
+    else:
+        session.sql(f"DROP TABLE IF EXISTS {retry_table_full}").collect()
+    return result
+
+
+def get_complete_result_from_column(session, model, db, schema, table, input_column, temperature, max_tokens, guardrails, output_table, output_column, system_prompt=None, user_prompt=None, block=True):
     """Fetches content from a column and writes the completion result to an output table.
     
     Args:
@@ -348,6 +773,11 @@ def get_complete_result_from_column(session, model, db, schema, table, input_col
         output_column (str): Column to write results to.
         system_prompt (str, optional): System prompt to prepend.
         user_prompt (str, optional): User prompt template.
+        block (bool, optional): Whether to wait for the INSERT. If False, the INSERT is
+            submitted asynchronously and its AsyncJob is returned. Defaults to True.
+        
+    Returns:
+        AsyncJob: The submitted INSERT when block is False, otherwise None.
         
     Raises:
         SnowparkSQLException: If the query fails.
@@ -365,42 +795,26 @@ def get_complete_result_from_column(session, model, db, schema, table, input_col
     source_table_full = f"{db}.{schema}.{table}"
     output_table_full = f"{db}.{schema}.{output_table}"
 
-    # Escape system prompt
-    system_prompt_escaped = escape_sql_string(system_prompt) if system_prompt else ""
-    user_prompt_escaped = escape_sql_string(user_prompt) if user_prompt else ""
-
-    # Prepare user prompt by escaping special characters
-    user_prompt_sql = f"'{user_prompt_escaped} <{table}>' || {input_column} || '</{table}>'"
+    expression = get_complete_expression(
+        model, table, input_column, temperature, max_tokens, guardrails,
+        system_prompt=system_prompt, user_prompt=user_prompt
+    )
 
-    # Construct the SQL query without using PARSE_JSON incorrectly
     query = f"""
     INSERT INTO {output_table_full} ({input_column}, {output_column})
-    SELECT {input_column},
-        GET_PATH(
-            SNOWFLAKE.CORTEX.COMPLETE(
-                '{model}',
-                ARRAY_CONSTRUCT(
-                    OBJECT_CONSTRUCT('role', 'system', 'content', '{system_prompt_escaped}'),
-                    OBJECT_CONSTRUCT('role', 'user', 'content', {user_prompt_sql})
-                ),
-                OBJECT_CONSTRUCT(
-                    'temperature', {temperature},
-                    'max_tokens', {max_tokens},
-                    'guardrails', {str(guardrails).lower()}
-                )
-            ),
-            'choices[0].messages'
-        ) AS message_content
+    SELECT {input_column}, {expression} AS message_content
     FROM {source_table_full};
     """
 
     try:
+        if not block:
+            return session.sql(query).collect_nowait()
         session.sql(query).collect()
     except SnowparkSQLException as e:
         raise e
 
 
-def get_translation_from_column(session, db, schema, table, input_column, source_lang, target_lang, output_table, output_column):
+def get_translation_from_column(session, db, schema, table, input_column, source_lang, target_lang, output_table, output_column, block=True):
     """Fetches content from a column and writes the translation result to an output table.
     
     Args:
@@ -413,6 +827,11 @@ def get_translation_from_column(session, db, schema, table, input_column, source
         target_lang (str): Target language code.
         output_table (str): Table to write results to.
         output_column (str): Column to write results to.
+        block (bool, optional): Whether to wait for the INSERT. If False, the INSERT is
+            submitted asynchronously and its AsyncJob is returned. Defaults to True.
+        
+    Returns:
+        AsyncJob: The submitted INSERT when block is False, otherwise None.
         
     Raises:
         SnowparkSQLException: If the query fails.
@@ -429,16 +848,18 @@ def get_translation_from_column(session, db, schema, table, input_column, source
 
     query = f"""
     INSERT INTO {output_table_full} ({input_column}, {output_column})
-    SELECT {input_column}, CAST(SNOWFLAKE.CORTEX.TRANSLATE({input_column}, '{source_lang}', '{target_lang}') AS STRING)
+    SELECT {input_column}, {get_translation_expression(input_column, source_lang, target_lang)}
     FROM {source_table_full};
     """
     try:
+        if not block:
+            return session.sql(query).collect_nowait()
         session.sql(query).collect()
     except SnowparkSQLException as e:
         raise e
 
 
-def get_summary_from_column(session, db, schema, table, input_column, output_table, output_column):
+def get_summary_from_column(session, db, schema, table, input_column, output_table, output_column, block=True):
     """Fetches content from a column and writes the summary result to an output table.
     
     Args:
@@ -449,6 +870,11 @@ def get_summary_from_column(session, db, schema, table, input_column, output_tab
         input_column (str): Column containing text to summarize.
         output_table (str): Table to write results to.
         output_column (str): Column to write results to.
+        block (bool, optional): Whether to wait for the INSERT. If False, the INSERT is
+            submitted asynchronously and its AsyncJob is returned. Defaults to True.
+        
+    Returns:
+        AsyncJob: The submitted INSERT when block is False, otherwise None.
         
     Raises:
         SnowparkSQLException: If the query fails.
@@ -465,15 +891,17 @@ def get_summary_from_column(session, db, schema, table, input_column, output_tab
 
     query = f"""
     INSERT INTO {output_table_full} ({input_column}, {output_column})
-    SELECT {input_column}, CAST(SNOWFLAKE.CORTEX.SUMMARIZE({input_column}) AS STRING)
+    SELECT {input_column}, {get_summary_expression(input_column)}
     FROM {source_table_full};
     """
     try:
+        if not block:
+            return session.sql(query).collect_nowait()
         session.sql(query).collect()
     except SnowparkSQLException as e:
         raise e
 
-def get_extraction_from_column(session, db, schema, table, input_column, query_text, output_table, output_column):
+def get_extraction_from_column(session, db, schema, table, input_column, query_text, output_table, output_column, block=True):
     """Fetches content from a column and writes the extracted answer to an output table.
     
     Args:
@@ -485,6 +913,11 @@ def get_extraction_from_column(session, db, schema, table, input_column, query_t
         query_text (str): Query text to guide extraction.
         output_table (str): Table to write results to.
         output_column (str): Column to write results to.
+        block (bool, optional): Whether to wait for the INSERT. If False, the INSERT is
+            submitted asynchronously and its AsyncJob is returned. Defaults to True.
+        
+    Returns:
+        AsyncJob: The submitted INSERT when block is False, otherwise None.
         
     Raises:
         SnowparkSQLException: If the query fails.
@@ -499,20 +932,20 @@ def get_extraction_from_column(session, db, schema, table, input_column, query_t
     source_table_full = f"{db}.{schema}.{table}"
     output_table_full = f"{db}.{schema}.{output_table}"
 
-    query_text_escaped = escape_sql_string(query_text)
-
     query = f"""
     INSERT INTO {output_table_full} ({input_column}, {output_column})
-    SELECT {input_column}, CAST(SNOWFLAKE.CORTEX.EXTRACT_ANSWER({input_column}, '{query_text_escaped}') AS STRING)
+    SELECT {input_column}, {get_extraction_expression(input_column, query_text)}
     FROM {source_table_full};
     """
     try:
+        if not block:
+            return session.sql(query).collect_nowait()
         session.sql(query).collect()
     except SnowparkSQLException as e:
         raise e
 
 
-def get_sentiment_from_column(session, db, schema, table, input_column, output_table, output_column):
+def get_sentiment_from_column(session, db, schema, table, input_column, output_table, output_column, block=True):
     """Fetches content from a column and writes the sentiment analysis result to an output table.
     
     Args:
@@ -523,6 +956,11 @@ def get_sentiment_from_column(session, db, schema, table, input_column, output_t
         input_column (str): Column containing text to analyze.
         output_table (str): Table to write results to.
         output_column (str): Column to write results to.
+        block (bool, optional): Whether to wait for the INSERT. If False, the INSERT is
+            submitted asynchronously and its AsyncJob is returned. Defaults to True.
+        
+    Returns:
+        AsyncJob: The submitted INSERT when block is False, otherwise None.
         
     Raises:
         SnowparkSQLException: If the query fails.
@@ -539,17 +977,362 @@ def get_sentiment_from_column(session, db, schema, table, input_column, output_t
 
     query = f"""
     INSERT INTO {output_table_full} ({input_column}, {output_column})
-    SELECT {input_column}, CAST(SNOWFLAKE.CORTEX.SENTIMENT({input_column}) AS STRING)
+    SELECT {input_column}, {get_sentiment_expression(input_column)}
     FROM {source_table_full};
     """
     try:
+        if not block:
+            return session.sql(query).collect_nowait()
         session.sql(query).collect()
     except SnowparkSQLException as e:
         raise e
 
     
-def create_vector_embedding_from_stage(session, db, schema, stage, embedding_type, embedding_model,output_table):
-    """Creates vector embeddings for all files in a selected stage.
+CDC_PIPELINE_COMMENT = "Snowflake AI Toolkit CDC pipeline"
+
+
+def create_cdc_pipeline(session, db, schema, table, input_column, expression, output_table, output_column, pipeline_name, warehouse, schedule, process_existing_rows=True):
+    """Deploys a per-row expression as a continuous STREAM + TASK pipeline on the source table.
+    
+    An append-only stream tracks new rows of the source table and a scheduled task runs
+    the same INSERT ... SELECT as the column based Build operations, but only over the
+    stream delta. The task only starts a warehouse when the stream has data.
+    
+    Args:
+        session: Snowflake session.
+        db (str): Database name.
+        schema (str): Schema name.
+        table (str): Input table name.
+        input_column (str): Column containing input text.
+        expression (str): Per-row SQL expression of the operation (see get_*_expression).
+        output_table (str): Table to write results to. Created if it does not exist.
+        output_column (str): Column to write results to.
+        pipeline_name (str): Name of the pipeline, used for the stream and task names.
+        warehouse (str): Warehouse the task runs on.
+        schedule (str): Task schedule (e.g., '5 MINUTE' or 'USING CRON 0 * * * * UTC').
+        process_existing_rows (bool, optional): Whether the first run also processes the rows
+            already in the source table. Defaults to True.
+        
+    Raises:
+        SnowparkSQLException: If the query fails.
+    """
+    source_table_full = f"{db}.{schema}.{table}"
+    output_table_full = f"{db}.{schema}.{output_table}"
+    stream_full = f"{db}.{schema}.{pipeline_name}_STREAM"
+    task_full = f"{db}.{schema}.{pipeline_name}_TASK"
+
+    queries = [
+        f"""
+        CREATE TABLE IF NOT EXISTS {output_table_full} (
+            {input_column} VARCHAR(16777216),
+            {output_column} VARCHAR(16777216)
+        )
+        """,
+        f"""
+        CREATE OR REPLACE STREAM {stream_full} ON TABLE {source_table_full}
+        APPEND_ONLY = TRUE
+        SHOW_INITIAL_ROWS = {str(process_existing_rows).upper()}
+        """,
+        f"""
+        CREATE OR REPLACE TASK {task_full}
+        WAREHOUSE = {warehouse}
+        SCHEDULE = '{escape_sql_string(schedule)}'
+        COMMENT = '{CDC_PIPELINE_COMMENT}'
+        WHEN SYSTEM$STREAM_HAS_DATA('{stream_full}')
+        AS
+        INSERT INTO {output_table_full} ({input_column}, {output_column})
+        SELECT {input_column}, {expression}
+        FROM {stream_full}
+        WHERE METADATA$ACTION = 'INSERT'
+        """,
+        f"ALTER TASK {task_full} RESUME"
+    ]
+    try:
+        for query in queries:
+            session.sql(query).collect()
+    except SnowparkSQLException as e:
+        raise e
+
+
+def list_cdc_pipelines(session, db, schema):
+    """Lists the CDC pipelines deployed by the toolkit in a schema.
+    
+    Args:
+        session: Snowflake session.
+        db (str): Database name.
+        schema (str): Schema name.
+        
+    Returns:
+        list: Dictionaries with the pipeline name, state, schedule and task definition.
+    """
+    tasks = session.sql(f"SHOW TASKS IN SCHEMA {db}.{schema}").collect()
+    return [
+        {
+            "Pipeline": task["name"][:-len("_TASK")],
+            "State": task["state"],
+            "Schedule": task["schedule"],
+            "Warehouse": task["warehouse"],
+            "Definition": task["definition"]
+        }
+        for task in tasks
+        if task["comment"] == CDC_PIPELINE_COMMENT and task["name"].upper().endswith("_TASK")
+    ]
+
+
+def set_cdc_pipeline_state(session, db, schema, pipeline_name, action):
+    """Suspends, resumes or drops a CDC pipeline.
+    
+    Args:
+        session: Snowflake session.
+        db (str): Database name.
+        schema (str): Schema name.
+        pipeline_name (str): Name of the pipeline.
+        action (str): One of 'SUSPEND', 'RESUME' or 'DROP'.
+        
+    Raises:
+        ValueError: If the action is not supported.
+        SnowparkSQLException: If the query fails.
+    """
+    task_full = f"{db}.{schema}.{pipeline_name}_TASK"
+    stream_full = f"{db}.{schema}.{pipeline_name}_STREAM"
+    if action in ("SUSPEND", "RESUME"):
+        queries = [f"ALTER TASK {task_full} {action}"]
+    elif action == "DROP":
+        queries = [f"DROP TASK IF EXISTS {task_full}", f"DROP STREAM IF EXISTS {stream_full}"]
+    else:
+        raise ValueError(f"Unsupported pipeline action: {action}")
+    try:
+        for query in queries:
+            session.sql(query).collect()
+    except SnowparkSQLException as e:
+        raise e
+
+
+def fetch_cdc_pipeline_history(session, db, schema, pipeline_name, limit=20):
+    """Fetches the recent runs of a CDC pipeline task.
+    
+    Args:
+        session: Snowflake session.
+        db (str): Database name.
+        schema (str): Schema name.
+        pipeline_name (str): Name of the pipeline.
+        limit (int, optional): Maximum number of runs to return. Defaults to 20.
+        
+    Returns:
+        pandas.DataFrame: Task runs with their state, timings and error message.
+    """
+    query = f"""
+    SELECT name, state, scheduled_time, completed_time, error_message
+    FROM TABLE({db}.INFORMATION_SCHEMA.TASK_HISTORY(
+        TASK_NAME => '{pipeline_name.upper()}_TASK',
+        RESULT_LIMIT => {int(limit)}
+    ))
+    WHERE database_name = '{db.upper()}' AND schema_name = '{schema.upper()}'
+    ORDER BY scheduled_time DESC
+    """
+    return session.sql(query).to_pandas()
+
+
+def setup_embedding_cache(session, db, schema, embedding_type):
+    """Creates the embedding cache table of an embedding type if it does not exist.
+
+    There is one cache table per vector size, EMBEDDING_CACHE_768 and EMBEDDING_CACHE_1024,
+    keyed by the embedding model and the SHA-256 of the chunk text. The cache outlives
+    rebuilds of the embedding tables, which is what makes rebuilds cheap.
+
+    Args:
+        session: Snowflake session.
+        db (str): Database name.
+        schema (str): Schema name.
+        embedding_type (str): EMBED_TEXT_768 or EMBED_TEXT_1024.
+
+    Returns:
+        tuple: (vector column type, fully qualified cache table name).
+    """
+    dimensions = 768 if embedding_type == "EMBED_TEXT_768" else 1024
+    vector_type = f"VECTOR(FLOAT, {dimensions})"
+    check_and_create_table(session, db, schema, f"EMBEDDING_CACHE_{dimensions}", [
+        "embedding_model VARCHAR", "chunk_hash VARCHAR(64)", f"vector_embeddings {vector_type}",
+        "created_at TIMESTAMP_LTZ"
+    ], replace=False)
+    return vector_type, f"{db}.{schema}.EMBEDDING_CACHE_{dimensions}"
+
+
+def get_embedding_cache_merge(cache_table_full, embedding_type, embedding_model, source):
+    """Builds the MERGE that embeds the chunks of a table or query missing from the cache.
+
+    Every distinct chunk is embedded at most once, and only if the cache has no vector for
+    it and the model yet.
+
+    Args:
+        cache_table_full (str): Fully qualified cache table name.
+        embedding_type (str): EMBED_TEXT_768 or EMBED_TEXT_1024.
+        embedding_model (str): Model to embed with.
+        source (str): Table name or parenthesized query with chunk and chunk_hash columns.
+
+    Returns:
+        str: The MERGE statement, without a trailing semicolon.
+    """
+    return f"""MERGE INTO {cache_table_full} AS c
+                USING (
+                    SELECT chunk_hash, SNOWFLAKE.CORTEX.{embedding_type}('{embedding_model}', chunk) AS vector_embeddings
+                    FROM (
+                        SELECT chunk_hash, ANY_VALUE(chunk) AS chunk FROM {source}
+                        WHERE chunk IS NOT NULL AND chunk_hash NOT IN (
+                            SELECT chunk_hash FROM {cache_table_full} WHERE embedding_model = '{embedding_model}'
+                        )
+                        GROUP BY chunk_hash
+                    )
+                ) AS n
+                ON c.embedding_model = '{embedding_model}' AND c.chunk_hash = n.chunk_hash
+                WHEN NOT MATCHED THEN INSERT (embedding_model, chunk_hash, vector_embeddings, created_at)
+                    VALUES ('{embedding_model}', n.chunk_hash, n.vector_embeddings, CURRENT_TIMESTAMP)"""
+
+
+def get_table_embedding(session, db, schema, table):
+    """Reads the embedding type and model recorded in the comment of an embedding table.
+
+    Args:
+        session: Snowflake session.
+        db (str): Database name.
+        schema (str): Schema name.
+        table (str): Table name.
+
+    Returns:
+        dict: embedding_type and embedding_model, or None if the table does not exist or has
+        no recorded embedding.
+    """
+    rows = session.sql(f"SHOW TABLES LIKE '{escape_sql_string(table)}' IN SCHEMA {db}.{schema}").collect()
+    try:
+        recorded = json.loads(rows[0]["comment"])
+        return {"embedding_type": recorded["embedding_type"], "embedding_model": recorded["embedding_model"]}
+    except (IndexError, TypeError, ValueError, KeyError):
+        return None
+
+
+def set_table_embedding(session, table_full, embedding_type, embedding_model):
+    """Records the embedding type and model of an embedding table in its comment.
+
+    Args:
+        session: Snowflake session.
+        table_full (str): Fully qualified table name.
+        embedding_type (str): EMBED_TEXT_768 or EMBED_TEXT_1024.
+        embedding_model (str): Model the embeddings were created with.
+    """
+    comment = json.dumps({"embedding_type": embedding_type, "embedding_model": embedding_model})
+    session.sql(f"COMMENT ON TABLE {table_full} IS '{escape_sql_string(comment)}'").collect()
+
+
+def get_vector_column_type(session, table_full):
+    """Reads the type of the vector_embeddings column of an embedding table.
+
+    Args:
+        session: Snowflake session.
+        table_full (str): Fully qualified table name.
+
+    Returns:
+        str: Column type without spaces, e.g. VECTOR(FLOAT,1024), or None if the table or the
+        column does not exist.
+    """
+    try:
+        columns = session.sql(f"DESCRIBE TABLE {table_full}").collect()
+    except SnowparkSQLException:
+        return None
+    for column in columns:
+        if column["name"].upper() == "VECTOR_EMBEDDINGS":
+            return column["type"].replace(" ", "").upper()
+    return None
+
+
+def check_not_reembedding(session, db, schema, table):
+    """Refuses to write to an embedding table while reembed_table migrates it.
+
+    Chunks written to the table during a migration would be embedded with the old model,
+    or dropped with the old table at the swap while the manifest lists their files as
+    ingested. The migration is in progress as long as its shadow table {table}_REEMBED exists.
+
+    Args:
+        session: Snowflake session.
+        db (str): Database name.
+        schema (str): Schema name.
+        table (str): Embedding table name.
+
+    Raises:
+        ValueError: If the shadow table of the embedding table exists.
+    """
+    shadow_table = f"{table}_REEMBED"
+    if session.sql(f"SHOW TABLES LIKE '{escape_sql_string(shadow_table)}' IN SCHEMA {db}.{schema}").collect():
+        raise ValueError(
+            f"{table} is being re-embedded. Finish the re-embedding, or drop {shadow_table} to abandon it, "
+            "before ingesting into it."
+        )
+
+
+# File types PARSE_DOCUMENT reads; the layout strategy skips the other files of a stage
+PARSE_DOCUMENT_EXTENSIONS = ("pdf", "pptx", "docx", "jpeg", "jpg", "png", "tiff", "tif", "html", "txt")
+
+
+def get_chunk_source(stage_path, chunking):
+    """Builds the FROM items producing the chunks of the stage files for a chunking strategy.
+
+    The character, token and sentence strategies run the document_text_chunker UDTF
+    partitioned by relative_path, so every file is chunked by its own handler instance and files spread
+    across the warehouse nodes. After the chunks of a file, the UDTF emits one row without
+    a chunk that holds the file's page, chunk and timing statistics. The layout strategy
+    parses the files with PARSE_DOCUMENT in LAYOUT mode and splits the resulting markdown
+    with SPLIT_TEXT_RECURSIVE_CHARACTER, which gives no page numbers or statistics. It only
+    reads the file types in PARSE_DOCUMENT_EXTENSIONS, so callers have to leave other files out.
+
+    Args:
+        stage_path (str): Fully qualified stage path, starting with @.
+        chunking (dict): Chunking strategy with its chunk_size and chunk_overlap.
+
+    Returns:
+        tuple: (FROM items joined to directory() AS dir, dict of the expressions for chunk,
+        page_start, page_end, pages, skipped_pages, chunks and elapsed_ms).
+    """
+    chunk_size = int(chunking["chunk_size"])
+    chunk_overlap = int(chunking["chunk_overlap"])
+    if chunking["strategy"] == "layout":
+        source = f"""
+                LATERAL FLATTEN(SNOWFLAKE.CORTEX.SPLIT_TEXT_RECURSIVE_CHARACTER(
+                    SNOWFLAKE.CORTEX.PARSE_DOCUMENT('{stage_path}', relative_path, {{'mode': 'LAYOUT'}}):content::STRING,
+                    'markdown', {chunk_size}, {chunk_overlap}
+                )) AS func"""
+        expressions = dict.fromkeys(["page_start", "page_end", "pages", "skipped_pages", "chunks", "elapsed_ms"], "NULL")
+        expressions["chunk"] = "func.value::STRING"
+        return source, expressions
+    source = f"""
+                TABLE(document_text_chunker(
+                    build_scoped_file_url('{stage_path}', relative_path), relative_path, '{chunking["strategy"]}', {chunk_size}, {chunk_overlap}
+                ) OVER (PARTITION BY relative_path)) AS func"""
+    columns = ["chunk", "page_start", "page_end", "pages", "skipped_pages", "chunks", "elapsed_ms"]
+    return source, {column: f"func.{column}" for column in columns}
+
+def create_vector_embedding_from_stage(session, db, schema, stage, embedding_type, embedding_model,output_table, files_per_batch=None, on_progress=None, on_query=None, should_cancel=None, incremental=True, chunking=None, bytes_per_batch=None):
+    """Creates vector embeddings for the files in a selected stage.
+    
+    The files ingested so far are recorded with their md5 and last modified time in the
+    manifest table {output_table}_MANIFEST. In incremental mode only files that are new or
+    changed since then are chunked and embedded, and the chunks of files removed from the
+    stage are deleted. Each batch replaces the chunks of its files and updates the manifest
+    in one transaction, so an interrupted run is resumed by the next one.
+    
+    Files are processed in batches of at most files_per_batch files and bytes_per_batch
+    bytes, which checkpoints the output after every batch and lets on_progress report how
+    many files are done. Within a batch every file is chunked in parallel, and the time it
+    took is recorded in {output_table}_FILE_STATS to find slow documents.
+    
+    Every chunk records the chunking strategy and parameters it was built with. Files
+    ingested with a different chunking than the requested one count as changed.
+    
+    Embeddings are cached in EMBEDDING_CACHE_768 or EMBEDDING_CACHE_1024 of the schema, keyed
+    by the embedding model and the SHA-256 of the chunk text. Each batch chunks its files into
+    a temporary table first, embeds only the distinct chunks missing from the cache, and takes
+    all vectors from the cache, so boilerplate repeated across files and re-ingested files
+    are embedded once. The embedding type and model are recorded in the table comment once
+    a run has completed. A table without a recorded embedding, such as one created by an
+    earlier version, is checked by the type of its vector column instead.
     
     Args:
         session: Snowflake session.
@@ -559,47 +1342,403 @@ def create_vector_embedding_from_stage(session, db, schema, stage, embedding_typ
         embedding_type (str): Type of embedding to create.
         embedding_model (str): Model to use for embeddings.
         output_table (str): Table to write embeddings to.
+        files_per_batch (int, optional): Number of files per query. Defaults to all files at once.
+        bytes_per_batch (int, optional): Total file size per query; a larger file gets a batch
+            of its own. Defaults to no limit.
+        on_progress (callable, optional): Called as on_progress(files_processed, files_total,
+            batches_left) after every batch.
+        on_query (callable, optional): Called with the query ID of every submitted batch.
+        should_cancel (callable, optional): Checked before every batch; when it returns True,
+            the remaining batches are skipped.
+        incremental (bool, optional): Whether to keep the existing embeddings and only process
+            changed files. If False, the output and manifest tables are rebuilt. Defaults to True.
+        chunking (dict, optional): Chunking strategy ("character", "token", "sentence" or
+            "layout") with its chunk_size and chunk_overlap. Defaults to 4000 characters with
+            an overlap of 400.
+        
+    Returns:
+        dict: Number of files added, changed and removed, of chunks embedded and taken from
+        the cache, whether the run was cancelled, and the files the layout strategy cannot
+        read and skipped.
         
     Raises:
+        ValueError: If the existing output table holds embeddings of another model, or is
+            being re-embedded (see check_not_reembedding).
         SnowparkSQLException: If the query fails.
     """
+    check_not_reembedding(session, db, schema, output_table)
     stage_path = f"@{db}.{schema}.{stage}"
     output_table_full = f"{db}.{schema}.{output_table}"
+    manifest_table_full = f"{db}.{schema}.{output_table}_MANIFEST"
+    chunking = chunking or {"strategy": "character", "chunk_size": 4000, "chunk_overlap": 400}
+    chunk_params = json.dumps({"chunk_size": int(chunking["chunk_size"]), "chunk_overlap": int(chunking["chunk_overlap"])})
+    chunk_config = escape_sql_string(json.dumps({"strategy": chunking["strategy"], **json.loads(chunk_params)}))
+    stats_table_full = f"{db}.{schema}.{output_table}_FILE_STATS"
+    chunk_source, expressions = get_chunk_source(stage_path, chunking)
 
     # Define the columns required in the output table
     columns = [
         "relative_path VARCHAR(16777216)","size NUMBER(38,0)","file_url VARCHAR(16777216)",
         "scoped_file_url VARCHAR(16777216)", "chunk VARCHAR(16777216)"
     ]
-    if embedding_model == "EMBED_TEXT_768":
-        columns.append("vector_embeddings VECTOR(FLOAT, 768)")
-    else:
-        columns.append("vector_embeddings VECTOR(FLOAT, 1024)")
-    # Ensure the output table exists with the required columns
-    check_and_create_table(session, db, schema, output_table, columns)
+    vector_type, cache_table_full = setup_embedding_cache(session, db, schema, embedding_type)
+    columns.append(f"vector_embeddings {vector_type}")
+    columns += ["page_start NUMBER(38,0)", "page_end NUMBER(38,0)", "chunk_strategy VARCHAR", "chunk_params VARIANT"]
+    # Adding chunks of another model would make the table unsearchable; that takes reembed_table
+    recorded = get_table_embedding(session, db, schema, output_table) if incremental else None
+    if recorded and (recorded["embedding_type"], recorded["embedding_model"]) != (embedding_type, embedding_model):
+        raise ValueError(
+            f"{output_table} holds {recorded['embedding_model']} embeddings. Rebuild it or re-embed it "
+            f"with {embedding_model} first."
+        )
+    if incremental and not recorded:
+        existing_type = get_vector_column_type(session, output_table_full)
+        if existing_type and existing_type != vector_type.replace(" ", "").upper():
+            raise ValueError(
+                f"{output_table} holds {existing_type} embeddings, which {embedding_type} cannot add to. "
+                "Rebuild it or choose the matching embedding type."
+            )
+    # Ensure the output and manifest tables exist with the required columns
+    check_and_create_table(session, db, schema, output_table, columns, replace=not incremental)
+    # Tables created by earlier versions lack the page and chunking columns
+    session.sql(f"""
+        ALTER TABLE {output_table_full} ADD COLUMN IF NOT EXISTS
+            page_start NUMBER(38,0), page_end NUMBER(38,0), chunk_strategy VARCHAR, chunk_params VARIANT
+    """).collect()
+    check_and_create_table(session, db, schema, f"{output_table}_MANIFEST", [
+        "relative_path VARCHAR(16777216)", "md5 VARCHAR", "last_modified TIMESTAMP_LTZ",
+        "size NUMBER(38,0)", "ingested_at TIMESTAMP_LTZ", "chunk_config VARCHAR"
+    ], replace=not incremental)
+    session.sql(f"ALTER TABLE {manifest_table_full} ADD COLUMN IF NOT EXISTS chunk_config VARCHAR").collect()
+    check_and_create_table(session, db, schema, f"{output_table}_FILE_STATS", [
+        "relative_path VARCHAR(16777216)", "size NUMBER(38,0)", "pages NUMBER(38,0)", "skipped_pages NUMBER(38,0)",
+        "chunks NUMBER(38,0)", "elapsed_ms NUMBER(38,0)", "chunk_strategy VARCHAR", "ingested_at TIMESTAMP_LTZ"
+    ], replace=not incremental)
+
+    try:
+        # Files removed from the stage since the last run
+        removed = f"""
+            SELECT relative_path FROM {manifest_table_full}
+            WHERE relative_path NOT IN (SELECT relative_path FROM directory('{stage_path}'))
+        """
+        removed_count = session.sql(f"SELECT COUNT(*) AS count FROM ({removed})").collect()[0]["COUNT"]
+        if removed_count:
+            session.sql(f"DELETE FROM {output_table_full} WHERE relative_path IN ({removed})").collect()
+            session.sql(f"DELETE FROM {stats_table_full} WHERE relative_path IN ({removed})").collect()
+            session.sql(f"DELETE FROM {manifest_table_full} WHERE relative_path IN ({removed})").collect()
+
+        # Files added or changed since the last run; md5 decides, last_modified covers stages
+        # without it, and a different chunking means the file has to be chunked again
+        diff_query = f"""
+            SELECT d.relative_path, d.size, m.relative_path IS NULL AS is_new
+            FROM directory('{stage_path}') AS d
+            LEFT JOIN {manifest_table_full} AS m ON m.relative_path = d.relative_path
+            WHERE m.relative_path IS NULL
+                OR NOT EQUAL_NULL(m.md5, d.md5)
+                OR (d.md5 IS NULL AND NOT EQUAL_NULL(m.last_modified, d.last_modified))
+                OR NOT EQUAL_NULL(m.chunk_config, '{chunk_config}')
+        """
+        diff = session.sql(diff_query).collect()
+        skipped_files = []
+        if chunking["strategy"] == "layout":
+            skipped_files = [
+                row["RELATIVE_PATH"] for row in diff
+                if row["RELATIVE_PATH"].rsplit(".", 1)[-1].lower() not in PARSE_DOCUMENT_EXTENSIONS
+            ]
+            diff = [row for row in diff if row["RELATIVE_PATH"] not in skipped_files]
+        files = len(diff)
+        added_count = sum(1 for row in diff if row["IS_NEW"])
+
+        # Largest files first, so the slowest documents start early and batches are even
+        batches = []
+        for row in sorted(diff, key=lambda row: row["SIZE"] or 0, reverse=True):
+            last = batches[-1] if batches else None
+            if (
+                last is None
+                or (files_per_batch and len(last["paths"]) >= files_per_batch)
+                or (bytes_per_batch and last["bytes"] + (row["SIZE"] or 0) > bytes_per_batch)
+            ):
+                last = {"paths": [], "bytes": 0}
+                batches.append(last)
+            last["paths"].append(row["RELATIVE_PATH"])
+            last["bytes"] += row["SIZE"] or 0
+
+        files_processed = 0
+        chunks_embedded = 0
+        chunks_total = 0
+        for index, batch_files in enumerate(batches):
+            if should_cancel and should_cancel():
+                break
+            # A re-embedding started during the run takes over the table
+            check_not_reembedding(session, db, schema, output_table)
+            batch = ", ".join(f"'{escape_sql_string(path)}'" for path in batch_files["paths"])
+            chunks_table = f"{db}.{schema}.{output_table}_CHUNKS_{uuid.uuid4().hex[:8].upper()}"
+
+            # Chunk the files of the batch, embed the chunks missing from the cache, then replace
+            # the chunks and statistics of the files and record them in the manifest. The DDL
+            # runs outside the transaction, as it would commit it.
+            query = f"""
+            EXECUTE IMMEDIATE $$
+            DECLARE
+                embedded INTEGER DEFAULT 0;
+                chunk_count INTEGER DEFAULT 0;
+            BEGIN
+                CREATE TEMPORARY TABLE {chunks_table} AS
+                SELECT 
+                    relative_path, 
+                    size,
+                    file_url,
+                    build_scoped_file_url('{stage_path}', relative_path) AS scoped_file_url,
+                    {expressions["chunk"]} AS chunk,
+                    SHA2({expressions["chunk"]}, 256) AS chunk_hash,
+                    {expressions["page_start"]} AS page_start,
+                    {expressions["page_end"]} AS page_end,
+                    {expressions["pages"]} AS pages,
+                    {expressions["skipped_pages"]} AS skipped_pages,
+                    {expressions["chunks"]} AS chunks,
+                    {expressions["elapsed_ms"]} AS elapsed_ms
+                FROM 
+                    directory('{stage_path}') AS dir,{chunk_source}
+                WHERE relative_path IN ({batch});
+                SELECT COUNT(chunk) INTO :chunk_count FROM {chunks_table};
+                {get_embedding_cache_merge(cache_table_full, embedding_type, embedding_model, chunks_table)};
+                embedded := SQLROWCOUNT;
+                BEGIN TRANSACTION;
+                DELETE FROM {output_table_full} WHERE relative_path IN ({batch});
+                DELETE FROM {stats_table_full} WHERE relative_path IN ({batch});
+                INSERT ALL
+                    WHEN chunk IS NOT NULL THEN INTO {output_table_full} (
+                        relative_path, size, file_url, scoped_file_url, chunk, vector_embeddings,
+                        page_start, page_end, chunk_strategy, chunk_params
+                    ) VALUES (
+                        relative_path, size, file_url, scoped_file_url, chunk, vector_embeddings,
+                        page_start, page_end, chunk_strategy, chunk_params
+                    )
+                    WHEN chunk IS NULL THEN INTO {stats_table_full} (
+                        relative_path, size, pages, skipped_pages, chunks, elapsed_ms, chunk_strategy, ingested_at
+                    ) VALUES (
+                        relative_path, size, pages, skipped_pages, chunks, elapsed_ms, chunk_strategy, ingested_at
+                    )
+                SELECT 
+                    b.relative_path, 
+                    b.size,
+                    b.file_url,
+                    b.scoped_file_url,
+                    b.chunk,
+                    c.vector_embeddings,
+                    b.page_start,
+                    b.page_end,
+                    '{chunking["strategy"]}' AS chunk_strategy,
+                    PARSE_JSON('{chunk_params}') AS chunk_params,
+                    b.pages,
+                    b.skipped_pages,
+                    b.chunks,
+                    b.elapsed_ms,
+                    CURRENT_TIMESTAMP AS ingested_at
+                FROM {chunks_table} AS b
+                LEFT JOIN {cache_table_full} AS c
+                    ON c.embedding_model = '{embedding_model}' AND c.chunk_hash = b.chunk_hash;
+                MERGE INTO {manifest_table_full} AS m
+                USING (
+                    SELECT relative_path, md5, last_modified, size FROM directory('{stage_path}')
+                    WHERE relative_path IN ({batch})
+                ) AS d
+                ON m.relative_path = d.relative_path
+                WHEN MATCHED THEN UPDATE SET
+                    md5 = d.md5, last_modified = d.last_modified, size = d.size, ingested_at = CURRENT_TIMESTAMP,
+                    chunk_config = '{chunk_config}'
+                WHEN NOT MATCHED THEN INSERT (relative_path, md5, last_modified, size, ingested_at, chunk_config)
+                    VALUES (d.relative_path, d.md5, d.last_modified, d.size, CURRENT_TIMESTAMP, '{chunk_config}');
+                COMMIT;
+                DROP TABLE IF EXISTS {chunks_table};
+                RETURN embedded || ',' || chunk_count;
+            END;
+            $$
+            """
+            job = session.sql(query).collect_nowait()
+            if on_query:
+                on_query(job.query_id)
+            embedded, chunks = job.result()[0][0].split(",")
+            chunks_embedded += int(embedded)
+            chunks_total += int(chunks)
+            files_processed += len(batch_files["paths"])
+            if on_progress:
+                on_progress(files_processed, files, len(batches) - index - 1)
+
+        # Also catches a cancellation issued while the last batch ran
+        cancelled = bool(should_cancel and should_cancel())
+        # Only recorded now, so a failed run never labels vectors of another model
+        set_table_embedding(session, output_table_full, embedding_type, embedding_model)
+        result = {
+            "files_added": added_count, "files_changed": files - added_count, "files_removed": removed_count,
+            "chunks_embedded": chunks_embedded, "chunks_cached": chunks_total - chunks_embedded,
+            "cancelled": cancelled, "skipped_files": skipped_files
+        }
+        print(f"Vector embeddings of {stage} updated in {output_table}: {result}")
+        return result
+    except SnowparkSQLException as e:
+        raise e
+
+def reembed_table(session, db, schema, table, embedding_type, embedding_model, files_per_batch=None, on_progress=None, on_query=None, should_cancel=None):
+    """Moves an embedding table to another embedding model without taking it offline.
+
+    The chunks are re-embedded into the shadow table {table}_REEMBED, file by file in
+    batches, while queries keep using the old embeddings. Vectors come from the embedding
+    cache, so chunks embedded with the new model before are not embedded again. Files are
+    compared by a hash of their chunks, so a cancelled migration resumes where it stopped
+    and files changed by an ingestion run in the meantime are re-embedded. Once the shadow
+    table matches, it is swapped with the table in one atomic operation. Ingestion runs
+    refuse to start, or to write another batch, while the shadow table exists (see
+    check_not_reembedding). A batch already in flight can still commit to the old table
+    after the last catch-up, so the swap is followed by one more catch-up from the old
+    table into the new one before the old embeddings are dropped. No chunk listed in the
+    manifest is lost.
+
+    Args:
+        session: Snowflake session.
+        db (str): Database name.
+        schema (str): Schema name.
+        table (str): Embedding table with relative_path, chunk and vector_embeddings columns.
+            Rows without a relative_path are not carried over.
+        embedding_type (str): EMBED_TEXT_768 or EMBED_TEXT_1024.
+        embedding_model (str): Model to re-embed with.
+        files_per_batch (int, optional): Number of files per query. Defaults to all files at once.
+        on_progress (callable, optional): Called as on_progress(files_processed, files_total,
+            batches_left) after every batch.
+        on_query (callable, optional): Called with the query ID of every submitted batch.
+        should_cancel (callable, optional): Checked before every batch; when it returns True,
+            the table is not swapped and the shadow table is kept for the next run.
+
+    Returns:
+        dict: Number of files re-embedded, whether the table was swapped and whether the run
+        was cancelled.
+
+    Raises:
+        SnowparkSQLException: If a query fails.
+    """
+    table_full = f"{db}.{schema}.{table}"
+    shadow_table = f"{table}_REEMBED"
+    shadow_table_full = f"{db}.{schema}.{shadow_table}"
+    vector_type, cache_table_full = setup_embedding_cache(session, db, schema, embedding_type)
+
+    try:
+        # A shadow table left by a cancelled migration to another model cannot be resumed
+        recorded = get_table_embedding(session, db, schema, shadow_table)
+        if recorded != {"embedding_type": embedding_type, "embedding_model": embedding_model}:
+            session.sql(f"""
+                CREATE OR REPLACE TABLE {shadow_table_full} AS
+                SELECT * REPLACE (NULL::{vector_type} AS vector_embeddings) FROM {table_full} WHERE FALSE
+            """).collect()
+            set_table_embedding(session, shadow_table_full, embedding_type, embedding_model)
+
+        # Files whose chunks are missing from the target table or differ from the source table
+        def pending_files(source_full=table_full, target_full=shadow_table_full):
+            return session.sql(f"""
+                WITH source AS (
+                    SELECT relative_path, HASH_AGG(chunk) AS chunks_hash FROM {source_full} GROUP BY relative_path
+                ), target AS (
+                    SELECT relative_path, HASH_AGG(chunk) AS chunks_hash FROM {target_full} GROUP BY relative_path
+                )
+                SELECT source.relative_path FROM source
+                LEFT JOIN target ON target.relative_path = source.relative_path
+                WHERE source.relative_path IS NOT NULL AND NOT EQUAL_NULL(target.chunks_hash, source.chunks_hash)
+            """).collect()
+
+        def copy_files(paths, source_full=table_full, target_full=shadow_table_full):
+            batch = ", ".join(f"'{escape_sql_string(path)}'" for path in paths)
+            chunks = f"(SELECT chunk, SHA2(chunk, 256) AS chunk_hash FROM {source_full} WHERE relative_path IN ({batch}))"
+            query = f"""
+            EXECUTE IMMEDIATE $$
+            BEGIN
+                {get_embedding_cache_merge(cache_table_full, embedding_type, embedding_model, chunks)};
+                BEGIN TRANSACTION;
+                DELETE FROM {target_full} WHERE relative_path IN ({batch});
+                INSERT INTO {target_full}
+                SELECT t.* REPLACE (c.vector_embeddings AS vector_embeddings)
+                FROM {source_full} AS t
+                LEFT JOIN {cache_table_full} AS c
+                    ON c.embedding_model = '{embedding_model}' AND c.chunk_hash = SHA2(t.chunk, 256)
+                WHERE t.relative_path IN ({batch});
+                COMMIT;
+            END;
+            $$
+            """
+            job = session.sql(query).collect_nowait()
+            if on_query:
+                on_query(job.query_id)
+            job.result("no_result")
+
+        paths = [row["RELATIVE_PATH"] for row in pending_files()]
+        batch_size = files_per_batch or max(len(paths), 1)
+        batches = [paths[start:start + batch_size] for start in range(0, len(paths), batch_size)]
+        files_processed = 0
+        for index, batch in enumerate(batches):
+            if should_cancel and should_cancel():
+                return {"files_reembedded": files_processed, "swapped": False, "cancelled": True}
+            copy_files(batch)
+            files_processed += len(batch)
+            if on_progress:
+                on_progress(files_processed, len(paths), len(batches) - index - 1)
+
+        # Catch up with ingestion runs that finished during the migration, then swap
+        if should_cancel and should_cancel():
+            return {"files_reembedded": files_processed, "swapped": False, "cancelled": True}
+        catch_up = [row["RELATIVE_PATH"] for row in pending_files()]
+        if catch_up:
+            copy_files(catch_up)
+            files_processed += len(catch_up)
+        def remove_deleted_files(source_full=table_full, target_full=shadow_table_full):
+            session.sql(f"""
+                DELETE FROM {target_full}
+                WHERE relative_path NOT IN (SELECT relative_path FROM {source_full} WHERE relative_path IS NOT NULL)
+            """).collect()
+
+        remove_deleted_files()
+        session.sql(f"ALTER TABLE {table_full} SWAP WITH {shadow_table_full}").collect()
+        # The old embeddings are now in the shadow table; carry over batches an ingestion run
+        # committed to them after the catch-up above, so their manifest entries stay true
+        late = [row["RELATIVE_PATH"] for row in pending_files(shadow_table_full, table_full)]
+        if late:
+            copy_files(late, shadow_table_full, table_full)
+            files_processed += len(late)
+        remove_deleted_files(shadow_table_full, table_full)
+        session.sql(f"DROP TABLE IF EXISTS {shadow_table_full}").collect()
 
-    # Construct the SQL query to process all files in the stage
+        result = {"files_reembedded": files_processed, "swapped": True, "cancelled": False}
+        print(f"{table} re-embedded with {embedding_model}: {result}")
+        return result
+    except SnowparkSQLException as e:
+        raise e
+
+def fetch_slowest_files(session, db, schema, output_table, limit=10):
+    """Retrieves the files of an embeddings table that took longest to chunk.
+
+    Args:
+        session: Snowflake session.
+        db (str): Database name.
+        schema (str): Schema name.
+        output_table (str): Embeddings table; its statistics are in {output_table}_FILE_STATS.
+        limit (int, optional): Number of files to return. Defaults to 10.
+
+    Returns:
+        pandas.DataFrame: File statistics, slowest first.
+
+    Raises:
+        SnowparkSQLException: If the query fails.
+    """
     query = f"""
-    INSERT INTO {output_table_full} (relative_path, size, file_url, scoped_file_url, chunk, vector_embeddings)
-    SELECT 
-        relative_path, 
-        size,
-        file_url,
-        build_scoped_file_url('{stage_path}', relative_path) AS scoped_file_url,
-        func.chunk AS chunk,
-        SNOWFLAKE.CORTEX.{embedding_type}('{embedding_model}', func.chunk) AS vector_embeddings
-    FROM 
-        directory('{stage_path}') AS dir,
-        TABLE(pdf_text_chunker(build_scoped_file_url('{stage_path}', relative_path))) AS func;
+    SELECT relative_path, size, pages, skipped_pages, chunks, elapsed_ms,
+        ROUND(pages / NULLIF(elapsed_ms, 0) * 1000, 1) AS pages_per_second, chunk_strategy, ingested_at
+    FROM {db}.{schema}.{output_table}_FILE_STATS
+    ORDER BY elapsed_ms DESC
+    LIMIT {int(limit)}
     """
     try:
-        session.sql(query).collect()
-        st.success(f"Vector embeddings created successfully for all files in {stage}. Results saved to {output_table}.")
+        return session.sql(query).to_pandas()
     except SnowparkSQLException as e:
-        st.error(f"Failed to create embeddings: {e}")
         raise e
 
-def create_cortex_search_service(session, database, schema, table, column, attributes, service_name, embedding_model, warehouse):
+def create_cortex_search_service(session, database, schema, table, column, attributes, service_name, embedding_model, warehouse, block=True):
     """Creates a Cortex Search Service for the specified table and column.
 
     Args:
@@ -611,6 +1750,11 @@ def create_cortex_search_service(session, database, schema, table, column, attri
         service_name (str): Name of the search service to create.
         embedding_model (str): Model to use for embeddings.
         warehouse (str): Snowflake warehouse to use.
+        block (bool, optional): Whether to wait for the service creation. If False, the
+            statement is submitted asynchronously and its AsyncJob is returned. Defaults to True.
+
+    Returns:
+        AsyncJob: The submitted statement when block is False, otherwise None.
 
     Raises:
         SnowparkSQLException: If the query fails.
@@ -633,8 +1777,68 @@ def create_cortex_search_service(session, database, schema, table, column, attri
     """
     try:
         print("query: ",query)
+        if not block:
+            return session.sql(query).collect_nowait()
         session.sql(query).collect()
-        st.success(f"Cortex Search Service {service_name} created successfully.")
+        print(f"Cortex Search Service {service_name} created successfully.")
     except Exception as e:
-        st.error(f"Failed to create Cortex Search Service {service_name}: {e}")
+        raise e
+
+def test_cortex_search_service(session, database, schema, service_name, column, question, limit=3):
+    """Runs a sample query against a Cortex Search Service.
+
+    Args:
+        session: Snowflake session.
+        database (str): Database name.
+        schema (str): Schema name.
+        service_name (str): Name of the search service.
+        column (str): Column to return from the service.
+        question (str): Sample query.
+        limit (int, optional): Number of results to return. Defaults to 3.
+
+    Returns:
+        list: Search results as dictionaries.
+
+    Raises:
+        SnowparkSQLException: If the query fails.
+    """
+    request = json.dumps({"query": question, "columns": [column.lower()], "limit": limit})
+    query = f"""
+    SELECT SNOWFLAKE.CORTEX.SEARCH_PREVIEW('{database}.{schema}.{service_name}', ?) AS result
+    """
+    try:
+        result = session.sql(query, [request]).collect()
+        return json.loads(result[0]["RESULT"])["results"]
+    except SnowparkSQLException as e:
+        raise e
+
+def test_vector_embeddings(session, db, schema, table, embedding_type, embedding_model, question, limit=3):
+    """Retrieves the chunks of an embeddings table most similar to a sample question.
+
+    Args:
+        session: Snowflake session.
+        db (str): Database name.
+        schema (str): Schema name.
+        table (str): Table holding the chunks and their vector_embeddings.
+        embedding_type (str): Embedding function used for the table.
+        embedding_model (str): Embedding model used for the table.
+        question (str): Sample question.
+        limit (int, optional): Number of chunks to return. Defaults to 3.
+
+    Returns:
+        list: Rows with relative_path, chunk and similarity.
+
+    Raises:
+        SnowparkSQLException: If the query fails.
+    """
+    query = f"""
+    SELECT relative_path, chunk,
+        VECTOR_COSINE_SIMILARITY(vector_embeddings, SNOWFLAKE.CORTEX.{embedding_type}('{embedding_model}', ?)) AS similarity
+    FROM {db}.{schema}.{table}
+    ORDER BY similarity DESC
+    LIMIT {limit}
+    """
+    try:
+        return session.sql(query, [question]).collect()
+    except SnowparkSQLException as e:
         raise e
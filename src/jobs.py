@@ -0,0 +1,755 @@
+import streamlit as st
+import threading
+import itertools
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+import json
+from src.notification import add_notification_query_id, reconcile_notifications, cancel_notification, is_notification_cancelled, display_messages, heartbeat_notifications, add_log_entry, fetch_settled_notification_ids, untracked_notifications, release_notification, mark_notification_started
+
+# Load the config file
+config_path = Path("src/settings_config.json")
+with open(config_path, "r") as f:
+    config = json.load(f)
+
+
+class Job:
+    """A unit of background work tracked by the JobExecutor."""
+
+    def __init__(self, job_id, name, fn, args, kwargs, owner=None, notification_id=None, user=None, session=None):
+        """Initialize a new job.
+
+        Args:
+            job_id (int): Unique ID of the job within the executor
+            name (str): Display name of the job
+            fn (callable): Function to run, called as fn(job, *args, **kwargs)
+            args (tuple): Positional arguments for fn
+            kwargs (dict): Keyword arguments for fn
+            owner (str, optional): Key of the app session that submitted the job
+            notification_id (int, optional): ID of the notification entry tracking the job
+            user (str, optional): Name of the user the job runs for, used for quotas and fair scheduling
+            session (optional): Snowflake session used to keep the notification's heartbeat fresh
+        """
+        self.id = job_id
+        self.name = name
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.owner = owner
+        self.notification_id = notification_id
+        self.user = user
+        self.session = session
+        self.state = "Queued"
+        self.submitted_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+        self.query_ids = []
+        self.result = None
+        self.error = None
+        self.detached = False
+        self.settled = False
+        self.cancel_requested = False
+        self.pipeline = None
+
+    def add_query_id(self, query_id):
+        """Records the ID of a Snowflake query issued by the job.
+
+        Args:
+            query_id (str): Snowflake query ID
+        """
+        self.query_ids.append(query_id)
+
+    def detach(self):
+        """Marks the remaining work of the job as running server-side in Snowflake.
+
+        The worker is released as soon as the job function returns; the final status of
+        the job's notification entry is settled later by reconcile_jobs.
+        """
+        self.detached = True
+
+    def to_dict(self):
+        """Convert the job to a dictionary for display.
+
+        Returns:
+            dict: Job data in dictionary format
+        """
+        return {
+            "id": self.id,
+            "name": self.name,
+            "state": self.state,
+            "notification_id": self.notification_id,
+            "user": self.user,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "query_ids": ",".join(self.query_ids),
+            "error": self.error
+        }
+
+
+class Pipeline:
+    """A graph of jobs where every step starts once the steps it depends on have succeeded.
+
+    Steps without a dependency between them run in parallel. A step that fails or is
+    cancelled skips all steps depending on it. The whole pipeline is tracked by a single
+    notification entry, which its step jobs share.
+    """
+
+    def __init__(self, name, on_update=None):
+        """Initialize an empty pipeline.
+
+        Args:
+            name (str): Display name of the pipeline
+            on_update (callable, optional): Called as on_update(pipeline) whenever a step
+                settles, outside the executor lock. pipeline.finished tells whether it was the last one.
+        """
+        self.name = name
+        self.on_update = on_update
+        self.steps = {}
+        self.jobs = {}
+        self.skipped = set()
+        self.owner = None
+        self.notification_id = None
+        self.user = None
+        self.session = None
+
+    def add_step(self, name, fn, *args, depends_on=(), **kwargs):
+        """Adds a step to the pipeline.
+
+        Args:
+            name (str): Unique name of the step
+            fn (callable): Function to run, called as fn(job, *args, **kwargs). It must block
+                until its work is done, since dependents start as soon as it returns.
+            *args: Positional arguments for fn
+            depends_on (tuple, optional): Names of the steps that must succeed first
+            **kwargs: Keyword arguments for fn
+
+        Raises:
+            ValueError: If the step name is already taken or a dependency is unknown
+        """
+        if name in self.steps:
+            raise ValueError(f"Duplicate pipeline step: {name}")
+        unknown = [dependency for dependency in depends_on if dependency not in self.steps]
+        if unknown:
+            raise ValueError(f"Step {name} depends on unknown steps: {', '.join(unknown)}")
+        # Dependencies must already exist, so the steps always form an acyclic graph
+        self.steps[name] = {"fn": fn, "args": args, "kwargs": kwargs, "depends_on": tuple(depends_on)}
+
+    def state_of(self, name):
+        """Returns the state of a step: Pending, Skipped or the state of its job."""
+        if name in self.skipped:
+            return "Skipped"
+        job = self.jobs.get(name)
+        return job.state if job else "Pending"
+
+    def ready_steps(self):
+        """Returns the pending steps whose dependencies have all succeeded."""
+        return [
+            name for name, step in self.steps.items()
+            if name not in self.jobs and name not in self.skipped
+            and all(self.state_of(dependency) == "Succeeded" for dependency in step["depends_on"])
+        ]
+
+    def skip_blocked_steps(self):
+        """Skips the pending steps that depend on a step that did not succeed."""
+        for name, step in self.steps.items():
+            if name in self.jobs or name in self.skipped:
+                continue
+            if any(self.state_of(dependency) in ("Detached", "Failed", "Cancelled", "Skipped") for dependency in step["depends_on"]):
+                self.skipped.add(name)
+
+    @property
+    def finished(self):
+        """Whether every step has settled."""
+        return all(self.state_of(name) not in ("Pending", "Queued", "Running") for name in self.steps)
+
+    @property
+    def succeeded(self):
+        """Whether every step has succeeded."""
+        return all(self.state_of(name) == "Succeeded" for name in self.steps)
+
+    def errors(self):
+        """Returns (step name, error) pairs of the failed steps."""
+        return [(name, job.error) for name, job in self.jobs.items() if job.state == "Failed"]
+
+    def summary(self):
+        """Describes the state and duration of every step.
+
+        Returns:
+            str: One "step: state (duration)" entry per step, in declaration order
+        """
+        parts = []
+        for name in self.steps:
+            state = self.state_of(name)
+            job = self.jobs.get(name)
+            if job and job.started_at:
+                elapsed = ((job.finished_at or datetime.now()) - job.started_at).total_seconds()
+                state += f" in {elapsed:.1f}s"
+            parts.append(f"{name}: {state}")
+        return f"{self.name} - " + "; ".join(parts)
+
+
+class JobExecutor:
+    """Runs background jobs on a bounded pool of worker threads.
+
+    Jobs wait in a bounded queue until a worker is free; submitting to a full queue is
+    rejected instead of spawning more threads. Workers never touch the Streamlit script
+    context. Instead, every state change is appended to an event channel that the UI
+    polls with events_since on its next run.
+
+    The queue is shared by all users of the app, so scheduling is fair rather than FIFO:
+    every user may run at most max_running_per_user jobs at once, the next job goes to the
+    user with the fewest running jobs. A detached job counts as running until reconcile has
+    settled its notification, since its query still runs in Snowflake. Interactive calls run
+    in the script thread rather than on a worker; while one is in flight, no new job starts
+    unless it has waited interactive_max_wait seconds in the queue.
+
+    While a job is queued or running, a heartbeat thread refreshes the heartbeat of its
+    notification entry every heartbeat_interval seconds, so other app processes can tell
+    it is still driven by this one. While detached jobs are unsettled, the same thread
+    reconciles them. Finished jobs stay in the registry for job_retention seconds and are
+    evicted afterwards.
+    """
+
+    def __init__(self, max_workers=4, max_queued=16, max_events=500, max_running_per_user=2,
+                 max_queued_per_user=8, heartbeat_interval=30, job_retention=3600, heartbeat_timeout=120,
+                 interactive_max_wait=30):
+        """Initialize the executor.
+
+        Args:
+            max_workers (int, optional): Number of worker threads. Defaults to 4.
+            max_queued (int, optional): Maximum number of jobs waiting for a worker. Defaults to 16.
+            max_events (int, optional): Number of events kept in the channel. Defaults to 500.
+            max_running_per_user (int, optional): Maximum number of jobs running at once for one user. Defaults to 2.
+            max_queued_per_user (int, optional): Maximum number of jobs waiting for one user. Defaults to 8.
+            heartbeat_interval (int, optional): Seconds between heartbeats of live jobs. Defaults to 30.
+            job_retention (int, optional): Seconds a finished job stays in the registry. Defaults to 3600.
+            heartbeat_timeout (int, optional): Seconds without a heartbeat after which reconcile
+                settles the notification of another app process. Defaults to 120.
+            interactive_max_wait (int, optional): Seconds after which a queued job starts even
+                while interactive calls are in flight. Defaults to 30.
+        """
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.max_running_per_user = max_running_per_user
+        self.max_queued_per_user = max_queued_per_user
+        self._interactive_calls = 0
+        self._settling = set()
+        self._condition = threading.Condition()
+        self._queue = deque()
+        self._jobs = {}
+        self._events = deque(maxlen=max_events)
+        self._job_ids = itertools.count(1)
+        self._event_ids = itertools.count(1)
+        self._workers = []
+        self.heartbeat_interval = heartbeat_interval
+        self._heartbeat = None
+        self.job_retention = job_retention
+        self.heartbeat_timeout = heartbeat_timeout
+        self.interactive_max_wait = interactive_max_wait
+
+    def submit(self, name, fn, *args, owner=None, notification_id=None, user=None, session=None, **kwargs):
+        """Queues a job for execution.
+
+        Args:
+            name (str): Display name of the job
+            fn (callable): Function to run, called as fn(job, *args, **kwargs)
+            *args: Positional arguments for fn
+            owner (str, optional): Key of the app session that submitted the job
+            notification_id (int, optional): ID of the notification entry tracking the job
+            user (str, optional): Name of the user the job runs for
+            session (optional): Snowflake session used to keep the notification's heartbeat fresh
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Job: The queued job
+
+        Raises:
+            RuntimeError: If the queue, or the user's share of it, is full
+        """
+        with self._condition:
+            self._check_capacity(user, 1)
+            self._prune_jobs()
+            job = Job(
+                next(self._job_ids), name, fn, args, kwargs, owner=owner, notification_id=notification_id,
+                user=user, session=session
+            )
+            self._jobs[job.id] = job
+            self._queue.append(job)
+            # The job keeps the notification live from now on
+            if notification_id is not None:
+                release_notification(notification_id)
+            self._publish(job)
+            self._ensure_workers()
+            self._condition.notify()
+        return job
+
+    def submit_pipeline(self, pipeline, owner=None, notification_id=None, user=None, session=None):
+        """Starts a pipeline by queueing the steps that have no dependencies.
+
+        Dependent steps are queued by the worker that finishes their last dependency.
+
+        Args:
+            pipeline (Pipeline): The pipeline to run
+            owner (str, optional): Key of the app session that submitted the pipeline
+            notification_id (int, optional): ID of the notification entry tracking the pipeline
+            user (str, optional): Name of the user the pipeline runs for
+            session (optional): Snowflake session used to keep the notification's heartbeat fresh
+
+        Raises:
+            ValueError: If the pipeline has no steps
+            RuntimeError: If the queue, or the user's share of it, cannot take all initial steps.
+                No step is queued in that case.
+        """
+        if not pipeline.steps:
+            raise ValueError(f"Pipeline {pipeline.name} has no steps")
+        pipeline.owner = owner
+        pipeline.notification_id = notification_id
+        pipeline.user = user
+        pipeline.session = session
+        with self._condition:
+            ready = pipeline.ready_steps()
+            self._check_capacity(user, len(ready))
+            for name in ready:
+                self._submit_step(pipeline, name)
+
+    def _check_capacity(self, user, count):
+        """Raises RuntimeError unless count more jobs of a user fit in the queue. Caller holds the lock."""
+        if len(self._queue) + count > self.max_queued:
+            raise RuntimeError(
+                f"Too many background jobs are waiting ({len(self._queue)}). Please retry once some have finished."
+            )
+        queued_for_user = sum(1 for job in self._queue if job.user == user)
+        if user is not None and queued_for_user + count > self.max_queued_per_user:
+            raise RuntimeError(
+                f"You already have {queued_for_user} background jobs waiting. Please retry once some have started."
+            )
+
+    def _submit_step(self, pipeline, name):
+        """Queues a step of a pipeline. Caller holds the lock."""
+        step = pipeline.steps[name]
+        job = self.submit(
+            f"{pipeline.name}: {name}", step["fn"], *step["args"], owner=pipeline.owner,
+            notification_id=pipeline.notification_id, user=pipeline.user, session=pipeline.session, **step["kwargs"]
+        )
+        job.pipeline = pipeline
+        pipeline.jobs[name] = job
+
+    def _advance_pipeline(self, pipeline):
+        """Queues the steps unblocked by a settled step and skips the ones it blocks.
+
+        A step that cannot be queued because the queue is full fails. Caller holds the lock.
+        """
+        pipeline.skip_blocked_steps()
+        for name in pipeline.ready_steps():
+            try:
+                self._submit_step(pipeline, name)
+            except RuntimeError as e:
+                job = Job(next(self._job_ids), f"{pipeline.name}: {name}", None, (), {}, owner=pipeline.owner,
+                          notification_id=pipeline.notification_id, user=pipeline.user)
+                job.state = "Failed"
+                job.error = str(e)
+                job.pipeline = pipeline
+                pipeline.jobs[name] = job
+                self._publish(job)
+        pipeline.skip_blocked_steps()
+        if pipeline.finished and pipeline.notification_id is not None:
+            # Kept live until on_update has settled the notification entry
+            self._settling.add(pipeline.notification_id)
+
+    def _prune_jobs(self):
+        """Evicts the jobs that finished more than job_retention seconds ago. Caller holds the lock."""
+        cutoff = datetime.now() - timedelta(seconds=self.job_retention)
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished_at and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def get_job(self, job_id):
+        """Returns a job of the registry by ID, or None if unknown."""
+        return self._jobs.get(job_id)
+
+    def list_jobs(self):
+        """Returns all jobs of the registry, most recent first."""
+        with self._condition:
+            return sorted(self._jobs.values(), key=lambda job: job.id, reverse=True)
+
+    def cancel(self, notification_id):
+        """Cancels the jobs tracked by a notification entry.
+
+        Queued jobs are removed from the queue; running jobs are asked to stop submitting
+        work, which they check between batches. Steps of a pipeline waiting on a cancelled
+        step are skipped.
+
+        Args:
+            notification_id (int): ID of the notification entry tracking the jobs
+
+        Returns:
+            list: The cancelled jobs, empty if no live job tracks the notification
+        """
+        cancelled = []
+        settled_pipelines = []
+        with self._condition:
+            for job in list(self._jobs.values()):
+                if job.notification_id != notification_id or job.state not in ("Queued", "Running"):
+                    continue
+                job.cancel_requested = True
+                if job.state == "Queued":
+                    self._queue.remove(job)
+                    job.state = "Cancelled"
+                    job.finished_at = datetime.now()
+                    self._publish(job)
+                    if job.pipeline:
+                        self._advance_pipeline(job.pipeline)
+                        settled_pipelines.append(job.pipeline)
+                cancelled.append(job)
+        for pipeline in settled_pipelines:
+            self._notify_pipeline(pipeline)
+        return cancelled
+
+    def queue_position(self, notification_id):
+        """Returns the position of a queued job in the scheduling order.
+
+        Jobs are ordered by submission. The position is an estimate since fair scheduling may
+        start a later job of another user first.
+
+        Args:
+            notification_id (int): ID of the notification entry tracking the job
+
+        Returns:
+            tuple: (1-based position, number of queued jobs), or None if the job is not queued
+        """
+        with self._condition:
+            ordered = sorted(self._queue, key=lambda job: job.id)
+            for position, job in enumerate(ordered, 1):
+                if job.notification_id == notification_id:
+                    return position, len(ordered)
+        return None
+
+    @contextmanager
+    def interactive_call(self):
+        """Holds back new background jobs while an interactive call runs in the script thread.
+
+        Jobs that are already running are not interrupted; they simply get no company until
+        the interactive call returns. Jobs that have waited interactive_max_wait seconds in the
+        queue start anyway, so a stream of chat calls cannot starve them.
+        """
+        with self._condition:
+            self._interactive_calls += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._interactive_calls -= 1
+                self._condition.notify_all()
+
+    def live_notification_ids(self):
+        """Returns the notification IDs of the jobs still queued or running in this process."""
+        with self._condition:
+            return [
+                job.notification_id for job in self._jobs.values()
+                if job.state in ("Queued", "Running") and job.notification_id is not None
+            ] + list(self._settling)
+
+    def events_since(self, event_id, owner=None):
+        """Returns the job events published after event_id.
+
+        Args:
+            event_id (int): ID of the last event already seen (0 for all)
+            owner (str, optional): Only return events of jobs submitted by this owner
+
+        Returns:
+            list: Event dictionaries ordered by event ID
+        """
+        with self._condition:
+            return [
+                event for event in self._events
+                if event["event_id"] > event_id and (owner is None or event["owner"] == owner)
+            ]
+
+    def _publish(self, job):
+        """Appends the current state of a job to the event channel. Caller holds the lock."""
+        self._events.append({
+            "event_id": next(self._event_ids),
+            "job_id": job.id,
+            "name": job.name,
+            "state": job.state,
+            "owner": job.owner,
+            "error": job.error
+        })
+
+    def _ensure_workers(self):
+        """Starts worker threads up to max_workers, and the heartbeat thread. Caller holds the lock."""
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._work, name=f"job-worker-{len(self._workers)}", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+        if self._heartbeat is None:
+            self._heartbeat = threading.Thread(target=self._beat, name="job-heartbeat", daemon=True)
+            self._heartbeat.start()
+
+    def _beat(self):
+        """Heartbeat loop: refreshes the notification entries of the live jobs and reconciles
+        the unsettled detached jobs, per session."""
+        while True:
+            time.sleep(self.heartbeat_interval)
+            with self._condition:
+                live = {}
+                detached = {}
+                # Synchronous operations of this process need a fresh heartbeat as well
+                for notification_id, session in untracked_notifications().items():
+                    live.setdefault(id(session), (session, set()))[1].add(notification_id)
+                for job in self._jobs.values():
+                    if job.notification_id is None or job.session is None:
+                        continue
+                    if job.state in ("Queued", "Running"):
+                        live.setdefault(id(job.session), (job.session, set()))[1].add(job.notification_id)
+                    elif job.state == "Detached" and not job.settled:
+                        detached[id(job.session)] = job.session
+            for session, notification_ids in live.values():
+                try:
+                    heartbeat_notifications(session, notification_ids)
+                except Exception as e:
+                    add_log_entry(session, "Job Heartbeat", str(e))
+            for session in detached.values():
+                try:
+                    self.reconcile(session)
+                except Exception as e:
+                    add_log_entry(session, "Job Reconcile", str(e))
+
+    def reconcile(self, session):
+        """Settles the notification entries no longer driven by an app process, and releases
+        the quota of the detached jobs whose notification is settled.
+
+        Args:
+            session: Snowflake session object
+        """
+        reconcile_notifications(session, self.live_notification_ids(), heartbeat_timeout=self.heartbeat_timeout)
+        with self._condition:
+            detached = {
+                job.notification_id for job in self._jobs.values()
+                if job.state == "Detached" and not job.settled and job.notification_id is not None
+            }
+        if not detached:
+            return
+        settled = fetch_settled_notification_ids(session, detached)
+        with self._condition:
+            for job in self._jobs.values():
+                if job.state == "Detached" and job.notification_id in settled:
+                    job.settled = True
+            # Settled jobs free quota for jobs held back by _next_job
+            self._condition.notify_all()
+
+    def _next_job(self):
+        """Picks the next job to run and removes it from the queue. Caller holds the lock.
+
+        Returns:
+            Job: The job to run, or None if no queued job may start yet
+        """
+        # Detached jobs keep their query running in Snowflake until their notification settles
+        running = [
+            job for job in self._jobs.values()
+            if job.state == "Running" or (job.state == "Detached" and not job.settled and job.notification_id is not None)
+        ]
+        running_per_user = {}
+        for job in running:
+            running_per_user[job.user] = running_per_user.get(job.user, 0) + 1
+        queue = self._queue
+        if self._interactive_calls:
+            waited_since = datetime.now() - timedelta(seconds=self.interactive_max_wait)
+            queue = [job for job in self._queue if job.submitted_at <= waited_since]
+
+        candidates = [
+            job for job in queue
+            if job.user is None or running_per_user.get(job.user, 0) < self.max_running_per_user
+        ]
+        if not candidates:
+            return None
+        job = min(candidates, key=lambda job: (running_per_user.get(job.user, 0), job.id))
+        self._queue.remove(job)
+        return job
+
+    def _work(self):
+        """Worker loop: takes queued jobs and runs them one at a time."""
+        while True:
+            with self._condition:
+                job = self._next_job()
+                while job is None:
+                    # While interactive calls hold jobs back, wake up to start those that waited long enough
+                    self._condition.wait(1 if self._interactive_calls else None)
+                    job = self._next_job()
+                job.state = "Running"
+                job.started_at = datetime.now()
+                self._publish(job)
+
+            if job.notification_id is not None and job.session is not None:
+                try:
+                    mark_notification_started(job.session, job.notification_id)
+                except Exception as e:
+                    add_log_entry(job.session, "Job Start", str(e))
+
+            try:
+                job.result = job.fn(job, *job.args, **job.kwargs)
+                state = "Detached" if job.detached else "Succeeded"
+            except Exception as e:
+                job.error = str(e)
+                state = "Failed"
+            if job.cancel_requested:
+                state = "Cancelled"
+
+            with self._condition:
+                job.state = state
+                job.finished_at = datetime.now()
+                self._publish(job)
+                # Dependents are queued under the same lock, so the pipeline never looks idle
+                if job.pipeline:
+                    self._advance_pipeline(job.pipeline)
+                # A finished job frees quota for jobs held back by _next_job
+                self._condition.notify_all()
+            if job.pipeline:
+                self._notify_pipeline(job.pipeline)
+
+    def _notify_pipeline(self, pipeline):
+        """Calls the update callback of a pipeline, outside the lock."""
+        try:
+            if pipeline.on_update:
+                pipeline.on_update(pipeline)
+        except Exception as e:
+            add_log_entry(pipeline.session, "Job Pipeline", f"Error updating pipeline {pipeline.name}: {e}")
+        finally:
+            if pipeline.finished:
+                with self._condition:
+                    self._settling.discard(pipeline.notification_id)
+
+
+@st.cache_resource
+def get_job_executor():
+    """Returns the job executor shared by all sessions of the app.
+
+    Returns:
+        JobExecutor: The shared executor
+    """
+    defaults = config["default_settings"]
+    return JobExecutor(
+        max_workers=defaults["job_max_workers"], max_queued=defaults["job_max_queued"],
+        max_running_per_user=defaults["job_max_running_per_user"],
+        max_queued_per_user=defaults["job_max_queued_per_user"],
+        heartbeat_interval=defaults["job_heartbeat_interval"],
+        job_retention=defaults["job_retention_minutes"] * 60,
+        heartbeat_timeout=defaults["job_heartbeat_timeout"],
+        interactive_max_wait=defaults["job_interactive_max_wait"]
+    )
+
+
+def record_query_id(session, job, query_id):
+    """Records a query ID issued by a job on the job and on its notification entry.
+
+    Args:
+        session: Snowflake session object
+        job (Job): The job that issued the query
+        query_id (str): Snowflake query ID
+    """
+    job.add_query_id(query_id)
+    if job.notification_id is not None:
+        add_notification_query_id(session, job.notification_id, query_id)
+
+
+def reconcile_jobs(session):
+    """Settles the notification entries of jobs that are no longer driven by an app process.
+
+    This covers jobs detached to Snowflake and jobs of app processes that stopped sending
+    heartbeats, whose queries are reattached by their stored query IDs.
+
+    Args:
+        session: Snowflake session object
+    """
+    get_job_executor().reconcile(session)
+
+
+def cancellation_check(session, job):
+    """Returns a callable telling a job's batch loop whether the job has been cancelled.
+
+    The job's own flag covers cancellations from this process and the notification status
+    covers those issued from another app process. A cancellation found in the notification
+    sets the job's flag too, so the job ends Cancelled rather than Succeeded and the
+    pipeline steps depending on it are skipped.
+
+    Args:
+        session: Snowflake session object
+        job (Job): The job to check
+
+    Returns:
+        callable: Function returning True once the job is cancelled
+    """
+    def should_cancel():
+        if job.cancel_requested:
+            return True
+        if job.notification_id is not None and is_notification_cancelled(session, job.notification_id):
+            job.cancel_requested = True
+        return job.cancel_requested
+    return should_cancel
+
+
+def cancel_job(session, notification_id):
+    """Cancels a job: stops its remaining batches and cancels its running Snowflake queries.
+
+    Args:
+        session: Snowflake session object
+        notification_id (int): ID of the notification entry tracking the job
+    """
+    get_job_executor().cancel(notification_id)
+    cancel_notification(session, notification_id)
+
+
+def get_job_owner():
+    """Returns the key identifying the current app session as owner of the jobs it submits.
+
+    Returns:
+        str: Owner key stored in the session state
+    """
+    if "job_owner" not in st.session_state:
+        st.session_state.job_owner = uuid.uuid4().hex
+    return st.session_state.job_owner
+
+
+def get_job_user(session):
+    """Returns the name of the user the current app session acts for.
+
+    In native mode all users share the app owner's session, so the viewer's identity is
+    taken from Streamlit when available and the Snowflake user otherwise.
+
+    Args:
+        session: Snowflake session object
+
+    Returns:
+        str: User name stored in the session state
+    """
+    if "job_user" not in st.session_state:
+        user = None
+        try:
+            user = st.experimental_user.get("email") or st.experimental_user.get("user_name")
+        except Exception:
+            pass
+        st.session_state.job_user = user or session.get_current_user()
+    return st.session_state.job_user
+
+
+def display_job_events():
+    """Shows a toast for every job event and bus message of the current session since the last run."""
+    owner = get_job_owner()
+    last_event_id = st.session_state.get("last_job_event_id", 0)
+    for event in get_job_executor().events_since(last_event_id, owner=owner):
+        if event["state"] == "Succeeded":
+            st.toast(f"{event['name']} completed successfully.", icon="✅")
+        elif event["state"] == "Detached":
+            st.toast(f"{event['name']} submitted to Snowflake. Check the notification screen for its status.", icon="🚀")
+        elif event["state"] == "Cancelled":
+            st.toast(f"{event['name']} was cancelled.", icon="🛑")
+        elif event["state"] == "Failed":
+            st.toast(f"{event['name']} failed. Check logs in the notification screen.", icon="❌")
+        last_event_id = event["event_id"]
+    st.session_state.last_job_event_id = last_event_id
+
+    # Messages published by jobs and other sessions through the notification bus
+    display_messages(owner)
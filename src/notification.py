@@ -1,17 +1,74 @@
 import streamlit as st
 from snowflake.snowpark import Session
 from datetime import datetime, timedelta
+import os
+import secrets
+import socket
+import threading
+import time
+import atexit
+import itertools
+from collections import deque
+import json
+import pandas as pd
+from pathlib import Path
+
+# Load the config file
+config_path = Path("src/settings_config.json")
+with open(config_path, "r") as f:
+    config = json.load(f)
+
+# Identifies this app process on the notification entries whose jobs it drives
+APP_PROCESS_ID = f"{socket.gethostname()}-{os.getpid()}-{secrets.token_hex(3)}"
+
+# Attributes marking a session whose notification or logs table has been created or migrated.
+# They live on the session object itself, so a new session never inherits them, unlike an id()
+# reused after the old session was garbage collected.
+_NOTIFICATION_TABLE_READY = "_toolkit_notification_table_ready"
+_LOGS_TABLE_READY = "_toolkit_logs_table_ready"
+
+# In-progress entries of this process that no executor job tracks yet, such as those of
+# synchronous operations, by ID with the session that created them. They count as live
+# until the job executor takes them over or their final status is set.
+_untracked_notifications = {}
+_untracked_notifications_lock = threading.Lock()
+
+def untracked_notifications() -> dict:
+    """
+    Returns the in-progress entries of this process that no executor job tracks.
+    
+    Returns:
+        dict: Session that created the entry by notification ID
+    """
+    with _untracked_notifications_lock:
+        return dict(_untracked_notifications)
+
+def release_notification(notification_id: int):
+    """
+    Stops treating a notification entry as driven by a synchronous operation of this process.
+    
+    Called once a job of the executor tracks the entry or the entry has its final status.
+    
+    Args:
+        notification_id (int): ID of the notification entry
+    """
+    with _untracked_notifications_lock:
+        _untracked_notifications.pop(notification_id, None)
 
 def create_notification_table(session: Session):
     """
     Creates a notification table in Snowflake if it doesn't exist.
     
+    The DDL runs once per session; later calls return without a round trip.
+    
     Args:
         session (Session): Active Snowflake session object
         
     Raises:
         Exception: If table creation fails
     """
+    if getattr(session, _NOTIFICATION_TABLE_READY, False):
+        return
     try:
         session.sql("""
             CREATE TABLE IF NOT EXISTS notification (
@@ -20,9 +77,35 @@ def create_notification_table(session: Session):
                 status STRING,
                 created_at TIMESTAMP,
                 completed_at TIMESTAMP,
-                details STRING
+                details STRING,
+                rows_processed NUMBER,
+                rows_total NUMBER,
+                progress_updated_at TIMESTAMP,
+                query_ids STRING,
+                pending_batches NUMBER,
+                updated_at TIMESTAMP,
+                owner_process STRING,
+                heartbeat_at TIMESTAMP,
+                started_at TIMESTAMP
             )
+            CLUSTER BY (created_at)
+        """).collect()
+        # Tables created by earlier versions lack the progress, query, change tracking, heartbeat and start columns
+        session.sql("""
+            ALTER TABLE notification ADD COLUMN IF NOT EXISTS
+                rows_processed NUMBER,
+                rows_total NUMBER,
+                progress_updated_at TIMESTAMP,
+                query_ids STRING,
+                pending_batches NUMBER,
+                updated_at TIMESTAMP,
+                owner_process STRING,
+                heartbeat_at TIMESTAMP,
+                started_at TIMESTAMP
         """).collect()
+        # Pages are read newest first by created_at, so keep micro-partitions ordered by it
+        session.sql("ALTER TABLE notification CLUSTER BY (created_at)").collect()
+        setattr(session, _NOTIFICATION_TABLE_READY, True)
     except Exception as e:
         st.error(f"Failed to create notification table: {e}")
         print(f"Error creating notification table: {e}")
@@ -32,9 +115,13 @@ def create_logs_table(session: Session):
     """
     Creates a logs table in Snowflake if it doesn't exist.
     
+    The DDL runs once per session; later calls return without a round trip.
+    
     Args:
         session (Session): Active Snowflake session object
     """
+    if getattr(session, _LOGS_TABLE_READY, False):
+        return
     session.sql("""
         CREATE TABLE IF NOT EXISTS logs (
             id INTEGER IDENTITY PRIMARY KEY,
@@ -42,12 +129,34 @@ def create_logs_table(session: Session):
             error_message STRING,
             created_at TIMESTAMP
         )
+        CLUSTER BY (created_at)
     """).collect()
+    session.sql("ALTER TABLE logs CLUSTER BY (created_at)").collect()
+    setattr(session, _LOGS_TABLE_READY, True)
+
+def generate_notification_id() -> int:
+    """
+    Generates a unique, time-ordered notification ID on the client.
+    
+    The ID holds the current time in milliseconds in its upper bits and 22 random bits
+    below, so it fits a signed 64-bit integer, sorts like created_at and is safe to
+    allocate from concurrent app sessions without a round trip.
+    
+    Returns:
+        int: New notification ID
+    """
+    return (int(time.time() * 1000) << 22) | secrets.randbits(22)
 
 def add_notification_entry(session: Session, operation_type: str, status: str, details: str) -> int:
     """
     Adds a new notification entry to the notification table.
     
+    The ID is generated on the client and inserted explicitly, so the entry is created
+    in a single statement and concurrent launches cannot pick up each other's IDs. The
+    entry is owned by this app process, which keeps its heartbeat fresh while the job lives.
+    An in-progress entry counts as live in this process until a job takes it over or its
+    final status is set, so reconcile never settles a running synchronous operation.
+    
     Args:
         session (Session): Active Snowflake session object
         operation_type (str): Type of operation being performed
@@ -56,9 +165,6 @@ def add_notification_entry(session: Session, operation_type: str, status: str, d
         
     Returns:
         int: ID of the newly created notification entry
-        
-    Raises:
-        Exception: If notification ID retrieval fails
     """
     if not operation_type:
         operation_type = "Unknown Operation"
@@ -68,35 +174,30 @@ def add_notification_entry(session: Session, operation_type: str, status: str, d
         details = "No details provided"
 
     create_notification_table(session)
-    # Insert the notification entry
+    notification_id = generate_notification_id()
+    # Insert the notification entry under its pre-allocated ID
     insert_query = f"""
-        INSERT INTO notification (operation_type, status, created_at, details)
-        VALUES ('{operation_type}', '{status}', CURRENT_TIMESTAMP, '{details}')
-    """
-    session.sql(insert_query).collect()
-
-    # Fetch the last inserted notification ID based on created_at
-    id_query = """
-        SELECT id FROM notification
-        WHERE created_at = (
-            SELECT MAX(created_at) FROM notification
+        INSERT INTO notification (id, operation_type, status, created_at, updated_at, details, owner_process, heartbeat_at)
+        VALUES (
+            {notification_id}, '{operation_type}', '{status}', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, '{details}',
+            '{APP_PROCESS_ID}', CURRENT_TIMESTAMP
         )
     """
-    
-    result = session.sql(id_query).collect()
+    session.sql(insert_query).collect()
+    if status == "In-Progress":
+        with _untracked_notifications_lock:
+            _untracked_notifications[notification_id] = session
 
-    # Return the notification ID
-    if result:
-        notification_id = result[0]["ID"]
-        print(f"Inserted notification ID: {notification_id}")
-        return notification_id
-    else:
-        raise Exception("Failed to retrieve notification ID")
+    print(f"Inserted notification ID: {notification_id}")
+    return notification_id
 
 def update_notification_entry(session: Session, notification_id: int, status: str):
     """
     Updates the status and completion time of an existing notification entry.
     
+    Cancelled entries keep their status, so a job winding down after a cancellation
+    cannot overwrite it.
+    
     Args:
         session (Session): Active Snowflake session object
         notification_id (int): ID of the notification to update
@@ -107,10 +208,11 @@ def update_notification_entry(session: Session, notification_id: int, status: st
 
     query = f"""
         UPDATE notification
-        SET status = '{status}', completed_at = CURRENT_TIMESTAMP
-        WHERE id = {notification_id}
+        SET status = '{status}', completed_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+        WHERE id = {notification_id} AND status <> 'Cancelled'
     """
     session.sql(query).collect()
+    release_notification(notification_id)
 
 def update_notification_fine_tune_entry(session: Session, notification_id: int, details: str):
     """
@@ -126,11 +228,373 @@ def update_notification_fine_tune_entry(session: Session, notification_id: int,
 
     query = f"""
         UPDATE notification
-        SET details = '{details}', completed_at = CURRENT_TIMESTAMP
+        SET details = '{details}', completed_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
         WHERE id = {notification_id}
     """
     session.sql(query).collect()
 
+def update_notification_details(session: Session, notification_id: int, details: str):
+    """
+    Updates the details of a running notification entry without completing it.
+    
+    Args:
+        session (Session): Active Snowflake session object
+        notification_id (int): ID of the notification to update
+        details (str): New details describing the progress of the operation
+    """
+    if not details:
+        details = 'No details provided'
+
+    query = f"""
+        UPDATE notification
+        SET details = '{escape_sql_string(details)}', updated_at = CURRENT_TIMESTAMP
+        WHERE id = {notification_id}
+    """
+    session.sql(query).collect()
+
+def update_notification_progress(session: Session, notification_id: int, rows_processed: int, rows_total: int, details: str = None, pending_batches: int = 0):
+    """
+    Records the progress of a running operation on its notification entry.
+    
+    Args:
+        session (Session): Active Snowflake session object
+        notification_id (int): ID of the notification to update
+        rows_processed (int): Number of rows (or files) processed so far
+        rows_total (int): Total number of rows (or files) the operation processes
+        details (str, optional): New details describing the progress of the operation
+        pending_batches (int, optional): Number of batches not submitted to Snowflake yet
+    """
+    details_sql = f", details = '{escape_sql_string(details)}'" if details else ""
+    query = f"""
+        UPDATE notification
+        SET rows_processed = {int(rows_processed)}, rows_total = {int(rows_total)},
+            pending_batches = {int(pending_batches)},
+            progress_updated_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP{details_sql}
+        WHERE id = {notification_id}
+    """
+    session.sql(query).collect()
+
+def add_notification_query_id(session: Session, notification_id: int, query_id: str):
+    """
+    Records a Snowflake query ID issued by the operation of a notification entry.
+    
+    The query IDs let the app reattach to the operation's queries after a restart.
+    
+    Args:
+        session (Session): Active Snowflake session object
+        notification_id (int): ID of the notification to update
+        query_id (str): Snowflake query ID
+    """
+    query = f"""
+        UPDATE notification
+        SET query_ids = IFF(query_ids IS NULL, '{query_id}', query_ids || ',' || '{query_id}'),
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = {notification_id}
+    """
+    session.sql(query).collect()
+
+def mark_notification_started(session: Session, notification_id: int):
+    """
+    Records when the first job of an operation left the queue and started running.
+    
+    Throughput and ETA are measured from then, so time spent waiting for a worker does not
+    count. Later jobs of the same operation, such as pipeline steps, keep the first start.
+    
+    Args:
+        session (Session): Active Snowflake session object
+        notification_id (int): ID of the notification to update
+    """
+    session.sql(f"""
+        UPDATE notification
+        SET started_at = COALESCE(started_at, CURRENT_TIMESTAMP), updated_at = CURRENT_TIMESTAMP
+        WHERE id = {notification_id}
+    """).collect()
+
+def heartbeat_notifications(session: Session, notification_ids):
+    """
+    Marks in-progress notification entries as driven by this app process.
+    
+    Other app processes leave entries with a fresh heartbeat to their owner when they
+    reconcile, so queued jobs and jobs between batches are not settled under them.
+    
+    Args:
+        session (Session): Active Snowflake session object
+        notification_ids (iterable): IDs of the notifications whose jobs live in this process
+    """
+    ids = ", ".join(str(int(notification_id)) for notification_id in notification_ids)
+    if not ids:
+        return
+    session.sql(f"""
+        UPDATE notification
+        SET owner_process = '{APP_PROCESS_ID}', heartbeat_at = CURRENT_TIMESTAMP
+        WHERE id IN ({ids}) AND status = 'In-Progress'
+    """).collect()
+
+def is_notification_cancelled(session: Session, notification_id: int) -> bool:
+    """
+    Checks whether a notification entry has been cancelled, possibly from another app process.
+    
+    Args:
+        session (Session): Active Snowflake session object
+        notification_id (int): ID of the notification to check
+        
+    Returns:
+        bool: True if the entry is Cancelled
+    """
+    result = session.sql(f"SELECT status FROM notification WHERE id = {notification_id}").collect()
+    return bool(result) and result[0]["STATUS"] == "Cancelled"
+
+def cancel_notification(session: Session, notification_id: int):
+    """
+    Cancels the Snowflake queries of an in-progress operation and marks it Cancelled.
+    
+    Every tracked query is cancelled with SYSTEM$CANCEL_QUERY (finished queries are not
+    affected) and the entry records how much work was done before the cancellation.
+    
+    Args:
+        session (Session): Active Snowflake session object
+        notification_id (int): ID of the notification to cancel
+    """
+    entry = session.sql(f"""
+        SELECT query_ids FROM notification
+        WHERE id = {notification_id} AND status = 'In-Progress'
+    """).collect()
+    if not entry:
+        return
+
+    query_ids = entry[0]["QUERY_IDS"].split(",") if entry[0]["QUERY_IDS"] else []
+    for query_id in query_ids:
+        session.sql(f"SELECT SYSTEM$CANCEL_QUERY('{query_id}')").collect()
+
+    query = f"""
+        UPDATE notification
+        SET status = 'Cancelled', completed_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP,
+            details = details || IFF(
+                rows_total IS NULL, ' (cancelled)',
+                ' (cancelled after ' || COALESCE(rows_processed, 0) || ' of ' || rows_total || ')'
+            )
+        WHERE id = {notification_id} AND status = 'In-Progress'
+    """
+    session.sql(query).collect()
+    release_notification(notification_id)
+
+def reconcile_notifications(session: Session, live_notification_ids=(), heartbeat_timeout: int = 120):
+    """
+    Settles in-progress notification entries whose operation is no longer driven by an app process.
+    
+    An entry is only settled if this process owns it and no longer runs its job, or if the
+    heartbeat of its owning process is older than heartbeat_timeout, as the owner stopped.
+    Entries of other live processes are left alone, including their queued jobs and jobs
+    between batches.
+    
+    Operations run as Snowflake queries whose IDs are stored on the notification entry. The
+    final status is derived from those queries: the entry stays In-Progress while any query
+    runs, becomes Failed if a query failed or batches were never submitted because the app
+    stopped, and Success otherwise. Entries without tracked queries were interrupted before
+    reaching Snowflake and are marked Failed.
+    
+    Entries of synchronous operations still running in this process (see
+    untracked_notifications) are never settled either.
+    
+    Args:
+        session (Session): Active Snowflake session object
+        live_notification_ids (iterable, optional): IDs of notifications whose jobs are still
+            queued or running in this process and must not be settled
+        heartbeat_timeout (int, optional): Seconds without a heartbeat after which the owning
+            process counts as stopped. Defaults to 120.
+    """
+    create_notification_table(session)
+    entries = session.sql(f"""
+        SELECT id, operation_type, query_ids, pending_batches
+        FROM notification
+        WHERE status = 'In-Progress' AND (
+            owner_process IS NULL OR owner_process = '{APP_PROCESS_ID}' OR heartbeat_at IS NULL
+            OR heartbeat_at < DATEADD(second, -{int(heartbeat_timeout)}, CURRENT_TIMESTAMP)
+        )
+    """).collect()
+
+    live_notification_ids = set(live_notification_ids) | set(untracked_notifications())
+    for entry in entries:
+        if entry["ID"] in live_notification_ids:
+            continue
+
+        query_ids = entry["QUERY_IDS"].split(",") if entry["QUERY_IDS"] else []
+        if not query_ids:
+            update_notification_entry(session, entry["ID"], "Failed")
+            add_log_entry(session, entry["OPERATION_TYPE"], "Interrupted by an app restart before reaching Snowflake")
+            continue
+
+        jobs = [session.create_async_job(query_id) for query_id in query_ids]
+        if not all(job.is_done() for job in jobs):
+            continue
+
+        errors = []
+        for job in jobs:
+            try:
+                job.result("no_result")
+            except Exception as e:
+                errors.append(str(e))
+        if not errors and entry["PENDING_BATCHES"]:
+            errors.append(f"Interrupted by an app restart with {entry['PENDING_BATCHES']} batches left")
+
+        for error in errors:
+            add_log_entry(session, entry["OPERATION_TYPE"], error)
+        update_notification_entry(session, entry["ID"], "Failed" if errors else "Success")
+
+def fetch_settled_notification_ids(session: Session, notification_ids) -> set:
+    """
+    Returns which of the given notification entries are no longer in progress.
+    
+    Entries that no longer exist count as settled, so nothing waits on them forever.
+    
+    Args:
+        session (Session): Active Snowflake session object
+        notification_ids (iterable): IDs of the notification entries to check
+        
+    Returns:
+        set: IDs of the entries with a final status or without an entry
+    """
+    notification_ids = {int(notification_id) for notification_id in notification_ids}
+    if not notification_ids:
+        return set()
+    rows = session.sql(f"""
+        SELECT id FROM notification
+        WHERE id IN ({", ".join(map(str, notification_ids))}) AND status = 'In-Progress'
+    """).collect()
+    return notification_ids - {row["ID"] for row in rows}
+
+def display_running_jobs(session: Session, notifications):
+    """
+    Displays every in-progress notification with a Cancel button, its queue position while
+    it waits for a worker, and a progress bar with throughput and ETA once it reports progress.
+    
+    Args:
+        session (Session): Active Snowflake session object
+        notifications (pandas.DataFrame): In-progress notification entries of the job feed
+    """
+    from src.jobs import cancel_job, get_job_executor
+
+    executor = get_job_executor()
+
+    running = notifications[notifications["STATUS"] == "In-Progress"]
+    for _, job in running.iterrows():
+        col1, col2 = st.columns([9, 1])
+        text = f"#{job['ID']} {job['OPERATION_TYPE']}"
+        with col1:
+            position = executor.queue_position(job["ID"])
+            if position:
+                st.write(f"{text}: Queued, position {position[0]} of {position[1]}")
+            elif job["ROWS_TOTAL"] > 0:
+                processed = int(job["ROWS_PROCESSED"] or 0)
+                total = int(job["ROWS_TOTAL"])
+                text += f": {processed:,}/{total:,}"
+
+                # Measured from the job's start, not from its submission, so queueing does not count
+                started_at = job["STARTED_AT"] if pd.notna(job.get("STARTED_AT")) else job["CREATED_AT"]
+                elapsed = (job["PROGRESS_UPDATED_AT"] - started_at).total_seconds()
+                if processed and elapsed > 0:
+                    throughput = processed / elapsed
+                    eta = timedelta(seconds=int((total - processed) / throughput))
+                    text += f" · {throughput:.1f}/s · ETA {eta}"
+                st.progress(min(processed / total, 1.0), text=text)
+            else:
+                st.write(f"{text}: {job['DETAILS']}")
+        with col2:
+            if st.button("Cancel", key=f"cancel_{job['ID']}", help="Cancel the running queries of this job"):
+                try:
+                    cancel_job(session, job["ID"])
+                    st.success(f"Job #{job['ID']} cancelled.")
+                except Exception as e:
+                    st.error(f"Failed to cancel job #{job['ID']}: {e}")
+
+class NotificationBus:
+    """
+    In-memory channel of messages for the app's users.
+    
+    UI code and background jobs publish messages without waiting on anything; each app
+    session drains the messages meant for it on its next render and shows them as toasts.
+    """
+
+    def __init__(self, max_messages: int = 500):
+        """
+        Initialize the bus.
+        
+        Args:
+            max_messages (int, optional): Number of messages kept. Defaults to 500.
+        """
+        self._lock = threading.Lock()
+        self._messages = deque(maxlen=max_messages)
+        self._message_ids = itertools.count(1)
+
+    def publish(self, message: str, toast_type: str = "info", owner: str = None):
+        """
+        Publishes a message.
+        
+        Args:
+            message (str): Text of the message
+            toast_type (str, optional): Type of toast ("info", "success", "warning", "error"). Defaults to "info".
+            owner (str, optional): Key of the app session the message is for; None for all sessions
+        """
+        with self._lock:
+            self._messages.append({
+                "message_id": next(self._message_ids),
+                "message": message,
+                "toast_type": toast_type,
+                "owner": owner
+            })
+
+    def messages_since(self, message_id: int, owner: str = None) -> list:
+        """
+        Returns the messages published after message_id for an app session.
+        
+        Args:
+            message_id (int): ID of the last message already seen (0 for all)
+            owner (str, optional): Key of the app session; broadcast messages are always included
+            
+        Returns:
+            list: Message dictionaries ordered by message ID
+        """
+        with self._lock:
+            return [
+                message for message in self._messages
+                if message["message_id"] > message_id and message["owner"] in (None, owner)
+            ]
+
+_notification_bus = NotificationBus()
+
+def publish_message(message: str, toast_type: str = "info", owner: str = None):
+    """
+    Publishes a message to the notification bus. Safe to call from any thread.
+    
+    Args:
+        message (str): Text of the message
+        toast_type (str, optional): Type of toast ("info", "success", "warning", "error"). Defaults to "info".
+        owner (str, optional): Key of the app session the message is for; None for all sessions
+    """
+    _notification_bus.publish(message, toast_type, owner)
+
+def display_messages(owner: str):
+    """
+    Shows the messages published for an app session since its last render as toasts.
+    
+    Args:
+        owner (str): Key of the app session
+    """
+    from src.utils import TOAST_ICONS
+
+    last_message_id = st.session_state.get("last_message_id", 0)
+    if not last_message_id:
+        # A new session starts from the current end of the bus instead of replaying it
+        messages = _notification_bus.messages_since(0, owner)
+        last_message_id = messages[-1]["message_id"] if messages else 0
+        messages = [message for message in messages if message["owner"] == owner]
+    else:
+        messages = _notification_bus.messages_since(last_message_id, owner)
+    for message in messages:
+        st.toast(message["message"], icon=TOAST_ICONS.get(message["toast_type"], TOAST_ICONS["info"]))
+        last_message_id = message["message_id"]
+    st.session_state.last_message_id = last_message_id
+
 def escape_sql_string(value: str) -> str:
     """
     Escapes single quotes in SQL strings to prevent SQL injection.
@@ -143,10 +607,105 @@ def escape_sql_string(value: str) -> str:
     """
     return value.replace("'", "''") if value else value
 
+class LogSink:
+    """
+    Buffers log entries in memory and writes them to the logs table on a background thread.
+    
+    Entries are flushed in multi-row INSERTs once flush_size of them are waiting or the
+    oldest has waited flush_interval seconds, so callers never wait on Snowflake. Pending
+    entries are also flushed at interpreter shutdown. created_at is Snowflake's
+    CURRENT_TIMESTAMP at the flush, less the time the entry waited, so log entries share the
+    clock of the notification entries.
+    """
+
+    def __init__(self, flush_size: int = 50, flush_interval: float = 2.0):
+        """
+        Initialize the sink. The flush thread starts with the first entry.
+        
+        Args:
+            flush_size (int, optional): Number of waiting entries that triggers a flush. Defaults to 50.
+            flush_interval (float, optional): Maximum seconds an entry waits. Defaults to 2.0.
+        """
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._condition = threading.Condition()
+        self._pending = []
+        self._oldest = None
+        self._thread = None
+        self._flush_lock = threading.Lock()
+
+    def add(self, session: Session, operation_type: str, error_message: str):
+        """
+        Queues a log entry without waiting for it to be written.
+        
+        Args:
+            session (Session): Session used to write the entry
+            operation_type (str): Type of operation that generated the error
+            error_message (str): Description of the error that occurred
+        """
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="log-sink", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.append((session, operation_type, error_message, time.monotonic()))
+            if len(self._pending) >= self.flush_size:
+                self._condition.notify()
+
+    def flush(self):
+        """
+        Writes all waiting entries, one multi-row INSERT per session and batch of flush_size.
+        """
+        with self._flush_lock:
+            with self._condition:
+                entries, self._pending = self._pending, []
+            by_session = {}
+            flushed_at = time.monotonic()
+            for session, operation_type, error_message, queued_at in entries:
+                waited_microseconds = int((flushed_at - queued_at) * 1_000_000)
+                by_session.setdefault(id(session), (session, []))[1].append(
+                    f"('{escape_sql_string(operation_type)}', '{escape_sql_string(error_message)}', "
+                    f"DATEADD(microsecond, -{waited_microseconds}, CURRENT_TIMESTAMP))"
+                )
+            for session, rows in by_session.values():
+                try:
+                    create_logs_table(session)
+                    for start in range(0, len(rows), self.flush_size):
+                        session.sql(f"""
+                            INSERT INTO logs (operation_type, error_message, created_at)
+                            VALUES {", ".join(rows[start:start + self.flush_size])}
+                        """).collect()
+                except Exception as e:
+                    # The logs table is the error channel itself, so fall back to stdout
+                    print(f"Failed to write {len(rows)} log entries: {e}")
+                    for row in rows:
+                        print(f"Log entry: {row}")
+
+    def _run(self):
+        """Flush loop: waits for a full batch or for the oldest entry to expire."""
+        while True:
+            with self._condition:
+                while len(self._pending) < self.flush_size:
+                    if self._pending:
+                        remaining = self._oldest + self.flush_interval - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    else:
+                        self._condition.wait()
+            self.flush()
+
+_log_sink = LogSink()
+
 def add_log_entry(session: Session, operation_type: str, error_message: str):
     """
     Adds a new error log entry to the logs table.
     
+    The entry is buffered and written in the background by the log sink, so this call
+    never waits on Snowflake.
+    
     Args:
         session (Session): Active Snowflake session object
         operation_type (str): Type of operation that generated the error
@@ -157,84 +716,484 @@ def add_log_entry(session: Session, operation_type: str, error_message: str):
     if not error_message:
         error_message = "No error message provided"
 
-    # Escape special characters to prevent SQL issues
-    operation_type_escaped = escape_sql_string(operation_type)
-    error_message_escaped = escape_sql_string(error_message)
-    create_logs_table(session)
-    # Construct the SQL query with escaped values
-    query = f"""
-        INSERT INTO logs (operation_type, error_message, created_at)
-        VALUES ('{operation_type_escaped}', '{error_message_escaped}', CURRENT_TIMESTAMP)
+    _log_sink.add(session, operation_type, error_message)
+
+def flush_log_entries():
     """
-    
-    # Execute the query
-    session.sql(query).collect()
+    Writes the buffered log entries immediately, e.g. before the logs are displayed.
+    """
+    _log_sink.flush()
 
-def fetch_notifications(session: Session, start_date=None, end_date=None):
+def build_filter_clause(start_date=None, end_date=None, status=None, operation_type=None) -> str:
     """
-    Retrieves notification entries filtered by date range.
+    Builds the WHERE conditions shared by the notification and log queries.
     
     Args:
-        session (Session): Active Snowflake session object
-        start_date (datetime, optional): Start date for filtering notifications
-        end_date (datetime, optional): End date for filtering notifications
+        start_date (datetime, optional): Start date for filtering entries
+        end_date (datetime, optional): End date for filtering entries
+        status (str, optional): Only include entries with this status
+        operation_type (str, optional): Only include entries of this operation type
         
     Returns:
-        pandas.DataFrame: DataFrame containing filtered notification entries
+        str: Conditions joined with AND, or TRUE if there are none
     """
-    create_notification_table(session)
+    conditions = []
     if start_date and end_date:
         # Format the dates properly for Snowflake SQL
         start_date_str = start_date.strftime('%Y-%m-%d')
         end_date_str = end_date.strftime('%Y-%m-%d')
+        conditions.append(f"created_at BETWEEN '{start_date_str}' AND '{end_date_str}'")
+    if status:
+        conditions.append(f"COALESCE(status, 'Unknown Status') = '{escape_sql_string(status)}'")
+    if operation_type:
+        conditions.append(f"COALESCE(operation_type, 'Unknown Operation') = '{escape_sql_string(operation_type)}'")
+    return " AND ".join(conditions) or "TRUE"
+
+def fetch_page(session: Session, table: str, filters: str, before=None, page_size: int = 50):
+    """
+    Retrieves one page of entries, newest first, using keyset pagination on (created_at, id).
+    
+    Args:
+        session (Session): Active Snowflake session object
+        table (str): Table to read, notification or logs
+        filters (str): WHERE conditions as built by build_filter_clause
+        before (tuple, optional): (created_at, id) of the last entry of the previous page
+        page_size (int, optional): Number of entries per page. Defaults to 50.
         
-        query = f"""
-            SELECT * FROM notification
-            WHERE created_at BETWEEN '{start_date_str}' AND '{end_date_str}'
-            ORDER BY created_at DESC
+    Returns:
+        tuple: (pandas.DataFrame of at most page_size entries, whether older entries exist)
+    """
+    if before:
+        created_at, entry_id = before
+        created_at_str = created_at.strftime('%Y-%m-%d %H:%M:%S.%f')
+        filters += f"""
+            AND (created_at < '{created_at_str}' OR (created_at = '{created_at_str}' AND id < {entry_id}))
         """
-    else:
-        query = "SELECT * FROM notification ORDER BY created_at DESC"
+    query = f"""
+        SELECT * FROM {table}
+        WHERE {filters}
+        ORDER BY created_at DESC, id DESC
+        LIMIT {page_size + 1}
+    """
+    page = session.sql(query).to_pandas()
+    return page.head(page_size), len(page) > page_size
+
+def fetch_notifications(session: Session, start_date=None, end_date=None, status=None, operation_type=None, before=None, page_size: int = 50):
+    """
+    Retrieves one page of notification entries matching the filters.
     
-    return session.sql(query).to_pandas()
+    Args:
+        session (Session): Active Snowflake session object
+        start_date (datetime, optional): Start date for filtering notifications
+        end_date (datetime, optional): End date for filtering notifications
+        status (str, optional): Only include notifications with this status
+        operation_type (str, optional): Only include notifications of this operation type
+        before (tuple, optional): (created_at, id) of the last entry of the previous page
+        page_size (int, optional): Number of entries per page. Defaults to 50.
+        
+    Returns:
+        tuple: (pandas.DataFrame of notification entries, whether older entries exist)
+    """
+    create_notification_table(session)
+    filters = build_filter_clause(start_date, end_date, status, operation_type)
+    return fetch_page(session, "notification", filters, before, page_size)
 
-def fetch_logs(session: Session, start_date=None, end_date=None):
+def fetch_logs(session: Session, start_date=None, end_date=None, operation_type=None, before=None, page_size: int = 50):
     """
-    Retrieves log entries filtered by date range.
+    Retrieves one page of log entries matching the filters.
     
     Args:
         session (Session): Active Snowflake session object
         start_date (datetime, optional): Start date for filtering logs
         end_date (datetime, optional): End date for filtering logs
+        operation_type (str, optional): Only include logs of this operation type
+        before (tuple, optional): (created_at, id) of the last entry of the previous page
+        page_size (int, optional): Number of entries per page. Defaults to 50.
         
     Returns:
-        pandas.DataFrame: DataFrame containing filtered log entries
+        tuple: (pandas.DataFrame of log entries, whether older entries exist)
     """
+    # Show entries still waiting in the log sink as well
+    flush_log_entries()
     create_logs_table(session)
-    if start_date and end_date:
-        # Format the dates properly for Snowflake SQL
-        start_date_str = start_date.strftime('%Y-%m-%d')
-        end_date_str = end_date.strftime('%Y-%m-%d')
+    filters = build_filter_clause(start_date, end_date, operation_type=operation_type)
+    return fetch_page(session, "logs", filters, before, page_size)
+
+def summarize_entries(session: Session, table: str, start_date=None, end_date=None) -> dict:
+    """
+    Counts the entries in a date range by operation type and, for notifications, by status.
+    
+    Missing values are counted as 'Unknown Operation' and 'Unknown Status', the defaults
+    of add_log_entry and update_notification_entry, so the keys always sort.
+    
+    Args:
+        session (Session): Active Snowflake session object
+        table (str): Table to count, notification or logs
+        start_date (datetime, optional): Start date for filtering entries
+        end_date (datetime, optional): End date for filtering entries
         
-        query = f"""
-            SELECT * FROM logs
-            WHERE created_at BETWEEN '{start_date_str}' AND '{end_date_str}'
-            ORDER BY created_at DESC
-        """
+    Returns:
+        dict: Counts with keys (operation_type, status); status is None for logs
+    """
+    status = "COALESCE(status, 'Unknown Status')" if table == "notification" else "NULL"
+    query = f"""
+        SELECT COALESCE(operation_type, 'Unknown Operation') AS operation_type, {status} AS status, COUNT(*) AS count
+        FROM {table}
+        WHERE {build_filter_clause(start_date, end_date)}
+        GROUP BY 1, 2
+    """
+    return {(row["OPERATION_TYPE"], row["STATUS"]): row["COUNT"] for row in session.sql(query).collect()}
+
+def fetch_notification_changes(session: Session, since=None, hours: int = 24):
+    """
+    Retrieves the notification entries changed since a watermark.
+    
+    Changes are read with a few seconds of overlap, so rows committed slightly out of
+    order are not missed; callers merge the result by ID. Without a watermark, the
+    in-progress entries and those changed in the last hours are returned.
+    
+    Args:
+        session (Session): Active Snowflake session object
+        since (datetime, optional): Highest updated_at seen so far
+        hours (int, optional): Window of the initial load in hours. Defaults to 24.
+        
+    Returns:
+        pandas.DataFrame: Changed notification entries
+    """
+    if since is not None:
+        since_str = since.strftime('%Y-%m-%d %H:%M:%S.%f')
+        condition = f"updated_at >= DATEADD(second, -5, '{since_str}'::TIMESTAMP)"
     else:
-        query = "SELECT * FROM logs ORDER BY created_at DESC"
+        condition = f"status = 'In-Progress' OR updated_at >= DATEADD(hour, -{int(hours)}, CURRENT_TIMESTAMP)"
+    return session.sql(f"SELECT * FROM notification WHERE {condition}").to_pandas()
+
+def refresh_notification_feed(session: Session) -> pd.DataFrame:
+    """
+    Merges the notification changes since the last refresh into the feed cached in the session state.
+    
+    Entries that are no longer in progress drop out of the feed once they leave the
+    notification_feed_hours window.
+    
+    Args:
+        session (Session): Active Snowflake session object
+        
+    Returns:
+        pandas.DataFrame: Feed entries, newest first
+    """
+    hours = config["default_settings"]["notification_feed_hours"]
+    frame = st.session_state.get("notification_feed")
+    watermark = st.session_state.get("notification_feed_watermark")
+    changes = fetch_notification_changes(session, watermark if frame is not None else None, hours)
+
+    if frame is None:
+        frame = changes
+    elif not changes.empty:
+        frame = pd.concat([frame[~frame["ID"].isin(changes["ID"])], changes], ignore_index=True)
+    # Entries written before updated_at existed have no timestamp and cannot move the watermark
+    if not frame.empty and not pd.isna(frame["UPDATED_AT"].max()):
+        watermark = frame["UPDATED_AT"].max()
+        cutoff = watermark - timedelta(hours=hours)
+        frame = frame[(frame["STATUS"] == "In-Progress") | (frame["UPDATED_AT"] >= cutoff)]
+        frame = frame.sort_values("CREATED_AT", ascending=False, ignore_index=True)
+
+    st.session_state.notification_feed = frame
+    st.session_state.notification_feed_watermark = watermark
+    return frame
+
+def display_job_feed(session: Session):
+    """
+    Displays running and recently finished jobs, refreshed incrementally in the background.
     
+    The feed is a fragment re-run every notification_feed_fast_interval seconds while jobs
+    are in progress and every notification_feed_idle_interval seconds otherwise. Each
+    refresh only fetches the entries changed since the previous one. While jobs are in
+    progress, the feed also reconciles them at most every notification_feed_reconcile_interval
+    seconds, so jobs detached to Snowflake settle without a full page rerun.
+    
+    Args:
+        session (Session): Active Snowflake session object
+    """
+    defaults = config["default_settings"]
+    fast_interval = defaults["notification_feed_fast_interval"]
+    idle_interval = defaults["notification_feed_idle_interval"]
+    reconcile_interval = defaults["notification_feed_reconcile_interval"]
+    fragment = getattr(st, "fragment", None) or st.experimental_fragment
+
+    @fragment(run_every=st.session_state.get("notification_feed_interval", idle_interval))
+    def feed():
+        from src.jobs import reconcile_jobs
+
+        # Settled entries get a new updated_at, so the refresh below picks them up
+        last_reconciled = st.session_state.get("notification_feed_reconciled_at", 0)
+        if (
+            st.session_state.get("notification_feed_interval") == fast_interval
+            and time.monotonic() - last_reconciled >= reconcile_interval
+        ):
+            st.session_state.notification_feed_reconciled_at = time.monotonic()
+            reconcile_jobs(session)
+        frame = refresh_notification_feed(session)
+        running = frame[frame["STATUS"] == "In-Progress"] if not frame.empty else frame
+
+        # The interval of a fragment is fixed when it is defined, so switching re-runs the page
+        interval = fast_interval if not running.empty else idle_interval
+        if st.session_state.get("notification_feed_interval", idle_interval) != interval:
+            st.session_state.notification_feed_interval = interval
+            st.rerun()
+
+        if not running.empty:
+            display_running_jobs(session, running)
+        finished = frame[frame["STATUS"] != "In-Progress"] if not frame.empty else frame
+        if not finished.empty:
+            st.caption("Recently finished")
+            st.dataframe(
+                finished[["ID", "OPERATION_TYPE", "STATUS", "COMPLETED_AT", "DETAILS"]].head(10),
+                hide_index=True
+            )
+
+    feed()
+
+RETENTION_TASK = "notification_retention"
+
+def create_rollup_tables(session: Session):
+    """
+    Creates the daily roll-up tables that keep aggregates of purged notifications and logs.
+    
+    Args:
+        session (Session): Active Snowflake session object
+    """
+    session.sql("""
+        CREATE TABLE IF NOT EXISTS notification_daily (
+            day DATE,
+            operation_type STRING,
+            entries NUMBER,
+            failures NUMBER,
+            cancellations NUMBER,
+            completed NUMBER,
+            total_duration_seconds NUMBER,
+            max_duration_seconds NUMBER
+        )
+    """).collect()
+    session.sql("""
+        CREATE TABLE IF NOT EXISTS logs_daily (
+            day DATE,
+            operation_type STRING,
+            entries NUMBER
+        )
+    """).collect()
+
+def get_retention_script(notification_days: int, logs_days: int) -> str:
+    """
+    Builds the Snowflake Scripting block that rolls up and purges expired entries.
+    
+    Settled notifications older than notification_days and logs older than logs_days are
+    merged into the daily roll-up tables and deleted in one transaction, using a single
+    cutoff per table so no row is deleted without being counted. In-progress entries are
+    never purged.
+    
+    Args:
+        notification_days (int): Days notification entries are kept
+        logs_days (int): Days log entries are kept
+        
+    Returns:
+        str: EXECUTE IMMEDIATE statement, usable directly or as a task body
+    """
+    return f"""
+    EXECUTE IMMEDIATE $$
+    DECLARE
+        notification_cutoff TIMESTAMP DEFAULT DATEADD(day, -{int(notification_days)}, CURRENT_TIMESTAMP);
+        logs_cutoff TIMESTAMP DEFAULT DATEADD(day, -{int(logs_days)}, CURRENT_TIMESTAMP);
+    BEGIN
+        BEGIN TRANSACTION;
+        MERGE INTO notification_daily t USING (
+            SELECT created_at::DATE AS day, operation_type,
+                COUNT(*) AS entries,
+                COUNT_IF(status = 'Failed') AS failures,
+                COUNT_IF(status = 'Cancelled') AS cancellations,
+                COUNT(completed_at) AS completed,
+                COALESCE(SUM(DATEDIFF(second, created_at, completed_at)), 0) AS total_duration_seconds,
+                COALESCE(MAX(DATEDIFF(second, created_at, completed_at)), 0) AS max_duration_seconds
+            FROM notification
+            WHERE created_at < :notification_cutoff AND COALESCE(status, '') <> 'In-Progress'
+            GROUP BY 1, 2
+        ) s
+        ON t.day = s.day AND EQUAL_NULL(t.operation_type, s.operation_type)
+        WHEN MATCHED THEN UPDATE SET
+            entries = t.entries + s.entries,
+            failures = t.failures + s.failures,
+            cancellations = t.cancellations + s.cancellations,
+            completed = t.completed + s.completed,
+            total_duration_seconds = t.total_duration_seconds + s.total_duration_seconds,
+            max_duration_seconds = GREATEST(t.max_duration_seconds, s.max_duration_seconds)
+        WHEN NOT MATCHED THEN INSERT
+            (day, operation_type, entries, failures, cancellations, completed, total_duration_seconds, max_duration_seconds)
+            VALUES (s.day, s.operation_type, s.entries, s.failures, s.cancellations, s.completed,
+                    s.total_duration_seconds, s.max_duration_seconds);
+        DELETE FROM notification WHERE created_at < :notification_cutoff AND COALESCE(status, '') <> 'In-Progress';
+
+        MERGE INTO logs_daily t USING (
+            SELECT created_at::DATE AS day, operation_type, COUNT(*) AS entries
+            FROM logs
+            WHERE created_at < :logs_cutoff
+            GROUP BY 1, 2
+        ) s
+        ON t.day = s.day AND EQUAL_NULL(t.operation_type, s.operation_type)
+        WHEN MATCHED THEN UPDATE SET entries = t.entries + s.entries
+        WHEN NOT MATCHED THEN INSERT (day, operation_type, entries) VALUES (s.day, s.operation_type, s.entries);
+        DELETE FROM logs WHERE created_at < :logs_cutoff;
+        COMMIT;
+    END;
+    $$
+    """
+
+def apply_retention(session: Session):
+    """
+    Rolls up and purges the expired notification and log entries now.
+    
+    Args:
+        session (Session): Active Snowflake session object
+    """
+    defaults = config["default_settings"]
+    create_notification_table(session)
+    create_logs_table(session)
+    create_rollup_tables(session)
+    session.sql(get_retention_script(
+        defaults["notification_retention_days"], defaults["logs_retention_days"]
+    )).collect()
+
+def schedule_retention_task(session: Session):
+    """
+    Creates (or replaces) and resumes the task that applies the retention policy on a schedule.
+    
+    Args:
+        session (Session): Active Snowflake session object
+    """
+    defaults = config["default_settings"]
+    create_notification_table(session)
+    create_logs_table(session)
+    create_rollup_tables(session)
+    session.sql(f"""
+        CREATE OR REPLACE TASK {RETENTION_TASK}
+        WAREHOUSE = {config["warehouse"]}
+        SCHEDULE = '{defaults["retention_schedule"]}'
+        AS
+        {get_retention_script(defaults["notification_retention_days"], defaults["logs_retention_days"])}
+    """).collect()
+    session.sql(f"ALTER TASK {RETENTION_TASK} RESUME").collect()
+
+def fetch_notification_rollup(session: Session, days: int = 90):
+    """
+    Retrieves the daily roll-up of purged notifications with failure rates and durations.
+    
+    Args:
+        session (Session): Active Snowflake session object
+        days (int, optional): Number of days to include. Defaults to 90.
+        
+    Returns:
+        pandas.DataFrame: One row per day and operation type, newest first
+    """
+    create_rollup_tables(session)
+    query = f"""
+        SELECT day, operation_type, entries, failures,
+            ROUND(failures / NULLIF(entries, 0), 3) AS failure_rate,
+            cancellations,
+            ROUND(total_duration_seconds / NULLIF(completed, 0), 1) AS avg_duration_seconds,
+            max_duration_seconds
+        FROM notification_daily
+        WHERE day >= DATEADD(day, -{int(days)}, CURRENT_DATE)
+        ORDER BY day DESC, operation_type
+    """
     return session.sql(query).to_pandas()
 
+def display_retention(session: Session):
+    """
+    Displays the retention policy, its controls and the roll-up of purged notifications.
+    
+    Args:
+        session (Session): Active Snowflake session object
+    """
+    defaults = config["default_settings"]
+    with st.expander("Retention"):
+        st.caption(
+            f"Notifications are kept for {defaults['notification_retention_days']} days and logs for "
+            f"{defaults['logs_retention_days']} days, then rolled up per day and operation type."
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("Apply Retention Now"):
+                try:
+                    apply_retention(session)
+                    st.success("Expired entries rolled up and purged.")
+                except Exception as e:
+                    add_log_entry(session, "Apply Retention", str(e))
+                    st.error(f"Failed to apply retention: {e}")
+        with col2:
+            if st.button("Schedule Retention Task"):
+                try:
+                    schedule_retention_task(session)
+                    st.success(f"Task {RETENTION_TASK} scheduled ({defaults['retention_schedule']}).")
+                except Exception as e:
+                    add_log_entry(session, "Schedule Retention Task", str(e))
+                    st.error(f"Failed to schedule the retention task: {e}")
+
+        if st.checkbox("Show daily roll-up", key="show_rollup"):
+            rollup = fetch_notification_rollup(session)
+            if rollup.empty:
+                st.write("No rolled-up history yet.")
+            else:
+                st.dataframe(rollup, hide_index=True)
+
+def display_page(session: Session, fetch, summary: dict, key: str, **filters):
+    """
+    Displays one page of entries with the matching count and Newer/Older buttons.
+    
+    The page cursors live in the session state and start over whenever the filters change.
+    
+    Args:
+        session (Session): Active Snowflake session object
+        fetch (callable): fetch_notifications or fetch_logs
+        summary (dict): Counts as returned by summarize_entries
+        key (str): Session state key of the page cursors
+        **filters: Filters passed on to fetch
+    """
+    state_key = f"{key}_cursors"
+    filter_key = f"{key}_filters"
+    if st.session_state.get(filter_key) != filters:
+        st.session_state[filter_key] = filters
+        st.session_state[state_key] = [None]
+    cursors = st.session_state[state_key]
+
+    page, has_more = fetch(session, before=cursors[-1], **filters)
+    total = sum(
+        count for (operation_type, status), count in summary.items()
+        if filters.get("operation_type") in (None, operation_type) and filters.get("status") in (None, status)
+    )
+    st.caption(f"Page {len(cursors)} · {total:,} matching entries")
+    if page.empty:
+        st.write("No entries available.")
+    else:
+        st.dataframe(page)
+
+    col1, col2, _ = st.columns([1, 1, 8])
+    with col1:
+        if st.button("Newer", key=f"{key}_newer", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        if st.button("Older", key=f"{key}_older", disabled=not has_more):
+            last = page.iloc[-1]
+            cursors.append((last["CREATED_AT"], last["ID"]))
+            st.rerun()
+
 def display_notification(session: Session):
     """
     Displays a Streamlit interface for viewing notifications and logs.
     
     Creates an interactive UI with:
     - Toggle between notifications and logs view
-    - Date range filtering
+    - Date range, status and operation type filtering
+    - Entry counts by status
     - Refresh button
-    - Data display in tabular format
+    - Paginated data display in tabular format
     
     Args:
         session (Session): Active Snowflake session object
@@ -258,6 +1217,13 @@ def display_notification(session: Session):
     # Create notification and logs tables if they don't exist
     create_notification_table(session)
 
+    # Settle jobs that finished server-side or were left behind by a previous app process
+    from src.jobs import reconcile_jobs
+    try:
+        reconcile_jobs(session)
+    except Exception as e:
+        st.warning(f"Failed to refresh the status of running jobs: {e}")
+
     # Default to showing last day's data
     today = datetime.today() + timedelta(days=1)
     last_day = today - timedelta(days=7)
@@ -274,15 +1240,37 @@ def display_notification(session: Session):
 
     # Fetch either notifications or logs based on toggle
     if show_logs:
-        logs = fetch_logs(session, start_date, end_date)
-        if logs.empty:
-            st.write("No logs available.")
-        else:
-            st.dataframe(logs)
+        flush_log_entries()
+        create_logs_table(session)
+        summary = summarize_entries(session, "logs", start_date, end_date)
+        operation_types = sorted({operation_type for operation_type, _ in summary})
+        operation_type = st.selectbox("Operation Type", ["All"] + operation_types, key="logs_operation_type")
+        display_page(
+            session, fetch_logs, summary, "logs", start_date=start_date, end_date=end_date,
+            operation_type=None if operation_type == "All" else operation_type
+        )
     else:
-        notifications = fetch_notifications(session, start_date, end_date)
-        print(notifications)
-        if notifications.empty:
-            st.write("No Status Available.")
-        else:
-            st.dataframe(notifications)
+        summary = summarize_entries(session, "notification", start_date, end_date)
+        counts = {}
+        for (_, status), count in summary.items():
+            counts[status] = counts.get(status, 0) + count
+        if counts:
+            columns = st.columns(len(counts))
+            for column, (status, count) in zip(columns, sorted(counts.items())):
+                column.metric(status, f"{count:,}")
+
+        display_job_feed(session)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            status = st.selectbox("Status", ["All"] + sorted(counts), key="notification_status")
+        with col2:
+            operation_types = sorted({operation_type for operation_type, _ in summary})
+            operation_type = st.selectbox("Operation Type", ["All"] + operation_types, key="notification_operation_type")
+        display_page(
+            session, fetch_notifications, summary, "notifications", start_date=start_date, end_date=end_date,
+            status=None if status == "All" else status,
+            operation_type=None if operation_type == "All" else operation_type
+        )
+
+    display_retention(session)
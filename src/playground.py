@@ -7,6 +7,7 @@ from snowflake.core import Root
 from src.utils import *
 from pathlib import Path
 from src.cortex_agent import *
+from src.jobs import get_job_executor
 
 # Load the config file
 config_path = Path("src/settings_config.json")
@@ -221,7 +222,9 @@ def display_playground(session):
 
             if st.button(f"Run"):
                 try:
-                    execute_functionality(session, functionality, input_data, settings)
+                    # Keeps queued batch jobs from competing for the warehouse during the call
+                    with get_job_executor().interactive_call():
+                        execute_functionality(session, functionality, input_data, settings)
                 except SnowparkSQLException as e:
                     st.error(f"Error: {e}")
    
@@ -360,7 +363,8 @@ def display_playground(session):
                     
                     if prompt:
                         prompt = prompt.replace("'", "\\'")
-                    res = execute_query_and_get_result(session,prompt,selected_model,"Generate RAG Response")
+                    with get_job_executor().interactive_call():
+                        res = execute_query_and_get_result(session,prompt,selected_model,"Generate RAG Response")
 
                     result_json = json.loads(res)
                     response_1 = result_json.get("choices", [{}])[0].get("messages", "No messages found")
@@ -418,12 +422,17 @@ def display_playground(session):
                         fine_tuned_models = fetch_fine_tuned_models(session)
                         selected_model = st.selectbox("Model", fine_tuned_models)
                 st.info("Use the same embedding type and model consistently when creating embeddings.")
+                # Tables record the model they were embedded with, which changes when they are re-embedded
+                recorded = get_table_embedding(session, selected_db, selected_schema, selected_table) if selected_table else None
                 col4, col5 = st.columns(2)
                 with col4:
-                    embeddings = list(config["default_settings"]["embeddings"].keys())
-                    embedding_type = st.selectbox("Embeddings", embeddings[1:])
+                    embeddings = list(config["default_settings"]["embeddings"].keys())[1:]
+                    type_index = embeddings.index(recorded["embedding_type"]) if recorded and recorded["embedding_type"] in embeddings else 0
+                    embedding_type = st.selectbox("Embeddings", embeddings, index=type_index)
                 with col5:
-                    embedding_model = st.selectbox("Embedding Model", config["default_settings"]["embeddings"][embedding_type])
+                    models = config["default_settings"]["embeddings"][embedding_type]
+                    model_index = models.index(recorded["embedding_model"]) if recorded and recorded["embedding_model"] in models else 0
+                    embedding_model = st.selectbox("Embedding Model", models, index=model_index)
 
             # Chat container
             rag_chat_container = st.container(border=True, height=700)
@@ -450,10 +459,11 @@ def display_playground(session):
                     
                     chat_history = get_chat_history()
 
-                    prompt = create_prompt_for_rag(session, question, rag, selected_column, selected_db, selected_schema, selected_table,embedding_type,embedding_model, chat_history)
-                    if prompt:
-                        prompt = prompt.replace("'", "\\'")
-                    result = execute_query_and_get_result(session, prompt, selected_model, "Generate RAG Response")
+                    with get_job_executor().interactive_call():
+                        prompt = create_prompt_for_rag(session, question, rag, selected_column, selected_db, selected_schema, selected_table,embedding_type,embedding_model, chat_history)
+                        if prompt:
+                            prompt = prompt.replace("'", "\\'")
+                        result = execute_query_and_get_result(session, prompt, selected_model, "Generate RAG Response")
                     result_json = json.loads(result)
                     response = result_json.get("choices", [{}])[0].get("messages", "No messages found")
                     st.session_state.messages.append({"role": "assistant", "content": response})
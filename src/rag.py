@@ -3,8 +3,7 @@ from src.utils import *
 from src.cortex_functions import *
 from src.query_result_builder import *
 from src.notification import *
-import asyncio
-import threading
+from src.jobs import get_job_executor, get_job_owner, get_job_user, record_query_id, cancellation_check, Pipeline
 import json
 
 
@@ -53,12 +52,28 @@ def display_rag(session):
     with col2:
         if selected_stage:
             if config["mode"] == "debug":
-                uploaded_file = st.file_uploader("Upload File", type=["pdf", "txt"], help="Upload a PDF or TXT file (Max: 5MB)")
-                if uploaded_file:
+                uploaded_files = st.file_uploader(
+                    "Upload Files", type=["pdf", "txt", "md", "html", "htm", "docx"], accept_multiple_files=True,
+                    help="Upload PDF, TXT, MD, HTML or DOCX files (Max: 5MB each)"
+                )
+                compress = st.checkbox(
+                    "Compress", help="Stores the files gzipped. Saves stage storage for text formats; PDF and DOCX are compressed already."
+                )
+                if uploaded_files and st.button("Upload Files"):
                     try:
-                        upload_file_to_stage(session, selected_db, selected_schema, selected_stage, uploaded_file)
+                        with st.spinner(f"Uploading {len(uploaded_files)} files..."):
+                            result = upload_files_to_stage(
+                                session, selected_db, selected_schema, selected_stage, uploaded_files, compress=compress
+                            )
+                        if result["uploaded"]:
+                            st.success(f"Uploaded {len(result['uploaded'])} files to stage '{selected_stage}'.")
+                        if result["skipped"]:
+                            st.info(f"Skipped {len(result['skipped'])} files already in the stage: {', '.join(result['skipped'])}")
+                        for name, error in result["failed"].items():
+                            st.error(f"Failed to upload file '{name}': {error}")
+                            add_log_entry(session, "Upload File", f"{name}: {error}")
                     except Exception as e:
-                        st.error(f"Failed to upload file: {e}")
+                        st.error(f"Failed to upload files: {e}")
                         add_log_entry(session, "Upload File", str(e))
             else:
                 st.info("Upload Option Available Only in 'debug' Mode")
@@ -90,9 +105,73 @@ def display_rag(session):
     # Output Table
     output_table_name = st.text_input("Output Table Name")
     print(output_table_name)
+    rebuild = st.checkbox(
+        "Rebuild from scratch",
+        help="By default only new or changed files are embedded and chunks of removed files are deleted."
+    )
+
+    if output_table_name and st.button("Show Slowest Files", help="Chunking time per file of the last ingestion runs"):
+        try:
+            st.dataframe(fetch_slowest_files(session, selected_db, selected_schema, output_table_name), hide_index=True)
+        except Exception as e:
+            st.warning(f"No file statistics available for {output_table_name}: {e}")
+
+    st.subheader("Choose Your Chunking Strategy")
+    strategy_labels = {
+        "Character": "character", "Token": "token", "Sentence": "sentence", "Layout (PARSE_DOCUMENT)": "layout"
+    }
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        strategy = strategy_labels[st.selectbox(
+            "Strategy", list(strategy_labels),
+            help="Token sizes count words and punctuation marks. Layout parses documents into markdown first."
+        )]
+    strategy_defaults = config["default_settings"]["chunking"][strategy]
+    with col2:
+        chunk_size = st.number_input(
+            "Chunk Size", min_value=10, value=strategy_defaults["chunk_size"], key=f"chunk_size_{strategy}"
+        )
+    with col3:
+        chunk_overlap = st.number_input(
+            "Chunk Overlap", min_value=0, max_value=int(chunk_size) - 1,
+            value=min(strategy_defaults["chunk_overlap"], int(chunk_size) - 1),
+            key=f"chunk_overlap_{strategy}"
+        )
+    chunking = {"strategy": strategy, "chunk_size": int(chunk_size), "chunk_overlap": int(chunk_overlap)}
+
+    # Optional follow-up steps, run as one pipeline once the embeddings exist
+    with st.expander("Document Assistant Pipeline"):
+        build_assistant = st.checkbox(
+            "Also create a Cortex Search Service and test it",
+            help="Runs embedding, search service creation and testing as one tracked pipeline."
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            service_name = st.text_input("Search Service Name", value=f"{output_table_name}_SEARCH" if output_table_name else "")
+        with col2:
+            search_model = st.selectbox("Search Model", config["default_settings"]["embeddings"]["CORTEX_SUPPORTED"])
+        test_question = st.text_input("Test Question", value="What is this document about?")
+
+    if build_assistant and st.button("Create Pipeline"):
+        details = f"Building document assistant {service_name} from stage {selected_stage}"
+        notification_id = add_notification_entry(session, "Document Assistant Pipeline", "In-Progress", details)
+        try:
+            trigger_async_assistant_pipeline(
+                session, selected_db, selected_schema, selected_stage, embedding_type, embedding_model,
+                output_table_name, service_name, search_model, test_question, notification_id,
+                incremental=not rebuild, chunking=chunking
+            )
+            st.success("Document assistant pipeline initiated. Check notifications for updates.")
+        except RuntimeError as e:
+            # The trigger has already marked the notification Failed
+            st.error(f"Failed to initiate the pipeline: {e}")
+        except Exception as e:
+            update_notification_entry(session, notification_id, "Failed")
+            add_log_entry(session, "Document Assistant Pipeline", str(e))
+            st.error(f"Failed to initiate the pipeline: {e}")
 
     # Create Embedding
-    if st.button("Create"):
+    if not build_assistant and st.button("Create"):
         # Add notification for process tracking
         details = f"Creating vector embeddings in table {output_table_name}"
         print("coming to notification")
@@ -101,24 +180,74 @@ def display_rag(session):
         try:
             # Trigger async embedding creation
             trigger_async_rag_process(
-                session, selected_db, selected_schema, selected_stage, embedding_type,embedding_model,output_table_name, notification_id
+                session, selected_db, selected_schema, selected_stage, embedding_type,embedding_model,output_table_name, notification_id,
+                incremental=not rebuild, chunking=chunking
             )
             st.success("Embedding creation initiated. Check notifications for updates.")
+        except RuntimeError as e:
+            # The trigger has already marked the notification Failed
+            st.error(f"Failed to initiate embedding creation: {e}")
         except Exception as e:
             # Update notification to Failed and log the error
             update_notification_entry(session, notification_id, "Failed")
             add_log_entry(session, "Create Embedding", str(e))
             st.error(f"Failed to initiate embedding creation: {e}")
 
+    # Move an existing embedding table to the embedding type and model chosen above
+    with st.expander("Switch Embedding Model"):
+        st.caption(
+            "Re-embeds an existing table in the background and swaps the new embeddings in at once. "
+            "Queries use the current embeddings until the swap."
+        )
+        reembed_table_name = st.selectbox(
+            "Embedding Table", list_tables(session, selected_db, selected_schema) or [], key="reembed_table"
+        )
+        if reembed_table_name:
+            recorded = get_table_embedding(session, selected_db, selected_schema, reembed_table_name)
+            if recorded:
+                st.info(f"Current model: {recorded['embedding_model']} ({recorded['embedding_type']})")
+        if reembed_table_name and st.button(f"Re-embed with {embedding_model}"):
+            details = f"Re-embedding table {reembed_table_name} with {embedding_model}"
+            notification_id = add_notification_entry(session, "Re-embed Table", "In-Progress", details)
+            try:
+                trigger_async_reembed_process(
+                    session, selected_db, selected_schema, reembed_table_name, embedding_type, embedding_model,
+                    notification_id
+                )
+                st.success("Re-embedding initiated. Check notifications for updates.")
+            except RuntimeError as e:
+                # The trigger has already marked the notification Failed
+                st.error(f"Failed to initiate re-embedding: {e}")
+            except Exception as e:
+                update_notification_entry(session, notification_id, "Failed")
+                add_log_entry(session, "Re-embed Table", str(e))
+                st.error(f"Failed to initiate re-embedding: {e}")
+
+
+
+def report_skipped_files(session, operation_type, result):
+    """
+    Logs the stage files an ingestion run skipped because its chunking strategy cannot read them.
+
+    Args:
+        session: Snowflake session object
+        operation_type (str): Operation type of the log entry
+        result (dict): Result of create_vector_embedding_from_stage
+    """
+    if result["skipped_files"]:
+        add_log_entry(
+            session, operation_type,
+            f"Skipped {len(result['skipped_files'])} files PARSE_DOCUMENT cannot read: {', '.join(result['skipped_files'])}"
+        )
 
 
-def trigger_async_rag_process(session, db, schema, stage, embedding_type, embedding_model, output_table, notification_id):
+def trigger_async_rag_process(session, db, schema, stage, embedding_type, embedding_model, output_table, notification_id, incremental=True, chunking=None):
     """
-    Triggers an asynchronous process to create vector embeddings from documents in a stage.
+    Submits a background job that creates vector embeddings from documents in a stage.
 
-    This function initiates an asynchronous process that creates vector embeddings from 
-    documents stored in a Snowflake stage. It handles the process management, error handling,
-    and status notifications.
+    This function queues a job on the shared job executor that creates vector embeddings
+    from documents stored in a Snowflake stage, reporting progress and the final status
+    on the notification entry.
 
     Args:
         session: Snowflake session object
@@ -129,29 +258,171 @@ def trigger_async_rag_process(session, db, schema, stage, embedding_type, embedd
         embedding_model (str): Model to use for generating embeddings
         output_table (str): Name of table to store the embeddings
         notification_id (int): ID of the notification entry to track progress
+        incremental (bool, optional): Whether to only embed new or changed files. Defaults to True.
+        chunking (dict, optional): Chunking strategy and parameters, see create_vector_embedding_from_stage.
 
-    The function uses threading and asyncio to handle the asynchronous processing,
-    and updates the notification status on completion or failure.
+    Raises:
+        RuntimeError: If the job queue is full.
     """
-    async def async_rag_process():
+    def rag_process(job):
         try:
-            # Simulate asynchronous processing
-            await asyncio.sleep(1)
-            
             # Create the embeddings (move this logic to the query_result_builder if necessary)
-            create_vector_embedding_from_stage(session, db, schema, stage, embedding_type,embedding_model, output_table)
+            result = create_vector_embedding_from_stage(
+                session, db, schema, stage, embedding_type, embedding_model, output_table,
+                files_per_batch=config["default_settings"]["rag_files_per_batch"],
+                bytes_per_batch=config["default_settings"]["rag_bytes_per_batch"],
+                on_progress=lambda done, total, left: update_notification_progress(
+                    session, notification_id, done, total, pending_batches=left
+                ),
+                on_query=lambda query_id: record_query_id(session, job, query_id),
+                should_cancel=cancellation_check(session, job),
+                incremental=incremental,
+                chunking=chunking
+            )
+            report_skipped_files(session, "Create Embedding", result)
             
             # Update notification status to Success
             update_notification_entry(session, notification_id, "Success")
-            st.success(f"Vector embeddings created successfully in '{output_table}'.")
         except Exception as e:
             # Log the error and update notification status to Failed
             update_notification_entry(session, notification_id, "Failed")
             add_log_entry(session, "Create Vector Embedding", str(e))
-            st.error(f"An error occurred: {e}")
             raise e
 
-    # Trigger async process using threading
-    thread = threading.Thread(target=asyncio.run, args=(async_rag_process(),))
-    thread.start()
+    try:
+        get_job_executor().submit(
+            "Create Embedding", rag_process, owner=get_job_owner(), notification_id=notification_id,
+            user=get_job_user(session), session=session
+        )
+    except RuntimeError as e:
+        update_notification_entry(session, notification_id, "Failed")
+        add_log_entry(session, "Create Vector Embedding", str(e))
+        raise e
+
+
+def trigger_async_assistant_pipeline(session, db, schema, stage, embedding_type, embedding_model, output_table, service_name, search_model, test_question, notification_id, incremental=True, chunking=None):
+    """
+    Submits a pipeline that builds and tests a document assistant from the files of a stage.
+
+    The pipeline creates the vector embeddings first. Creating a Cortex Search Service on the
+    chunks and testing retrieval from the embeddings then run in parallel, and the search
+    service is tested once it exists. The notification entry reports the state and duration
+    of every step and settles when the last step does.
+
+    Args:
+        session: Snowflake session object
+        db (str): Database name
+        schema (str): Schema name
+        stage (str): Stage name containing the documents
+        embedding_type (str): Type of embedding to generate
+        embedding_model (str): Model to use for generating embeddings
+        output_table (str): Name of table to store the embeddings
+        service_name (str): Name of the Cortex Search Service to create
+        search_model (str): Embedding model of the search service
+        test_question (str): Sample question used by the test steps
+        notification_id (int): ID of the notification entry to track progress
+        incremental (bool, optional): Whether to only embed new or changed files. Defaults to True.
+        chunking (dict, optional): Chunking strategy and parameters, see create_vector_embedding_from_stage.
+
+    Raises:
+        RuntimeError: If the job queue is full.
+    """
+    def embed(job):
+        result = create_vector_embedding_from_stage(
+            session, db, schema, stage, embedding_type, embedding_model, output_table,
+            files_per_batch=config["default_settings"]["rag_files_per_batch"],
+            bytes_per_batch=config["default_settings"]["rag_bytes_per_batch"],
+            on_progress=lambda done, total, left: update_notification_progress(
+                session, notification_id, done, total, pending_batches=left
+            ),
+            on_query=lambda query_id: record_query_id(session, job, query_id),
+            should_cancel=cancellation_check(session, job),
+            incremental=incremental,
+            chunking=chunking
+        )
+        report_skipped_files(session, "Document Assistant Pipeline: Create Embedding", result)
+
+    def create_search_service(job):
+        create_cortex_search_service(
+            session, db, schema, output_table, "CHUNK", ["RELATIVE_PATH"], service_name, search_model,
+            config["warehouse"]
+        )
+
+    def test_retrieval(job):
+        if not test_vector_embeddings(session, db, schema, output_table, embedding_type, embedding_model, test_question):
+            raise RuntimeError(f"No chunks retrieved from {output_table}")
+
+    def test_search_service(job):
+        if not test_cortex_search_service(session, db, schema, service_name, "CHUNK", test_question):
+            raise RuntimeError(f"Search service {service_name} returned no results")
+
+    def report(pipeline):
+        update_notification_details(session, notification_id, pipeline.summary())
+        if pipeline.finished:
+            for step, error in pipeline.errors():
+                add_log_entry(session, f"Document Assistant Pipeline: {step}", error)
+            update_notification_entry(session, notification_id, "Success" if pipeline.succeeded else "Failed")
+            publish_message(pipeline.summary(), "success" if pipeline.succeeded else "error", owner=pipeline.owner)
+
+    pipeline = Pipeline("Document Assistant", on_update=report)
+    pipeline.add_step("Create Embedding", embed)
+    pipeline.add_step("Create Search Service", create_search_service, depends_on=("Create Embedding",))
+    pipeline.add_step("Test Retrieval", test_retrieval, depends_on=("Create Embedding",))
+    pipeline.add_step("Test Search Service", test_search_service, depends_on=("Create Search Service",))
+
+    try:
+        get_job_executor().submit_pipeline(
+            pipeline, owner=get_job_owner(), notification_id=notification_id, user=get_job_user(session), session=session
+        )
+    except RuntimeError as e:
+        update_notification_entry(session, notification_id, "Failed")
+        add_log_entry(session, "Document Assistant Pipeline", str(e))
+        raise e
+
+
+def trigger_async_reembed_process(session, db, schema, table, embedding_type, embedding_model, notification_id):
+    """
+    Submits a background job that moves an embedding table to another embedding model.
+
+    The chunks are re-embedded into a shadow table in batches, reporting progress on the
+    notification entry, and the shadow table is swapped with the table once it is complete.
+    A cancelled job keeps the shadow table, so submitting it again resumes the migration.
+
+    Args:
+        session: Snowflake session object
+        db (str): Database name
+        schema (str): Schema name
+        table (str): Name of the embedding table
+        embedding_type (str): Type of embedding to generate
+        embedding_model (str): Model to use for generating embeddings
+        notification_id (int): ID of the notification entry to track progress
+
+    Raises:
+        RuntimeError: If the job queue is full.
+    """
+    def reembed_process(job):
+        try:
+            reembed_table(
+                session, db, schema, table, embedding_type, embedding_model,
+                files_per_batch=config["default_settings"]["rag_files_per_batch"],
+                on_progress=lambda done, total, left: update_notification_progress(
+                    session, notification_id, done, total, pending_batches=left
+                ),
+                on_query=lambda query_id: record_query_id(session, job, query_id),
+                should_cancel=cancellation_check(session, job)
+            )
+            update_notification_entry(session, notification_id, "Success")
+        except Exception as e:
+            update_notification_entry(session, notification_id, "Failed")
+            add_log_entry(session, "Re-embed Table", str(e))
+            raise e
 
+    try:
+        get_job_executor().submit(
+            "Re-embed Table", reembed_process, owner=get_job_owner(), notification_id=notification_id,
+            user=get_job_user(session), session=session
+        )
+    except RuntimeError as e:
+        update_notification_entry(session, notification_id, "Failed")
+        add_log_entry(session, "Re-embed Table", str(e))
+        raise e
@@ -3,8 +3,7 @@ from src.utils import *
 from src.cortex_functions import *
 from src.query_result_builder import *
 from src.notification import *
-import asyncio
-import threading
+from src.jobs import get_job_executor, get_job_owner, get_job_user, record_query_id
 import json
 from snowflake.core import Root
 import os
@@ -74,6 +73,9 @@ def display_search(session):
                     session, selected_db, selected_schema, selected_table, selected_column, selected_attributes,service_name, embedding_model, warehouse, notification_id
                 )
                 st.success("Cortex search service creation initiated. Check notifications for updates.")
+            except RuntimeError as e:
+                # The trigger has already marked the notification Failed
+                st.error(f"Failed to initiate cortex search service creation: {e}")
             except Exception as e:
                 # Update notification to Failed and log the error
                 update_notification_entry(session, notification_id, "Failed")
@@ -200,7 +202,7 @@ def display_search(session):
 
 def trigger_async_search_process(session, database, schema, table, column, attributes, service_name, embedding_model, warehouse, notification_id):
     """
-    Triggers the asynchronous process to create a Cortex Search Service.
+    Submits a background job that creates a Cortex Search Service.
 
     Args:
         session (snowflake.connector.connection.SnowflakeConnection): Active Snowflake session.
@@ -211,25 +213,30 @@ def trigger_async_search_process(session, database, schema, table, column, attri
         embedding_model (str): The embedding model to use for the process.
         warehouse (str): The Snowflake warehouse to use for the process.
         notification_id (int): The ID of the notification entry to update.
+
+    Raises:
+        RuntimeError: If the job queue is full.
     """
-    async def async_rag_process():
+    def search_process(job):
         try:
-            # Simulate asynchronous processing
-            await asyncio.sleep(1)
-            
-            # Create the Cortex Search Service
-            create_cortex_search_service(session, database, schema, table, column, attributes,service_name,embedding_model, warehouse)
-            
-            # Update notification status to Success
-            update_notification_entry(session, notification_id, "Success")
-            st.success(f"Cortex Search Service created successfully. Check the notification screen for details.")
+            # Submit the Cortex Search Service creation; reconcile_jobs settles the notification
+            async_job = create_cortex_search_service(
+                session, database, schema, table, column, attributes, service_name, embedding_model, warehouse, block=False
+            )
+            record_query_id(session, job, async_job.query_id)
+            job.detach()
         except Exception as e:
             # Log the error and update notification status to Failed
             update_notification_entry(session, notification_id, "Failed")
             add_log_entry(session, "Create Cortex Search Service", str(e))
-            st.error(f"An error occurred: {e}")
             raise e
 
-    # Trigger async process using threading
-    thread = threading.Thread(target=asyncio.run, args=(async_rag_process(),))
-    thread.start()
\ No newline at end of file
+    try:
+        get_job_executor().submit(
+            "Create Cortex Search Service", search_process, owner=get_job_owner(), notification_id=notification_id,
+            user=get_job_user(session), session=session
+        )
+    except RuntimeError as e:
+        update_notification_entry(session, notification_id, "Failed")
+        add_log_entry(session, "Create Cortex Search Service", str(e))
+        raise e
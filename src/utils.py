@@ -2,6 +2,7 @@ import streamlit as st
 from snowflake.snowpark import Session
 from snowflake.snowpark.exceptions import SnowparkSQLException
 from pathlib import Path
+import io
 import json
 import time
 import base64
@@ -14,6 +15,14 @@ config_path = Path("src/settings_config.json")
 with open(config_path, "r") as f:
     config = json.load(f)
 
+# Icons of the toast types understood by show_toast_message
+TOAST_ICONS = {
+    "info": "ℹ️",
+    "success": "✅",
+    "warning": "⚠️",
+    "error": "❌"
+}
+
 def render_image(filepath: str):
     """
     Renders an image in Streamlit from a filepath.
@@ -439,9 +448,140 @@ def create_stage(session, database, schema, stage_name):
         raise e
 
 
+def list_stage_files(session, database, schema, stage_name):
+    """
+    Lists the md5 checksum and last modification of every file in the specified stage.
+
+    Args:
+        session: Snowflake session object
+        database (str): Name of the database
+        schema (str): Name of the schema
+        stage_name (str): Name of the stage
+
+    Returns:
+        dict: (md5, last_modified) by file path relative to the stage
+    """
+    files = session.sql(f"LIST @{database}.{schema}.{stage_name}").collect()
+    # LIST names start with the stage name
+    return {file["name"].split("/", 1)[-1]: (file["md5"], file["last_modified"]) for file in files}
+
+
+def setup_stage_uploads_table(session, database, schema):
+    """
+    Creates the STAGE_UPLOADS table of a schema if it does not exist.
+
+    The table records, for every file uploaded by upload_files_to_stage, the md5 of the
+    uploaded bytes next to the md5 and last modification LIST reported for it afterwards.
+    The md5 of LIST is computed over the stored file, which for an encrypted stage is not
+    the md5 of its content, so only the recorded pair tells whether a file is unchanged.
+
+    Args:
+        session: Snowflake session object
+        database (str): Name of the database
+        schema (str): Name of the schema
+
+    Returns:
+        str: Fully qualified name of the table
+    """
+    check_and_create_table(session, database, schema, "STAGE_UPLOADS", [
+        "stage_name STRING", "relative_path STRING", "content_md5 STRING", "stage_md5 STRING",
+        "stage_last_modified STRING", "uploaded_at TIMESTAMP"
+    ], replace=False)
+    return f"{database}.{schema}.STAGE_UPLOADS"
+
+
+def upload_files_to_stage(session, database, schema, stage_name, files, compress=False, max_workers=None):
+    """
+    Uploads files to the specified stage in parallel, streaming them from memory.
+
+    Files are passed to session.file.put_stream directly, without a temporary copy on disk.
+    A file is skipped when STAGE_UPLOADS records an upload of the same bytes and the stage
+    still lists the file with the md5 and last modification recorded for that upload, so a
+    file replaced or removed by anyone else is uploaded again. With compress, files are
+    gzipped in memory and stored as <name>.gz; the gzip header carries no timestamp, so an
+    unchanged file compresses to the same bytes and is skipped as well.
+
+    Args:
+        session: Snowflake session object
+        database (str): Name of the database
+        schema (str): Name of the schema
+        stage_name (str): Name of the stage where the files will be uploaded
+        files (list): File objects from the Streamlit file uploader
+        compress (bool, optional): Whether to gzip the files. Defaults to False.
+        max_workers (int, optional): Number of parallel uploads. Defaults to upload_workers
+            of the settings.
+
+    Returns:
+        dict: Names of the files uploaded and skipped, and the error of every failed file
+        by name.
+    """
+    import gzip
+    import hashlib
+    from concurrent.futures import ThreadPoolExecutor
+
+    stage_path = f"@{database}.{schema}.{stage_name}"
+    uploads_table = setup_stage_uploads_table(session, database, schema)
+    recorded = {
+        row["RELATIVE_PATH"]: (row["CONTENT_MD5"], row["STAGE_MD5"], row["STAGE_LAST_MODIFIED"])
+        for row in session.sql(f"""
+            SELECT relative_path, content_md5, stage_md5, stage_last_modified FROM {uploads_table}
+            WHERE stage_name = '{escape_sql_string(stage_name)}'
+        """).collect()
+    }
+    stage_files = list_stage_files(session, database, schema, stage_name)
+    result = {"uploaded": [], "skipped": [], "failed": {}}
+    content_md5s = {}
+
+    def upload(file):
+        if compress:
+            stream = io.BytesIO(gzip.compress(file.getvalue(), mtime=0))
+            target = f"{file.name}.gz"
+        else:
+            stream = file
+            target = file.name
+        content_md5 = hashlib.md5(stream.getbuffer()).hexdigest()
+        if target in stage_files and recorded.get(target) == (content_md5, *map(str, stage_files[target])):
+            return "skipped"
+        stream.seek(0)
+        session.file.put_stream(stream, f"{stage_path}/{target}", auto_compress=False, overwrite=True)
+        content_md5s[target] = content_md5
+        return "uploaded"
+
+    with ThreadPoolExecutor(max_workers=max_workers or config["default_settings"]["upload_workers"]) as executor:
+        futures = {file.name: executor.submit(upload, file) for file in files}
+        for name, future in futures.items():
+            try:
+                result[future.result()].append(name)
+            except Exception as e:
+                result["failed"][name] = str(e)
+
+    # Record what LIST reports for the new uploads, to recognize them next time
+    stage_files = list_stage_files(session, database, schema, stage_name) if content_md5s else {}
+    rows = [
+        f"('{escape_sql_string(stage_name)}', '{escape_sql_string(target)}', '{content_md5}', "
+        f"'{escape_sql_string(str(stage_files[target][0]))}', '{escape_sql_string(str(stage_files[target][1]))}')"
+        for target, content_md5 in content_md5s.items() if target in stage_files
+    ]
+    if rows:
+        session.sql(f"""
+            MERGE INTO {uploads_table} t
+            USING (
+                SELECT column1 AS stage_name, column2 AS relative_path, column3 AS content_md5,
+                    column4 AS stage_md5, column5 AS stage_last_modified
+                FROM VALUES {', '.join(rows)}
+            ) s
+            ON t.stage_name = s.stage_name AND t.relative_path = s.relative_path
+            WHEN MATCHED THEN UPDATE SET content_md5 = s.content_md5, stage_md5 = s.stage_md5,
+                stage_last_modified = s.stage_last_modified, uploaded_at = CURRENT_TIMESTAMP
+            WHEN NOT MATCHED THEN INSERT (stage_name, relative_path, content_md5, stage_md5, stage_last_modified, uploaded_at)
+                VALUES (s.stage_name, s.relative_path, s.content_md5, s.stage_md5, s.stage_last_modified, CURRENT_TIMESTAMP)
+        """).collect()
+    return result
+
+
 def upload_file_to_stage(session, database, schema, stage_name, file):
     """
-    Uploads a file to the specified stage in Snowflake using the PUT command.
+    Uploads a file to the specified stage in Snowflake, streaming it from memory.
 
     Args:
         session: Snowflake session object
@@ -453,165 +593,350 @@ def upload_file_to_stage(session, database, schema, stage_name, file):
     Raises:
         Exception: If file upload fails
     """
-    import tempfile
-    import os
-
-    # Construct stage path
-    stage_path = f"@{database}.{schema}.{stage_name}"
-
-    # Save the uploaded file temporarily
-    temp_dir = tempfile.gettempdir()  # Use system temporary directory
-    temp_file_path = os.path.join(temp_dir, file.name)
-    temp_file_path = temp_file_path.replace("\\", "/")  # Ensure the path uses forward slashes for compatibility
-    print("temp_file_path:", temp_file_path)
-
-    try:
-        with open(temp_file_path, "wb") as temp_file:
-            temp_file.write(file.read())
-
-        # Upload the file to the Snowflake stage
-        put_query = f"PUT 'file://{temp_file_path}' {stage_path} AUTO_COMPRESS=FALSE"
-        print("PUT Query:", put_query)  # For debugging
-        session.sql(put_query).collect()
-
+    result = upload_files_to_stage(session, database, schema, stage_name, [file], max_workers=1)
+    if result["failed"]:
+        st.error(f"Failed to upload file: {result['failed'][file.name]}")
+        raise Exception(result["failed"][file.name])
+    if result["skipped"]:
+        st.info(f"File '{file.name}' is already in stage '{stage_name}'.")
+    else:
         st.success(f"File '{file.name}' uploaded successfully to stage '{stage_name}'.")
-    except Exception as e:
-        # Log the full traceback
-        import traceback
-        trace = traceback.format_exc()
-        st.error(f"Failed to upload file: {e}")
-        st.error(f"Traceback:\n{trace}")
-        raise e
-    finally:
-        # Clean up the temporary file
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
 
 
 import streamlit as st
-import time
 
 def show_toast_message(message, duration=3, toast_type="info", position="top-right"):
     """
-    Displays a toast message in Streamlit using a temporary container.
+    Displays a toast message in Streamlit without blocking the script run.
+    
+    Toasts are rendered by Streamlit itself, which dismisses them on its own, so the call
+    returns immediately. Background threads have no script context and publish to the
+    notification bus with publish_message instead.
     
     Args:
         message (str): Message to display in the toast
-        duration (int, optional): Duration in seconds to show the toast. Defaults to 3.
+        duration (int, optional): Kept for compatibility; Streamlit controls how long toasts show.
         toast_type (str, optional): Type of toast ("info", "success", "warning", "error"). Defaults to "info".
-        position (str, optional): Position of the toast ("top-right", "top-left", "bottom-right", "bottom-left"). Defaults to "top-right".
-    """
-    # Define color styles based on the toast type
-    toast_colors = {
-        "info": "#007bff",
-        "success": "#28a745",
-        "warning": "#ffc107",
-        "error": "#dc3545"
-    }
-
-    # Define position styles
-    position_styles = {
-        "top-right": "top: 20px; right: 20px;",
-        "top-left": "top: 20px; left: 20px;",
-        "bottom-right": "bottom: 20px; right: 20px;",
-        "bottom-left": "bottom: 20px; left: 20px;"
-    }
-
-    color = toast_colors.get(toast_type, "#007bff")  # Default to "info" color
-    pos_style = position_styles.get(position, "top: 20px; right: 20px;")  # Default to "top-right"
+        position (str, optional): Kept for compatibility; Streamlit shows toasts at the bottom right.
+    """
+    st.toast(message, icon=TOAST_ICONS.get(toast_type, TOAST_ICONS["info"]))
 
-    # Create a temporary container to display the toast
-    toast_container = st.empty()
+# Version of the chunker UDTF, stored as its comment so outdated deployments get replaced
+DOCUMENT_TEXT_CHUNKER_VERSION = "document_text_chunker v3"
 
-    # Use custom HTML and CSS to display a toast-like message
-    toast_html = f"""
-    <div style="
-        position: fixed;
-        {pos_style}
-        background-color: {color};
-        color: white;
-        padding: 10px 20px;
-        border-radius: 5px;
-        box-shadow: 0px 4px 8px rgba(0, 0, 0, 0.2);
-        z-index: 10000;
-        font-family: Arial, sans-serif;
-    ">
-        {message}
-    </div>
-    """
+# Handler of the document_text_chunker UDTF. Kept as plain source so it can also be run locally.
+DOCUMENT_TEXT_CHUNKER_SOURCE = """
+import gzip
+import io
+import re
+import time
+import zipfile
+from collections import deque
+from html.parser import HTMLParser
+from xml.etree import ElementTree
+import PyPDF2
+from snowflake.snowpark.files import SnowflakeFile
 
-    # Display the toast message
-    toast_container.markdown(toast_html, unsafe_allow_html=True)
+# Each strategy splits text into units (keeping their trailing whitespace) and measures them:
+# - character: words, measured in characters
+# - token: words and punctuation marks, counted as one token each (approximates model tokens)
+# - sentence: whole sentences, measured in characters
+STRATEGIES = {
+    "character": (re.compile(r"\\S+\\s*"), len),
+    "token": (re.compile(r"\\s*(?:\\w+|[^\\w\\s])\\s*"), lambda unit: 1),
+    "sentence": (re.compile(r"[^.!?]+(?:[.!?]+|$)\\s*"), len),
+}
+
+
+class StreamingChunker:
+    # Packs a stream of page texts into overlapping chunks of whole units as soon as they fill
+    # up, keeping only the unfinished chunk in memory. Units longer than a chunk are split
+    # into words first, and words longer than a chunk are cut, so no text is dropped.
+
+    def __init__(self, strategy="character", chunk_size=4000, chunk_overlap=400):
+        self.pattern, self.measure = STRATEGIES[strategy]
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.units = deque()
+        self.size = 0
+        self.emitted_units = 0
+
+    def split_unit(self, unit):
+        for word in STRATEGIES["character"][0].findall(unit):
+            for start in range(0, len(word), self.chunk_size):
+                piece = word[start:start + self.chunk_size]
+                yield piece, self.measure(piece)
+
+    def add_page(self, page_number, text):
+        for unit in self.pattern.findall(text + " "):
+            unit_size = self.measure(unit)
+            pieces = self.split_unit(unit) if unit_size > self.chunk_size else [(unit, unit_size)]
+            for piece, piece_size in pieces:
+                self.units.append((piece, piece_size, page_number))
+                self.size += piece_size
+                while self.size >= self.chunk_size:
+                    yield self.take_chunk()
+
+    def finish(self):
+        # The tail is only emitted if it holds more than the overlap of the last chunk
+        while len(self.units) > self.emitted_units:
+            yield self.take_chunk()
+
+    def fill(self):
+        parts = []
+        size = 0
+        for unit, unit_size, _ in self.units:
+            if parts and size + unit_size > self.chunk_size:
+                break
+            parts.append((unit, unit_size))
+            size += unit_size
+        return parts
+
+    def take_chunk(self):
+        parts = self.fill()
+        if len(parts) <= self.emitted_units:
+            # The next unit does not fit next to the overlap, and a chunk of nothing but the
+            # overlap would repeat the previous chunk; the overlap is dropped instead
+            for _ in range(self.emitted_units):
+                self.size -= self.units.popleft()[1]
+            self.emitted_units = 0
+            parts = self.fill()
+        chunk = ("".join(unit for unit, _ in parts).strip(), self.units[0][2], self.units[len(parts) - 1][2])
+
+        # Keep the trailing units of the chunk that fit in the overlap
+        keep = 0
+        overlap = 0
+        for unit, unit_size in reversed(parts[1:]):
+            if overlap + unit_size > self.chunk_overlap:
+                break
+            overlap += unit_size
+            keep += 1
+        for _ in range(len(parts) - keep):
+            self.size -= self.units.popleft()[1]
+        self.emitted_units = keep
+        return chunk
+
+
+def iter_pdf_pages(stream, stats):
+    # Yields (page number, text) per page; pages that fail to extract are skipped and counted
+    reader = PyPDF2.PdfReader(stream)
+    for page_number, page in enumerate(reader.pages, 1):
+        stats["pages"] = page_number
+        try:
+            text = page.extract_text() or ""
+        except Exception:
+            stats["skipped_pages"] += 1
+            continue
+        text = text.replace("\\n", " ").replace("\\0", " ")
+        if text.strip():
+            yield page_number, text
+
+
+def iter_text_pages(stream, stats, lines_per_block=200):
+    # Plain text and markdown: form feeds separate pages; lines are passed on in blocks
+    text_stream = io.TextIOWrapper(stream, encoding="utf-8", errors="replace")
+    page_number = 1
+    block = []
+    for line in text_stream:
+        pages = line.split("\\f")
+        for index, part in enumerate(pages):
+            if index:
+                if block:
+                    yield page_number, "".join(block)
+                    block = []
+                page_number += 1
+            block.append(part)
+        if len(block) >= lines_per_block:
+            yield page_number, "".join(block)
+            block = []
+    if block:
+        yield page_number, "".join(block)
+    stats["pages"] = page_number
+
+
+class HTMLTextExtractor(HTMLParser):
+    # Collects the visible text of an HTML document, one block per block-level element
+    SKIPPED = {"script", "style", "head", "noscript", "template"}
+    BLOCKS = {"p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6", "section", "article", "table", "pre"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.skipping = 0
+        self.parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIPPED:
+            self.skipping += 1
+        elif tag in self.BLOCKS:
+            self.parts.append("\\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED and self.skipping:
+            self.skipping -= 1
+        elif tag in self.BLOCKS:
+            self.parts.append("\\n")
+
+    def handle_data(self, data):
+        if not self.skipping:
+            self.parts.append(data)
+
+    def take_text(self):
+        text = "".join(self.parts)
+        self.parts = []
+        return text
 
-    # Wait for the specified duration, then clear the container
-    time.sleep(duration)
-    toast_container.empty()
 
-def setup_pdf_text_chunker(session):
-    """
-    Sets up the pdf_text_chunker UDF in the current database and schema.
+def iter_html_pages(stream, stats, block_size=65536):
+    parser = HTMLTextExtractor()
+    text_stream = io.TextIOWrapper(stream, encoding="utf-8", errors="replace")
+    while True:
+        data = text_stream.read(block_size)
+        if not data:
+            break
+        parser.feed(data)
+        text = parser.take_text()
+        if text.strip():
+            yield 1, text
+    parser.close()
+    text = parser.take_text()
+    if text.strip():
+        yield 1, text
+    stats["pages"] = 1
+
+
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def iter_docx_pages(stream, stats):
+    # Word documents: paragraphs of word/document.xml; explicit and rendered page breaks
+    # advance the page number
+    page_number = 1
+    with zipfile.ZipFile(stream) as archive, archive.open("word/document.xml") as document:
+        paragraph = []
+        for event, element in ElementTree.iterparse(document, events=("start", "end")):
+            if event == "start":
+                if element.tag == WORD_NAMESPACE + "lastRenderedPageBreak" or (
+                    element.tag == WORD_NAMESPACE + "br" and element.get(WORD_NAMESPACE + "type") == "page"
+                ):
+                    if paragraph:
+                        yield page_number, "".join(paragraph)
+                        paragraph = []
+                    page_number += 1
+                continue
+            if element.tag == WORD_NAMESPACE + "t" and element.text:
+                paragraph.append(element.text)
+            elif element.tag == WORD_NAMESPACE + "tab":
+                paragraph.append("\\t")
+            elif element.tag == WORD_NAMESPACE + "p":
+                if paragraph:
+                    yield page_number, "".join(paragraph) + "\\n"
+                    paragraph = []
+                element.clear()
+    stats["pages"] = page_number
+
+
+# Page readers per file extension; each yields (page number, text) and fills in the stats
+READERS = {
+    "pdf": iter_pdf_pages,
+    "txt": iter_text_pages,
+    "md": iter_text_pages,
+    "markdown": iter_text_pages,
+    "html": iter_html_pages,
+    "htm": iter_html_pages,
+    "docx": iter_docx_pages,
+}
+
+
+def chunk_document(stream, extension, strategy="character", chunk_size=4000, chunk_overlap=400, stats=None):
+    stats = stats if stats is not None else {"pages": 0, "skipped_pages": 0}
+    chunker = StreamingChunker(strategy, chunk_size, chunk_overlap)
+    for page_number, text in READERS[extension](stream, stats):
+        yield from chunker.add_page(page_number, text)
+    yield from chunker.finish()
+
+
+class document_text_chunker:
+    # Called once per file when partitioned by relative_path. Yields the chunks of the file,
+    # then one row without a chunk holding the file's statistics. Files of unsupported
+    # formats only get the statistics row. Gzipped files are read by their inner extension.
+    def process(self, file_url: str, relative_path: str, strategy: str, chunk_size: int, chunk_overlap: int):
+        started = time.perf_counter()
+        stats = {"pages": 0, "skipped_pages": 0}
+        chunks = 0
+        compressed = relative_path.lower().endswith(".gz")
+        extension = relative_path[:-3 if compressed else None].rsplit(".", 1)[-1].lower()
+        if extension in READERS:
+            with SnowflakeFile.open(file_url, "rb") as f:
+                # PDF and DOCX readers seek within the file, so they only read what they extract.
+                # A gzip stream cannot seek from the end, so those are decompressed up front.
+                if compressed:
+                    stream = gzip.GzipFile(fileobj=f)
+                    if extension in ("pdf", "docx"):
+                        stream = io.BytesIO(stream.read())
+                else:
+                    stream = f if f.seekable() else io.BytesIO(f.readall())
+                for chunk, page_start, page_end in chunk_document(
+                    stream, extension, strategy, int(chunk_size), int(chunk_overlap), stats
+                ):
+                    chunks += 1
+                    yield chunk, page_start, page_end, None, None, None, None
+        elapsed_ms = int((time.perf_counter() - started) * 1000)
+        yield None, None, None, stats["pages"], stats["skipped_pages"], chunks, elapsed_ms
+"""
+
+
+def setup_document_text_chunker(session):
+    """
+    Sets up the document_text_chunker UDTF in the current database and schema.
+    
+    The UDTF picks a reader by the extension of the file's relative path: PDF, plain text
+    and markdown (form feeds separate pages), HTML (visible text only) and DOCX (page breaks
+    advance the page number), also when gzipped. It streams the pages of the document and
+    yields (chunk, page_start, page_end) rows as the chunks fill up, so memory stays bounded
+    by one chunk plus one page. PDF pages that fail to extract are skipped. It takes the
+    chunking strategy ("character", "token" or "sentence"), the chunk size and the overlap
+    as arguments. After the chunks of a file it yields one row
+    with a NULL chunk and the file's page count, skipped pages, chunk count and chunking time.
+    An existing UDTF is replaced if its comment shows an older version.
     
     Args:
         session: Snowflake session object
         
     Note:
-        Creates a Python UDF that can process PDF files and split them into text chunks
+        Creates a Python UDTF that can process PDF, TXT, MD, HTML and DOCX files and split
+        them into text chunks. Files of other formats only get the statistics row.
     """
-    # Check if UDF already exists
+    # Check if the current version of the UDTF already exists
     try:
-        udf_check_query = "SHOW USER FUNCTIONS LIKE 'pdf_text_chunker'"
+        udf_check_query = "SHOW USER FUNCTIONS LIKE 'document_text_chunker'"
         existing_udfs = session.sql(udf_check_query).collect()
-        if existing_udfs:
-            #st.info("UDF pdf_text_chunker already exists. Skipping creation.")
+        if any(udf["description"] == DOCUMENT_TEXT_CHUNKER_VERSION for udf in existing_udfs):
+            #st.info("UDF document_text_chunker already exists. Skipping creation.")
             return
     except Exception as e:
         st.error(f"Error checking UDF existence: {e}")
         return
 
-    # Create UDF if it doesn't exist
-    create_udf_query = """
-    CREATE OR REPLACE FUNCTION pdf_text_chunker(file_url STRING)
-    RETURNS TABLE (chunk VARCHAR)
+    # Create or upgrade the UDTF
+    create_udf_query = f"""
+    CREATE OR REPLACE FUNCTION document_text_chunker(file_url STRING, relative_path STRING, strategy STRING, chunk_size INT, chunk_overlap INT)
+    RETURNS TABLE (
+        chunk VARCHAR, page_start NUMBER, page_end NUMBER,
+        pages NUMBER, skipped_pages NUMBER, chunks NUMBER, elapsed_ms NUMBER
+    )
     LANGUAGE PYTHON
     RUNTIME_VERSION = '3.9'
-    HANDLER = 'pdf_text_chunker'
-    PACKAGES = ('snowflake-snowpark-python', 'PyPDF2', 'langchain')
+    HANDLER = 'document_text_chunker'
+    PACKAGES = ('snowflake-snowpark-python', 'PyPDF2')
+    COMMENT = '{DOCUMENT_TEXT_CHUNKER_VERSION}'
     AS
     $$
-import PyPDF2
-import io
-import pandas as pd
-from snowflake.snowpark.files import SnowflakeFile
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-
-class pdf_text_chunker:
-    def read_pdf(self, file_url: str) -> str:
-        with SnowflakeFile.open(file_url, 'rb') as f:
-            buffer = io.BytesIO(f.readall())
-        reader = PyPDF2.PdfReader(buffer)
-        text = ""
-        for page in reader.pages:
-            try:
-                text += page.extract_text().replace('\\n', ' ').replace('\\0', ' ')
-            except:
-                text = "Unable to Extract"
-        return text
-
-    def process(self, file_url: str):
-        text = self.read_pdf(file_url)
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=4000,
-            chunk_overlap=400,
-            length_function=len
-        )
-        chunks = text_splitter.split_text(text)
-        df = pd.DataFrame(chunks, columns=['chunk'])
-        yield from df.itertuples(index=False, name=None)
+{DOCUMENT_TEXT_CHUNKER_SOURCE}
     $$
     """
     try:
         session.sql(create_udf_query).collect()
-        #st.success("UDF pdf_text_chunker created successfully.")
+        #st.success("UDF document_text_chunker created successfully.")
     except Exception as e:
         st.error(f"Error creating UDF: {e}")
 
@@ -8,6 +8,7 @@ from snowflake.snowpark.exceptions import SnowparkSQLException
 from src.notification import *
 from src.search import *
 from src.cortex_agent import *
+from src.jobs import display_job_events, reconcile_jobs
 # from trulens.connectors.snowflake import SnowflakeConnector
 # from trulens.core.session import TruSession
 # from trulens.dashboard import run_dashboard
@@ -63,7 +64,18 @@ else:
 
 
 # Set up UDF at app start
-setup_pdf_text_chunker(st.session_state.snowflake_session)
+setup_document_text_chunker(st.session_state.snowflake_session)
+
+# Reattach to jobs left running by a previous app process once per session
+if st.session_state.snowflake_session is not None and 'jobs_reconciled' not in st.session_state:
+    try:
+        reconcile_jobs(st.session_state.snowflake_session)
+    except Exception as e:
+        print(f"Failed to reconcile jobs: {e}")
+    st.session_state.jobs_reconciled = True
+
+# Surface the results of background jobs finished since the last run
+display_job_events()
 
 
 # Load custom CSS for sidebar styling
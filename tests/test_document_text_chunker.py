@@ -0,0 +1,76 @@
+"""
+Tests of the document_text_chunker UDTF handler, run locally from its source in src/utils.py.
+"""
+import ast
+import random
+import re
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PyPDF2")
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="module")
+def chunker():
+    # The handler only opens stage files through SnowflakeFile, which these tests do not use
+    if "snowflake.snowpark.files" not in sys.modules:
+        try:
+            import snowflake.snowpark.files  # noqa: F401
+        except ImportError:
+            files = types.ModuleType("snowflake.snowpark.files")
+            files.SnowflakeFile = None
+            sys.modules["snowflake.snowpark.files"] = files
+    tree = ast.parse((ROOT / "src" / "utils.py").read_text())
+    source = next(
+        node.value.value for node in tree.body
+        if isinstance(node, ast.Assign) and getattr(node.targets[0], "id", None) == "DOCUMENT_TEXT_CHUNKER_SOURCE"
+    )
+    namespace = {}
+    exec(source, namespace)
+    return namespace
+
+
+def chunk_text(chunker, strategy, chunk_size, chunk_overlap, pages):
+    streaming = chunker["StreamingChunker"](strategy, chunk_size, chunk_overlap)
+    chunks = []
+    for page_number, text in enumerate(pages, 1):
+        chunks += [chunk for chunk, _, _ in streaming.add_page(page_number, text)]
+    return chunks + [chunk for chunk, _, _ in streaming.finish()]
+
+
+def test_oversized_unit_is_not_dropped(chunker):
+    text = " ".join(f"Short sentence {index}." for index in range(10))
+    text += " " + "x" * 9000 + " Final clause one. Final clause two."
+    chunks = chunk_text(chunker, "sentence", 4000, 400, [text])
+
+    assert "".join(chunks).count("x") == 9000
+    assert "Final clause two." in chunks[-1]
+    assert all(len(chunk) <= 4000 for chunk in chunks)
+
+
+@pytest.mark.parametrize("strategy, chunk_size, chunk_overlap", [
+    ("character", 300, 30), ("token", 30, 3), ("sentence", 300, 30)
+])
+def test_every_word_appears_in_a_chunk(chunker, strategy, chunk_size, chunk_overlap):
+    rng = random.Random(strategy)
+    for _ in range(100):
+        words = [
+            "".join(rng.choice("abcdefghij") for _ in range(rng.choice([1, 3, 8, 40, 400])))
+            + rng.choice(["", " ", ". ", "! ", "\n"])
+            for _ in range(rng.randint(0, 300))
+        ]
+        text = " ".join(words)
+        # Pages break between words, as extracted pages do
+        units = re.split(r"(?<=\s)(?=\S)", text)
+        pages = ["".join(units[start:start + 40]) for start in range(0, len(units), 40)]
+        chunks = chunk_text(chunker, strategy, chunk_size, chunk_overlap, pages)
+
+        chunked_words = {word for chunk in chunks for word in re.findall(r"\w+", chunk)}
+        assert {word for word in re.findall(r"\w+", text) if len(word) <= chunk_size} <= chunked_words
+        if strategy != "token":
+            assert all(len(chunk) <= chunk_size for chunk in chunks)